@@ -1,4 +1,21 @@
+from array import array
+import ctypes
+import mmap
+import os
+import struct
+import sys
 import graph
+from union_find import _read_vertex_names
+
+# Snapshot header: magic, version, integer size, little endian flag,
+# vertex count, edge count
+_HEADER = "<4sHHH6xqq"
+_MAGIC = "ADMG"
+_VERSION = 2
+# Kinds of vertex names in a snapshot's name table
+_STR, _UNICODE, _INT = range(3)
+# The ctypes type that views each array typecode in place
+_CTYPES = {'b': ctypes.c_byte, 'l': ctypes.c_long, 'd': ctypes.c_double}
 
 def graph_from_file(handle):
     """Creates a new Graph from a file handle.
@@ -28,7 +45,11 @@ def graph_from_file(handle):
 
     If the number of vertices is 0, an empty graph will be created.
     Edges without weights will be assigned a weight of 0 by default.
-    The file may not include extra newlines.
+    The file may not include extra newlines, except for a single newline
+    at the end of the last line.
+
+    The file is read one line at a time, so only the Graph being built
+    is kept in memory.
 
     Args:
         handle: The file handle from which to create the Graph.
@@ -39,42 +60,23 @@ def graph_from_file(handle):
     Raises:
         ValueError: The file handle was incorrectly formatted.
     """
-    lines = handle.read().split('\n')
-    # Check vertex count for floats
-    if float(lines[0]) % 1 != 0.0:
-        raise ValueError("Vertex count must be an integer")
-    vertex_count = int(lines[0])
-    if vertex_count < 0:
-        raise ValueError("Vertex count must be a non-negative integer")
-    # If we don't check for a 0 vertex count here, it will cause the parser
-    # to look for edges starting at line 0.
-    if vertex_count == 0:
+    lines = (line.rstrip("\n") for line in handle)
+    names = _read_vertex_names(lines)
+    # With no vertices, any lines left could not be valid edges
+    if not names:
         return graph.Graph([])
-    vertices = []
-    # Offset by 1 to account for the vertex count line
-    for vertex_name in lines[1:vertex_count+1]:
-        # Empty string is technically a valid Vertex name, but here an extra
-        # newline will cause parsing problems (was it supposed to be a Vertex
-        # name or just a formatting error?) so we will not allow it.
-        if vertex_name == "":
-            raise ValueError("Extra newline found in vertex names")
-        if "|" in vertex_name:
-            raise ValueError("Vertex names may not contain pipes")
-        vertices.append(graph.Vertex(vertex_name))
-    for edge_data in lines[vertex_count+1:]:
+    vertices = [graph.Vertex(name) for name in names]
+    # Look up Vertex objects by name while reading edges
+    named = dict(zip(names, vertices))
+    for edge_data in lines:
         line = edge_data.split("|")
         # Also catches extra newlines
         if len(line) < 2:
             raise ValueError("Edge lines must contain at least one pipe")
         # Find the Vertex objects that match these names
-        from_vertex = None
-        to_vertex = None
-        for vertex in vertices:
-            if vertex.name == line[0]:
-                from_vertex = vertex
-            # Not an elif because it could be a self loop
-            if vertex.name == line[1]:
-                to_vertex = vertex
+        from_vertex = named.get(line[0])
+        # Could be the same as from_vertex if it is a self loop
+        to_vertex = named.get(line[1])
         if not (from_vertex and to_vertex):
             raise ValueError("Edge data does not match Vertex names")
         if len(line) > 2:
@@ -84,3 +86,130 @@ def graph_from_file(handle):
         from_vertex.add_edge(new_edge)
     return graph.Graph(vertices)
 
+def write_snapshot(source, handle):
+    """Writes a binary snapshot of a graph to a file handle.
+
+    A snapshot can be loaded much faster than the text format read by
+    graph_from_file, since nothing needs to be parsed. It contains:
+
+    A header: the magic bytes ADMG, the format version, the size in bytes
+        of each integer, a byte order flag, the vertex count and the
+        edge count
+    A name table: the byte offset of each vertex name, the kind of each
+        name (str, unicode or integer), then the names themselves, with
+        unicode names encoded as UTF-8 and integers written in decimal
+    The edge arrays of a CompactGraph: offsets, targets and weights
+
+    Each block is padded to a multiple of 8 bytes, so the arrays can be
+    viewed in place when the snapshot is loaded.
+
+    Args:
+        source: The Graph or CompactGraph to write.
+        handle: A file handle opened for writing in binary mode.
+
+    Raises:
+        TypeError: A vertex name is not a string or an integer.
+    """
+    if not isinstance(source, graph.CompactGraph):
+        source = graph.CompactGraph.from_graph(source)
+    kinds = array('b')
+    names = []
+    for name in source.names:
+        kind, data = _encode_name(name)
+        kinds.append(kind)
+        names.append(data)
+    name_offsets = array('l', [0])
+    for name in names:
+        name_offsets.append(name_offsets[-1] + len(name))
+    handle.write(struct.pack(_HEADER, _MAGIC, _VERSION, name_offsets.itemsize,
+            sys.byteorder == "little", source.size(), source.edge_count()))
+    for data in (name_offsets.tostring(), kinds.tostring(), "".join(names),
+            array('l', source.offsets).tostring(),
+            array('l', source.targets).tostring(),
+            array('d', source.weights).tostring()):
+        handle.write(data)
+        # Keep the arrays that follow aligned
+        handle.write("\0" * (-len(data) % 8))
+
+def load_snapshot(path):
+    """Loads a graph written by write_snapshot.
+
+    The file is memory mapped and the graph's arrays are views over the
+    mapping, so nothing is parsed or copied; only the names are read out.
+    A snapshot written with the other byte order is copied and swapped.
+
+    Args:
+        path: The path of the snapshot file.
+
+    Returns:
+        A CompactGraph with the vertices and edges in the snapshot.
+
+    Raises:
+        ValueError: The file is not a snapshot, or was written on a system
+            with a different integer size.
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < struct.calcsize(_HEADER):
+            raise ValueError("File is too short to be a snapshot")
+        # A private (copy on write) mapping, since ctypes can only view
+        # writable buffers; pages are only copied if they are written to
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, int_size, little, vertex_count, edge_count = (
+            struct.unpack_from(_HEADER, data))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("File is not a graph snapshot")
+    if int_size != array('l').itemsize:
+        raise ValueError("Snapshot uses a different integer size")
+    swap = bool(little) != (sys.byteorder == "little")
+    position = [struct.calcsize(_HEADER)]
+
+    def read_array(typecode, count):
+        """Returns the next count values, viewed in place if possible."""
+        size = count * array(typecode).itemsize
+        end = position[0] + size
+        if end > len(data):
+            raise ValueError("Snapshot is truncated")
+        if swap:
+            # Values in the wrong byte order have to be copied to swap them
+            values = array(typecode, data[position[0]:end])
+            values.byteswap()
+        else:
+            # The view keeps the mapping open for as long as it is used
+            values = (_CTYPES[typecode] * count).from_buffer(data,
+                    position[0])
+        position[0] = end + (-size % 8)
+        return values
+
+    name_offsets = read_array('l', vertex_count + 1)
+    kinds = read_array('b', vertex_count)
+    start = position[0]
+    position[0] += name_offsets[-1] + (-name_offsets[-1] % 8)
+    names = [_decode_name(kinds[i],
+            data[start + name_offsets[i]:start + name_offsets[i + 1]])
+            for i in xrange(vertex_count)]
+    offsets = read_array('l', vertex_count + 1)
+    targets = read_array('l', edge_count)
+    weights = read_array('d', edge_count)
+    return graph.CompactGraph(names, offsets, targets, weights)
+
+def _encode_name(name):
+    """Returns (kind, data) for a vertex name in a snapshot's name table.
+
+    Raises:
+        TypeError: name is not a string or an integer.
+    """
+    if isinstance(name, str):
+        return _STR, name
+    if isinstance(name, unicode):
+        return _UNICODE, name.encode("utf-8")
+    if isinstance(name, (int, long)) and not isinstance(name, bool):
+        return _INT, str(name)
+    raise TypeError("Snapshot vertex names must be strings or integers")
+
+def _decode_name(kind, data):
+    """Returns the vertex name stored by _encode_name as kind and data."""
+    if kind == _UNICODE:
+        return data.decode("utf-8")
+    if kind == _INT:
+        return int(data)
+    return data
@@ -1,29 +1,34 @@
+from array import array
 from collections import Counter
+from collections import deque
+import weakref
+
 class Vertex(object):
     """Represents a vertex node in a graph."""
 
-    # Vertex names used so far
-    existing = set()
     # For use by _make_test_vertex
     _count = 1
+    # Weak reference to the TopologicalOrder tracking this Vertex, if any,
+    # so that the order (and the Vertex) are released with their Graph
+    _order_ref = None
 
     def __init__(self, name, edges=None):
         """Creates a new Vertex.
 
         Args:
             name: The string used to identify this Vertex.
-                Must be unique, but is not case sensitive.
+                Must be unique within any Graph this Vertex is added to,
+                but is not case sensitive.
             edges (optional): A list of edges from this Vertex. If no list is
                 given, a new one will be created.
 
         Raises:
-            ValueError: The name given for this Vertex is already in use.
             TypeError: edges is given, but is not a list.
         """
-        if name in self.existing:
-            raise ValueError("Name {} already exists".format(name))
+        # Share one copy of each name among graphs that reuse it
+        if isinstance(name, str):
+            name = intern(name)
         self.name = name
-        self.existing.add(name)
         if edges == None:
             self.edges = []
         else:
@@ -31,20 +36,26 @@ class Vertex(object):
                 raise TypeError("edges attribute must be a list")
             self.edges = edges
 
+    @property
+    def _order(self):
+        """The TopologicalOrder tracking this Vertex, or None."""
+        if self._order_ref is None:
+            return None
+        return self._order_ref()
+
     @staticmethod
     def _make_test_vertex():
         """Test method for creating new vertices.
 
-        Vertex names must be unique, so this method provides a way
-        of generating unique Vertex names without having to manually
-        keep track of them.
+        Vertex names must be unique within a Graph, so this method provides
+        a way of generating unique Vertex names without having to manually
+        keep track of them. Each call returns a name that no earlier call
+        has returned.
 
         Returns:
             A string in the format "Test1", where 1 is the class
             variable count.
         """
-        while "Test" + str(Vertex._count) in Vertex.existing:
-            Vertex._count += 1
         Vertex._count += 1
         return "Test" + str(Vertex._count)
 
@@ -62,14 +73,23 @@ class Vertex(object):
         Self-loops are also supported, so an Edge may point to the
             same Vertex that it originates from.
 
+        If this Vertex is part of a Graph that tracks its topological
+            order (see Graph.track_order), the order is updated, and
+            edges that would create a cycle are rejected.
+
         Args:
             edge: The Edge to add. May or may not have a weight.
 
         Raises:
             TypeError: edge is not an Edge object.
+            ValueError: edge would create a cycle in a tracked Graph.
         """
         if not isinstance(edge, Edge):
             raise TypeError("edge must be an Edge object")
+        order = self._order
+        if order is not None:
+            # Raises before the edge is added if it would create a cycle
+            order.add_edge(self, edge.vertex)
         self.edges.append(edge)
 
 class Edge(object):
@@ -99,13 +119,57 @@ class Graph(object):
         Args:
             vertices: An iterable of Vertex objects. If it contains
             duplicate vertices, only one of each will be added.
+
+        Raises:
+            ValueError: Two different vertices have the same name.
         """
         self.unique = set()
         self.vertices = []
+        # Registry of the id (index in vertices) of each Vertex by name
+        self.ids = {}
+        # A TopologicalOrder, once track_order has been called
+        self.order = None
         for vertex in vertices:
-            if vertex not in self.unique:
-                self.unique.add(vertex)
+            if not self._contains(vertex):
+                self.ids[vertex.name] = len(self.vertices)
                 self.vertices.append(vertex)
+                self.unique.add(vertex)
+
+    def _contains(self, vertex):
+        """Determines whether vertex is part of the Graph.
+
+        Raises:
+            ValueError: A different Vertex with the same name is part of
+                the Graph.
+        """
+        if vertex.name not in self.ids:
+            return False
+        if self.vertices[self.ids[vertex.name]] is not vertex:
+            raise ValueError("Name {} already exists".format(vertex.name))
+        return True
+
+    def get_vertex(self, name):
+        """Returns the Vertex in this Graph with the given name.
+
+        Raises:
+            ValueError: No Vertex in the Graph has that name.
+        """
+        if name not in self.ids:
+            raise ValueError("No vertex named {}".format(name))
+        return self.vertices[self.ids[name]]
+
+    def id_of(self, name):
+        """Returns the id of the Vertex with the given name.
+
+        Ids are the positions of vertices in the Graph, starting from 0,
+        and match the ids used by CompactGraph.from_graph.
+
+        Raises:
+            ValueError: No Vertex in the Graph has that name.
+        """
+        if name not in self.ids:
+            raise ValueError("No vertex named {}".format(name))
+        return self.ids[name]
 
     def size(self):
         """Returns the number of vertices in the Graph."""
@@ -120,13 +184,46 @@ class Graph(object):
 
         Raises:
             TypeError: vertex is not a Vertex object.
+            ValueError: A different Vertex with the same name is already
+                part of the Graph.
         """
         if not isinstance(vertex, Vertex):
             raise TypeError("vertex to add must be a Vertex object")
-        if vertex not in self.unique:
+        if not self._contains(vertex):
+            if self.order is not None:
+                self.order.add([vertex])
+            self.ids[vertex.name] = len(self.vertices)
             self.vertices.append(vertex)
             self.unique.add(vertex)
 
+    def track_order(self):
+        """Keeps a topological order of this Graph up to date from now on.
+
+        Once the order is tracked, adding an Edge to any Vertex reachable
+        from this Graph updates the order incrementally, and an Edge that
+        would create a cycle is rejected with a ValueError instead of
+        being added. has_cycle and top_sort then use the tracked order
+        instead of searching the whole Graph.
+
+        Raises:
+            ValueError: The Graph already contains a cycle, or one of its
+                vertices is already tracked by another Graph.
+        """
+        if self.order is None:
+            order = TopologicalOrder()
+            order.add(self.vertices)
+            self.order = order
+
+    def untrack_order(self):
+        """Stops keeping the topological order of this Graph.
+
+        The tracked vertices are released, so that they can be tracked by
+        another Graph. This also happens when a tracked Graph is dropped.
+        """
+        if self.order is not None:
+            self.order.release()
+            self.order = None
+
     def is_connected(self):
         """Determines whether the Graph is connected.
 
@@ -137,16 +234,16 @@ class Graph(object):
         connected.
         As more Vertices and Edges are added to a graph, its connectivity
         may change.
+        Runs in O(V + E) time using StrongComponents.
 
         Returns:
             True if the Graph is connected, or False otherwise.
         """
-        # Check paths in both directions, x to y and y to x
-        for i in xrange(len(self.vertices)):
-            for j in xrange(len(self.vertices)):
-                if find_path(self.vertices[i], self.vertices[j]) == []:
-                    return False
-        return True
+        if len(self.vertices) < 2:
+            return True
+        # The Graph's own vertices are always the first ids
+        labels = StrongComponents(self).labels[:len(self.vertices)]
+        return len(set(labels)) == 1
 
     def has_cycle(self):
         """Determines whether this Graph contains a cycle.
@@ -163,19 +260,11 @@ class Graph(object):
             True if the Graph contains at least one cycle, and False
             otherwise.
         """
-        for vertex in self.vertices:
-            # processed is unique to each start vertex because we want to
-            # know what can be reached from the same starting point
-            processed = set()
-            stack = [vertex]
-            while len(stack) > 0:
-                current = stack.pop()
-                for edge in current.edges:
-                    if edge.vertex in processed:
-                        return True
-                    stack.append(edge.vertex)
-                processed.add(current)
-        return False
+        if self.order is not None:
+            # Edges that would create a cycle are never added
+            return False
+        vertices, offsets, targets, weights = _compact_arrays(self.vertices)
+        return _has_cycle(len(vertices), offsets, targets)
 
     def top_sort(self):
         """Returns a topological sort of this Graph.
@@ -189,6 +278,9 @@ class Graph(object):
         Raises:
             ValueError: Graph contains at least one cycle.
         """
+        if self.order is not None:
+            members = set(self.vertices)
+            return [v for v in self.order.vertices() if v in members]
         # Get count of incoming edges for each Vertex
         in_edges = []
         for vertex in self.vertices:
@@ -196,10 +288,11 @@ class Graph(object):
                 in_edges.append(edge.vertex)
         in_degrees = Counter(in_edges)
         # Start with vertices with no incoming edges
-        queue = [vertex for vertex in self.vertices if in_degrees[vertex] == 0]
+        queue = deque(
+                vertex for vertex in self.vertices if in_degrees[vertex] == 0)
         visited_vertices = []
-        while len(queue) > 0:
-            current = queue.pop(0)
+        while queue:
+            current = queue.popleft()
             visited_vertices.append(current)
             for edge in current.edges:
                 in_degrees[edge.vertex] -= 1
@@ -234,24 +327,23 @@ def find_path(start, end):
         AttributeError: start is not a valid Vertex object.
     """
     # Start may be end to begin with, so don't overlook it
-    queue = [start]
+    queue = deque([start])
     # Track how we got to each Vertex
     parent = {start:None}
-    while queue != []:
-        current = queue.pop(0)
+    while queue:
+        current = queue.popleft()
         if current == end:
             path = []
             while current != None:
-                path.insert(0, current)
+                path.append(current)
                 current = parent[current]
+            path.reverse()
             return path
         # Only add edges we haven't already looked at
-        new_edges = []
         for edge in current.edges:
             if edge.vertex not in parent:
-                new_edges.append(edge.vertex)
                 parent[edge.vertex] = current
-        queue.extend(new_edges)
+                queue.append(edge.vertex)
     # Ran out of queue; no path exists
     return []
 
@@ -279,3 +371,598 @@ def dfs(start, goal):
                 stack.append(edge.vertex)
     # Ran out of edges; no such path
     return False
+
+class CompactGraph(object):
+    """A frozen, array-backed representation of a directed graph.
+
+    Vertices are identified by integer ids in the range 0 <= id < size(),
+    and edges are stored in compressed sparse row (CSR) form: the edges
+    leaving vertex i occupy positions offsets[i] to offsets[i + 1] - 1 of
+    the targets and weights arrays.
+
+    A CompactGraph can not be changed once it has been created; build a
+    new one if the Graph it came from changes.
+    """
+
+    def __init__(self, names, offsets, targets, weights):
+        """Creates a new CompactGraph from existing CSR arrays.
+
+        Most callers should use from_graph or from_edges instead.
+
+        Args:
+            names: A list of vertex names, where the name at index i
+                belongs to the vertex with id i. Names must be unique.
+            offsets: An array of size len(names) + 1 of edge positions.
+            targets: An array of the destination vertex id of each edge.
+            weights: An array of the weight of each edge.
+
+        Raises:
+            ValueError: names contains duplicates, or the arrays are not
+                of consistent lengths.
+        """
+        if len(offsets) != len(names) + 1:
+            raise ValueError("offsets must have one more item than names")
+        if len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("targets and weights must match offsets")
+        self.names = names
+        self.index = {name:i for i, name in enumerate(names)}
+        if len(self.index) != len(names):
+            raise ValueError("Vertex names must be unique")
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._transpose = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Creates a new CompactGraph from a Graph.
+
+        The vertices of graph keep their order and are given the ids
+        0 to graph.size() - 1. Vertices that can be reached from graph
+        but are not explicitly part of it are included as well, and are
+        given the ids that follow.
+
+        Args:
+            graph: The Graph object to convert.
+
+        Returns:
+            A CompactGraph with the same vertices and edges as graph.
+
+        Raises:
+            ValueError: Two of the vertices have the same name.
+        """
+        vertices, offsets, targets, weights = _compact_arrays(graph.vertices)
+        return cls([vertex.name for vertex in vertices],
+                offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, edges, names=None):
+        """Creates a new CompactGraph from a list of edge tuples.
+
+        Args:
+            edges: A list of directed edge tuples in the form (v1, v2) or
+                (v1, v2, weight), where v1 and v2 are vertex names.
+                Edges without a weight are given a weight of 0.
+            names (optional): A list of vertex names, including vertices
+                with no edges. These names are given the first ids, in
+                order, followed by any other names found in edges.
+
+        Returns:
+            A CompactGraph containing the vertices and edges in edges.
+        """
+        names = list(names) if names else []
+        index = {name:i for i, name in enumerate(names)}
+        # Count the edges leaving each vertex, then place each edge
+        # directly into its slot (a counting sort by source vertex)
+        counts = array('l', [0] * len(names))
+        for edge in edges:
+            for name in edge[:2]:
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+                    counts.append(0)
+            counts[index[edge[0]]] += 1
+        offsets = array('l', [0] * (len(names) + 1))
+        for i in xrange(len(names)):
+            offsets[i + 1] = offsets[i] + counts[i]
+        targets = array('l', [0] * len(edges))
+        weights = array('d', [0.0] * len(edges))
+        # Reuse counts as the next free slot for each vertex
+        counts = array('l', offsets[:-1])
+        for edge in edges:
+            source = index[edge[0]]
+            slot = counts[source]
+            targets[slot] = index[edge[1]]
+            if len(edge) > 2:
+                weights[slot] = float(edge[2])
+            counts[source] += 1
+        return cls(names, offsets, targets, weights)
+
+    def size(self):
+        """Returns the number of vertices in the CompactGraph."""
+        return len(self.names)
+
+    def edge_count(self):
+        """Returns the number of edges in the CompactGraph."""
+        return len(self.targets)
+
+    def neighbors(self, vertex):
+        """Returns an array of the ids that vertex has edges to."""
+        return self.targets[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    def edges(self, vertex):
+        """Returns a list of (target id, weight) tuples for vertex."""
+        start, end = self.offsets[vertex], self.offsets[vertex + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def transpose(self):
+        """Returns a CompactGraph with the direction of every edge reversed.
+
+        The result is computed once and then cached, since a CompactGraph
+        can not change.
+        """
+        if self._transpose is None:
+            count = len(self.names)
+            offsets = array('l', [0] * (count + 1))
+            for target in self.targets:
+                offsets[target + 1] += 1
+            for i in xrange(count):
+                offsets[i + 1] += offsets[i]
+            targets = array('l', [0] * len(self.targets))
+            weights = array('d', [0.0] * len(self.weights))
+            slots = array('l', offsets[:-1])
+            for source in xrange(count):
+                for i in xrange(self.offsets[source], self.offsets[source + 1]):
+                    target = self.targets[i]
+                    targets[slots[target]] = source
+                    weights[slots[target]] = self.weights[i]
+                    slots[target] += 1
+            self._transpose = CompactGraph(
+                    self.names, offsets, targets, weights)
+            self._transpose._transpose = self
+        return self._transpose
+
+    def is_connected(self):
+        """Determines whether the CompactGraph is strongly connected.
+
+        Follows the same rules as Graph.is_connected.
+
+        Returns:
+            True if there is a path between every pair of vertices, or
+            False otherwise.
+        """
+        return StrongComponents(self).count <= 1
+
+    def has_cycle(self):
+        """Determines whether the CompactGraph contains a cycle.
+
+        Returns:
+            True if the CompactGraph contains at least one cycle, and
+            False otherwise.
+        """
+        return _has_cycle(len(self.names), self.offsets, self.targets)
+
+    def top_sort(self):
+        """Returns a topological sort of this CompactGraph.
+
+        Returns:
+            A list of vertex ids in topological ordering. If the
+            CompactGraph has no vertices, returns an empty list.
+
+        Raises:
+            ValueError: CompactGraph contains at least one cycle.
+        """
+        offsets, targets = self.offsets, self.targets
+        in_degrees = array('l', [0] * len(self.names))
+        for target in targets:
+            in_degrees[target] += 1
+        queue = deque(i for i in xrange(len(self.names)) if in_degrees[i] == 0)
+        visited_vertices = []
+        while queue:
+            current = queue.popleft()
+            visited_vertices.append(current)
+            for i in xrange(offsets[current], offsets[current + 1]):
+                target = targets[i]
+                in_degrees[target] -= 1
+                if in_degrees[target] == 0:
+                    queue.append(target)
+        if len(visited_vertices) != len(self.names):
+            raise ValueError("Graph may not contain a cycle")
+        return visited_vertices
+
+    def find_path(self, start, end):
+        """Returns the shortest path (by number of vertices) from start to end.
+
+        Follows the same rules as find_path, but uses vertex ids.
+
+        Args:
+            start, end: The ids of the vertices between which to find a path.
+
+        Returns:
+            A list of vertex ids representing the path, or [] if no such
+            path exists.
+        """
+        offsets, targets = self.offsets, self.targets
+        # -1 marks vertices that have not been reached yet
+        parent = array('l', [-1] * len(self.names))
+        parent[start] = start
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                path = [current]
+                while current != start:
+                    current = parent[current]
+                    path.append(current)
+                path.reverse()
+                return path
+            for i in xrange(offsets[current], offsets[current + 1]):
+                target = targets[i]
+                if parent[target] == -1:
+                    parent[target] = current
+                    queue.append(target)
+        return []
+
+    def dfs(self, start, goal):
+        """Search for goal using depth first search.
+
+        Args:
+            start: The id of the vertex from which to search.
+            goal: The id of the vertex for which to search.
+
+        Returns:
+            True if goal was found, or False otherwise.
+        """
+        offsets, targets = self.offsets, self.targets
+        discovered = bytearray(len(self.names))
+        discovered[start] = 1
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            if current == goal:
+                return True
+            for i in xrange(offsets[current], offsets[current + 1]):
+                target = targets[i]
+                if not discovered[target]:
+                    discovered[target] = 1
+                    stack.append(target)
+        return False
+
+class StrongComponents(object):
+    """The strongly connected components of a Graph or CompactGraph.
+
+    Components are found with an iterative version of Tarjan's algorithm
+    in O(V + E) time, and are numbered from 0 to count - 1 in topological
+    order, so that every edge between two different components goes from
+    a lower numbered component to a higher numbered one.
+
+    As with Graph.has_cycle, vertices that can be reached from a Graph
+    but are not explicitly part of it are included.
+    """
+
+    def __init__(self, graph):
+        """Finds the strongly connected components of graph.
+
+        Args:
+            graph: The Graph or CompactGraph to divide into components.
+                Components are not updated if graph changes later.
+        """
+        if isinstance(graph, CompactGraph):
+            # Vertices are already identified by their ids
+            self.vertices = None
+            offsets, targets = graph.offsets, graph.targets
+            count = graph.size()
+        else:
+            self.vertices, offsets, targets, weights = _compact_arrays(
+                    graph.vertices)
+            self._ids = {vertex:i for i, vertex in enumerate(self.vertices)}
+            count = len(self.vertices)
+        self._offsets = offsets
+        self._targets = targets
+        self.labels, self.count = _tarjan(count, offsets, targets)
+
+    def _id(self, vertex):
+        """Returns the id of a Vertex object or vertex id."""
+        if self.vertices is None:
+            return vertex
+        if vertex not in self._ids:
+            raise ValueError("{} is not part of the graph".format(vertex))
+        return self._ids[vertex]
+
+    def components(self):
+        """Returns a list of the components, in topological order.
+
+        Returns:
+            A list of lists, where the list at index i contains the
+            vertices in component i. Vertices are Vertex objects if the
+            components came from a Graph, or ids for a CompactGraph.
+        """
+        components = [[] for i in xrange(self.count)]
+        for i, label in enumerate(self.labels):
+            components[label].append(
+                    i if self.vertices is None else self.vertices[i])
+        return components
+
+    def component_of(self, vertex):
+        """Returns the number of the component containing vertex.
+
+        Args:
+            vertex: A Vertex object, or an id for a CompactGraph.
+
+        Raises:
+            ValueError: vertex is not part of the graph.
+        """
+        return self.labels[self._id(vertex)]
+
+    def condensation(self):
+        """Returns the condensation of the graph.
+
+        Returns:
+            An acyclic CompactGraph with one vertex per component, where
+            the vertex with id (and name) i represents component i, and
+            there is a single edge from i to j if any vertex in i has an
+            edge to a vertex in j.
+        """
+        labels, offsets, targets = self.labels, self._offsets, self._targets
+        edges = set()
+        for source in xrange(len(labels)):
+            for i in xrange(offsets[source], offsets[source + 1]):
+                if labels[source] != labels[targets[i]]:
+                    edges.add((labels[source], labels[targets[i]]))
+        return CompactGraph.from_edges(sorted(edges), range(self.count))
+
+def _compact_arrays(vertices):
+    """Returns the CSR arrays for the vertices reachable from vertices.
+
+    Returns:
+        A tuple of (vertices, offsets, targets, weights), where vertices
+        is a new list of every Vertex object that can be reached, in id
+        order, starting with the given vertices.
+    """
+    vertices = list(vertices)
+    ids = {vertex:i for i, vertex in enumerate(vertices)}
+    offsets = array('l', [0])
+    targets = array('l')
+    weights = array('d')
+    # vertices grows as implicit vertices are found, and their
+    # edges are added in id order so that offsets stays sorted
+    i = 0
+    while i < len(vertices):
+        for edge in vertices[i].edges:
+            if edge.vertex not in ids:
+                ids[edge.vertex] = len(vertices)
+                vertices.append(edge.vertex)
+            targets.append(ids[edge.vertex])
+            weights.append(edge.weight)
+        offsets.append(len(targets))
+        i += 1
+    return vertices, offsets, targets, weights
+
+def _has_cycle(count, offsets, targets):
+    """Determines whether the CSR arrays contain a cycle."""
+    # 0: not yet seen, 1: on the current path, 2: fully explored
+    state = bytearray(count)
+    for root in xrange(count):
+        if state[root]:
+            continue
+        state[root] = 1
+        # Stack of (vertex, position of the next edge to look at)
+        stack = [(root, offsets[root])]
+        while stack:
+            current, i = stack[-1]
+            if i == offsets[current + 1]:
+                state[current] = 2
+                stack.pop()
+                continue
+            stack[-1] = (current, i + 1)
+            target = targets[i]
+            if state[target] == 1:
+                return True
+            if state[target] == 0:
+                state[target] = 1
+                stack.append((target, offsets[target]))
+    return False
+
+def _tarjan(count, offsets, targets):
+    """Labels strongly connected components using Tarjan's algorithm.
+
+    Returns:
+        A tuple of (labels, number of components), where labels is an
+        array of the component number for each vertex id, and components
+        are numbered in topological order.
+    """
+    # Order in which each vertex was first reached, or -1 if not yet
+    order = array('l', [-1] * count)
+    low = array('l', [0] * count)
+    on_stack = bytearray(count)
+    labels = array('l', [-1] * count)
+    stack = []
+    counter = 0
+    found = 0
+    for root in xrange(count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # Replaces recursion: (vertex, position of its next edge to look at)
+        work = [(root, offsets[root])]
+        while work:
+            current, i = work[-1]
+            if i < offsets[current + 1]:
+                work[-1] = (current, i + 1)
+                target = targets[i]
+                if order[target] == -1:
+                    order[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append((target, offsets[target]))
+                elif on_stack[target] and order[target] < low[current]:
+                    low[current] = order[target]
+                continue
+            # All edges of current have been explored
+            work.pop()
+            if work and low[current] < low[work[-1][0]]:
+                low[work[-1][0]] = low[current]
+            if low[current] == order[current]:
+                # current is the root of a component; pop the whole thing
+                while True:
+                    vertex = stack.pop()
+                    on_stack[vertex] = 0
+                    labels[vertex] = found
+                    if vertex == current:
+                        break
+                found += 1
+    # Tarjan's algorithm finds components in reverse topological order
+    for i in xrange(count):
+        labels[i] = found - 1 - labels[i]
+    return labels, found
+
+class TopologicalOrder(object):
+    """A topological order of a growing acyclic graph.
+
+    Uses the Pearce-Kelly algorithm: when an edge is added against the
+    current order, only the vertices whose positions lie between its two
+    ends are searched and reordered, rather than the whole graph.
+
+    Created by Graph.track_order; Vertex.add_edge and Graph.add_vertex
+    keep it up to date. Vertices only hold weak references to their
+    TopologicalOrder, so it lasts as long as the Graph that created it.
+    """
+
+    def __init__(self):
+        """Creates a new, empty TopologicalOrder."""
+        # Position of each Vertex; lower positions come first
+        self.position = {}
+        # Vertices with an edge to each Vertex
+        self.predecessors = {}
+
+    def vertices(self):
+        """Returns a list of all tracked vertices in topological order."""
+        return sorted(self.position, key=self.position.get)
+
+    def add(self, vertices):
+        """Starts tracking vertices and everything reachable from them.
+
+        Vertices that are already tracked are ignored. The new vertices
+        are placed before all tracked vertices, which is always valid
+        because tracked vertices can not have edges to untracked ones.
+
+        Args:
+            vertices: An iterable of Vertex objects.
+
+        Raises:
+            ValueError: The new vertices contain a cycle, or one of them
+                is tracked by another TopologicalOrder. Nothing is
+                tracked in that case.
+        """
+        new = []
+        seen = set()
+        for vertex in vertices:
+            if vertex._order is not self and vertex not in seen:
+                seen.add(vertex)
+                new.append(vertex)
+        # new grows as untracked vertices are found
+        i = 0
+        while i < len(new):
+            if new[i]._order is not None:
+                raise ValueError("{} is already tracked".format(new[i]))
+            for edge in new[i].edges:
+                if edge.vertex._order is not self and edge.vertex not in seen:
+                    seen.add(edge.vertex)
+                    new.append(edge.vertex)
+            i += 1
+        # Order the new vertices among themselves
+        in_degrees = Counter(edge.vertex for vertex in new
+                for edge in vertex.edges if edge.vertex in seen)
+        queue = deque(vertex for vertex in new if in_degrees[vertex] == 0)
+        ordered = []
+        while queue:
+            current = queue.popleft()
+            ordered.append(current)
+            for edge in current.edges:
+                if edge.vertex in seen:
+                    in_degrees[edge.vertex] -= 1
+                    if in_degrees[edge.vertex] == 0:
+                        queue.append(edge.vertex)
+        if len(ordered) != len(new):
+            raise ValueError("Graph may not contain a cycle")
+        first = min(self.position.itervalues()) if self.position else 0
+        for i, vertex in enumerate(ordered):
+            self.position[vertex] = first - len(ordered) + i
+            self.predecessors[vertex] = []
+            vertex._order_ref = weakref.ref(self)
+        for vertex in ordered:
+            for edge in vertex.edges:
+                self.predecessors[edge.vertex].append(vertex)
+
+    def release(self):
+        """Stops tracking every Vertex, so they can be tracked again."""
+        for vertex in self.position:
+            vertex._order_ref = None
+        self.position = {}
+        self.predecessors = {}
+
+    def add_edge(self, start, end):
+        """Updates the order for a new edge from start to end.
+
+        Called by Vertex.add_edge before the Edge is stored.
+
+        Args:
+            start: The tracked Vertex the edge leaves from.
+            end: The Vertex the edge points to. It is tracked first if
+                it is not already.
+
+        Raises:
+            ValueError: The edge would create a cycle. The order is not
+                changed in that case, although end stays tracked.
+        """
+        if start is end:
+            raise ValueError("Edge would create a cycle at {}".format(start))
+        if end._order is not self:
+            self.add([end])
+        position = self.position
+        lower, upper = position[end], position[start]
+        if lower > upper:
+            # Already in order
+            self.predecessors[end].append(start)
+            return
+        # Vertices after end that must now come after start
+        forward = self._search(end, lambda v: (e.vertex for e in v.edges),
+                lambda p: p < upper, start)
+        # Vertices before start that must stay before end
+        backward = self._search(start, self.predecessors.get,
+                lambda p: p > lower)
+        moved = sorted(backward, key=position.get) + sorted(
+                forward, key=position.get)
+        # Reuse the same positions, with backward first and forward last
+        for vertex, new_position in zip(
+                moved, sorted(position[v] for v in moved)):
+            position[vertex] = new_position
+        self.predecessors[end].append(start)
+
+    def _search(self, root, neighbors, in_range, forbidden=None):
+        """Depth first search used by add_edge.
+
+        Only vertices whose position passes in_range are explored, and
+        neighbors returns the vertices next to a given Vertex.
+
+        Raises:
+            ValueError: forbidden was reached, so the edge makes a cycle.
+        """
+        found = [root]
+        seen = set(found)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            for vertex in neighbors(current):
+                if vertex is forbidden:
+                    raise ValueError(
+                            "Edge would create a cycle at {}".format(vertex))
+                if vertex not in seen and in_range(self.position[vertex]):
+                    seen.add(vertex)
+                    found.append(vertex)
+                    stack.append(vertex)
+        return found
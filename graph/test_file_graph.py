@@ -1,7 +1,14 @@
 from StringIO import StringIO
 from nose.tools import assert_raises
+import os
+import tempfile
 from file_graph import graph_from_file
+from file_graph import write_snapshot
+from file_graph import load_snapshot
 from graph import Vertex
+from graph import Edge
+from graph import Graph
+from graph import CompactGraph
 
 # Most tests use StringIO, so confirm that files can be read in
 # the same way. (This file is not formatted for Graph creation.)
@@ -109,6 +116,67 @@ def test_extra_newlines():
     name1 = Vertex._make_test_vertex()
     name2 = Vertex._make_test_vertex()
     s = StringIO("2\n{0}\n\n{1}".format(name1, name2))
-    assert_raises(ValueError, graph_from_file, s) 
+    assert_raises(ValueError, graph_from_file, s)
+
+def test_trailing_newline():
+    name1 = Vertex._make_test_vertex()
+    name2 = Vertex._make_test_vertex()
+    s = StringIO("2\n{0}\n{1}\n{0}|{1}\n".format(name1, name2))
+    g = graph_from_file(s)
+    assert g.size() == 2
+    assert len(g.vertices[0].edges) == 1
+
+def test_extra_trailing_newlines():
+    name1 = Vertex._make_test_vertex()
+    name2 = Vertex._make_test_vertex()
+    s = StringIO("2\n{0}\n{1}\n{0}|{1}\n\n".format(name1, name2))
+    assert_raises(ValueError, graph_from_file, s)
+
+def _snapshot_round_trip(source):
+    handle, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(handle, "wb") as snapshot:
+            write_snapshot(source, snapshot)
+        return load_snapshot(path)
+    finally:
+        os.remove(path)
+
+def test_snapshot_round_trip():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    c = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b, 2.5))
+    a.add_edge(Edge(c))
+    c.add_edge(Edge(a, 1))
+    g = _snapshot_round_trip(Graph([a, b, c]))
+    assert g.names == [a.name, b.name, c.name]
+    assert g.edges(0) == [(1, 2.5), (2, 0.0)]
+    assert g.edges(1) == []
+    assert g.edges(2) == [(0, 1.0)]
+
+def test_snapshot_compact():
+    c = CompactGraph.from_edges([("x", "yy", 3), ("yy", "zzz", 4)])
+    g = _snapshot_round_trip(c)
+    assert g.names == c.names
+    assert list(g.offsets) == list(c.offsets)
+    assert list(g.targets) == list(c.targets)
+    assert list(g.weights) == list(c.weights)
+
+def test_snapshot_empty():
+    g = _snapshot_round_trip(Graph([]))
+    assert g.size() == 0
+    assert g.edge_count() == 0
+
+def test_snapshot_invalid_file():
+    assert_raises(ValueError, load_snapshot, "test_file.txt")
 
+def test_snapshot_name_types():
+    c = CompactGraph.from_edges([(1, u"\xe9", 3), (u"\xe9", "x", 4),
+            ("x", 10 ** 20, 5)])
+    g = _snapshot_round_trip(c)
+    assert g.names == c.names
+    assert [type(name) for name in g.names] == [int, unicode, str, long]
 
+def test_snapshot_invalid_name():
+    c = CompactGraph.from_edges([((1, 2), "x", 3)])
+    assert_raises(TypeError, write_snapshot, c, StringIO())
@@ -1,12 +1,15 @@
+import random
 from graph import Vertex
 from graph import Edge
 from graph import find_path
 from graph import dfs
 from graph import Graph
+from graph import CompactGraph
+from graph import StrongComponents
 from nose.tools import assert_raises
 
-# Since each Vertex needs a unique name, I need to either give them all
-# unique names in these tests or break the tests into more files.
+# Each Vertex in a Graph needs a unique name, so the tests either give
+# them all unique names or use separate graphs.
 # For this purpose, I created Vertex._make_test_vertex(), but the older
 # tests still use manual test names.
 def test_new_vertex():
@@ -16,7 +19,12 @@ def test_new_vertex():
 
 def test_duplicate_vertex_name():
     a = Vertex("A2")
-    assert_raises(ValueError, Vertex, "A2")
+    b = Vertex("A2")
+    assert b.name == "A2"
+    assert_raises(ValueError, Graph, [a, b])
+    g = Graph([a])
+    assert_raises(ValueError, g.add_vertex, b)
+    assert g.size() == 1
 
 def test_new_vertex_empty_string():
     a = Vertex("")
@@ -29,6 +37,7 @@ def test_make_test_vertex():
     s = Vertex._make_test_vertex()
     a = Vertex(s)
     assert a.name == s
+    assert Vertex._make_test_vertex() != s
 
 def test_vertex_repr():
     s = Vertex._make_test_vertex()
@@ -337,3 +346,281 @@ def test_dfs_cycle():
 
 
 
+
+def test_compact_from_graph():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b, 3))
+    c = CompactGraph.from_graph(Graph([a, b]))
+    assert c.size() == 2
+    assert c.edge_count() == 1
+    assert c.names == [a.name, b.name]
+    assert c.edges(0) == [(1, 3.0)]
+    assert list(c.neighbors(1)) == []
+
+def test_compact_from_graph_implicit():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b))
+    c = CompactGraph.from_graph(Graph([a]))
+    assert c.size() == 2
+    assert c.index[b.name] == 1
+
+def test_compact_from_edges():
+    c = CompactGraph.from_edges([("a", "b", 2), ("b", "c"), ("a", "c", 1)])
+    assert c.names == ["a", "b", "c"]
+    assert c.edges(0) == [(1, 2.0), (2, 1.0)]
+    assert c.edges(1) == [(2, 0.0)]
+
+def test_compact_from_edges_extra_names():
+    c = CompactGraph.from_edges([("a", "b")], ["z"])
+    assert c.names == ["z", "a", "b"]
+    assert not c.is_connected()
+
+def test_compact_duplicate_names():
+    assert_raises(ValueError, CompactGraph, ["a", "a"], [0, 0, 0], [], [])
+
+def test_compact_transpose():
+    c = CompactGraph.from_edges([("a", "b", 2), ("c", "b", 1)])
+    t = c.transpose()
+    assert t.edges(1) == [(0, 2.0), (2, 1.0)]
+    assert t.transpose() is c
+
+def test_compact_is_connected():
+    c = CompactGraph.from_edges([(1, 2), (2, 3), (3, 1)])
+    assert c.is_connected()
+    c = CompactGraph.from_edges([(1, 2), (2, 3), (3, 2)])
+    assert not c.is_connected()
+
+def test_compact_has_cycle():
+    assert not CompactGraph.from_edges([(1, 2), (1, 3), (2, 3)]).has_cycle()
+    assert CompactGraph.from_edges([(1, 2), (2, 3), (3, 1)]).has_cycle()
+    assert CompactGraph.from_edges([(1, 1)]).has_cycle()
+
+def test_compact_top_sort():
+    c = CompactGraph.from_edges([("c", "d"), ("a", "b"), ("b", "c")])
+    order = [c.names[i] for i in c.top_sort()]
+    assert order == ["a", "b", "c", "d"]
+
+def test_compact_top_sort_cycle():
+    c = CompactGraph.from_edges([(1, 2), (2, 1)])
+    assert_raises(ValueError, c.top_sort)
+
+def test_compact_find_path():
+    c = CompactGraph.from_edges([(0, 1), (1, 2), (0, 3), (3, 4), (4, 2)])
+    assert c.find_path(0, 2) == [0, 1, 2]
+    assert c.find_path(0, 0) == [0]
+    assert c.find_path(2, 0) == []
+
+def test_compact_dfs():
+    c = CompactGraph.from_edges([(0, 1), (1, 2)])
+    assert c.dfs(0, 2)
+    assert not c.dfs(2, 0)
+
+def test_strong_components_graph():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    c = Vertex(Vertex._make_test_vertex())
+    d = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b))
+    b.add_edge(Edge(a))
+    b.add_edge(Edge(c))
+    c.add_edge(Edge(d))
+    d.add_edge(Edge(c))
+    s = StrongComponents(Graph([c, d, a, b]))
+    assert s.count == 2
+    assert s.component_of(a) == s.component_of(b) == 0
+    assert s.component_of(c) == s.component_of(d) == 1
+    assert [set(x) for x in s.components()] == [set([a, b]), set([c, d])]
+
+def test_strong_components_not_in_graph():
+    a = Vertex(Vertex._make_test_vertex())
+    s = StrongComponents(Graph([]))
+    assert s.count == 0
+    assert_raises(ValueError, s.component_of, a)
+
+def test_strong_components_implicit():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b))
+    s = StrongComponents(Graph([a]))
+    assert s.count == 2
+    assert s.component_of(b) == 1
+
+def test_strong_components_compact():
+    c = CompactGraph.from_edges([(0, 1), (1, 2), (2, 1), (3, 3)])
+    s = StrongComponents(c)
+    assert s.count == 3
+    assert s.component_of(1) == s.component_of(2)
+    assert s.component_of(0) < s.component_of(1)
+
+def test_condensation():
+    c = CompactGraph.from_edges(
+            [(0, 1), (1, 0), (1, 2), (0, 2), (2, 3), (3, 2), (4, 2)])
+    s = StrongComponents(c)
+    dag = s.condensation()
+    assert dag.size() == 3
+    assert dag.edge_count() == 2
+    assert not dag.has_cycle()
+    assert s.component_of(2) == 2
+
+def test_strong_components_long_chain():
+    # Deep enough to overflow the stack if the search were recursive
+    edges = [(i, i + 1) for i in xrange(5000)] + [(5000, 0)]
+    assert StrongComponents(CompactGraph.from_edges(edges)).count == 1
+
+def test_is_connected_implicit_path():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    c = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(c))
+    c.add_edge(Edge(b))
+    b.add_edge(Edge(a))
+    assert Graph([a, b]).is_connected()
+
+def test_has_cycle_diamond():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    c = Vertex(Vertex._make_test_vertex())
+    d = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(b))
+    a.add_edge(Edge(c))
+    b.add_edge(Edge(d))
+    c.add_edge(Edge(d))
+    assert not Graph([a, b, c, d]).has_cycle()
+
+def test_track_order_existing_edges():
+    a, b, c = [Vertex(Vertex._make_test_vertex()) for i in xrange(3)]
+    b.add_edge(Edge(c))
+    a.add_edge(Edge(b))
+    g = Graph([c, b, a])
+    g.track_order()
+    assert g.top_sort() == [a, b, c]
+    assert not g.has_cycle()
+
+def test_track_order_with_cycle():
+    a, b = [Vertex(Vertex._make_test_vertex()) for i in xrange(2)]
+    a.add_edge(Edge(b))
+    b.add_edge(Edge(a))
+    g = Graph([a, b])
+    assert_raises(ValueError, g.track_order)
+    assert g.order is None
+    assert a._order is None
+
+def test_track_order_new_edges():
+    a, b, c, d = [Vertex(Vertex._make_test_vertex()) for i in xrange(4)]
+    g = Graph([a, b, c, d])
+    g.track_order()
+    d.add_edge(Edge(c))
+    c.add_edge(Edge(b))
+    b.add_edge(Edge(a))
+    assert g.top_sort() == [d, c, b, a]
+
+def test_track_order_rejects_cycle():
+    a, b, c = [Vertex(Vertex._make_test_vertex()) for i in xrange(3)]
+    g = Graph([a, b, c])
+    g.track_order()
+    a.add_edge(Edge(b))
+    b.add_edge(Edge(c))
+    assert_raises(ValueError, c.add_edge, Edge(a))
+    assert_raises(ValueError, a.add_edge, Edge(a))
+    assert c.edges == []
+    assert a.edges[0].vertex == b
+    assert g.top_sort() == [a, b, c]
+
+def test_track_order_new_vertex():
+    a, b, c = [Vertex(Vertex._make_test_vertex()) for i in xrange(3)]
+    a.add_edge(Edge(b))
+    g = Graph([a, b])
+    g.track_order()
+    c.add_edge(Edge(a))
+    g.add_vertex(c)
+    assert g.top_sort() == [c, a, b]
+    assert_raises(ValueError, b.add_edge, Edge(c))
+
+def test_track_order_implicit_vertex():
+    a, b = [Vertex(Vertex._make_test_vertex()) for i in xrange(2)]
+    g = Graph([a])
+    g.track_order()
+    a.add_edge(Edge(b))
+    assert g.top_sort() == [a]
+    assert b._order is g.order
+    assert_raises(ValueError, b.add_edge, Edge(a))
+
+def test_track_order_two_graphs():
+    a = Vertex(Vertex._make_test_vertex())
+    g = Graph([a])
+    g.track_order()
+    assert_raises(ValueError, Graph([a]).track_order)
+
+def test_track_order_after_graph_dropped():
+    a, b = [Vertex(Vertex._make_test_vertex()) for i in xrange(2)]
+    a.add_edge(Edge(b))
+    g = Graph([a, b])
+    g.track_order()
+    del g
+    assert a._order is None
+    g = Graph([b, a])
+    g.track_order()
+    assert g.top_sort() == [a, b]
+    assert_raises(ValueError, b.add_edge, Edge(a))
+
+def test_untrack_order():
+    a, b = [Vertex(Vertex._make_test_vertex()) for i in xrange(2)]
+    g = Graph([a, b])
+    g.track_order()
+    g.untrack_order()
+    assert g.order is None
+    assert a._order is None
+    # Untracked vertices accept any edge, and may be tracked again
+    a.add_edge(Edge(b))
+    b.add_edge(Edge(a))
+    assert g.has_cycle()
+    h = Graph([a])
+    assert_raises(ValueError, h.track_order)
+    b.edges = []
+    h.track_order()
+    assert b._order is h.order
+
+def test_track_order_random():
+    vertices = [Vertex(Vertex._make_test_vertex()) for i in xrange(30)]
+    g = Graph(vertices)
+    g.track_order()
+    for trial in xrange(300):
+        start, end = random.sample(vertices, 2)
+        try:
+            start.add_edge(Edge(end))
+        except ValueError:
+            # Rejected edges really would have made a cycle
+            assert find_path(end, start) != []
+            continue
+        order = g.top_sort()
+        positions = {v:i for i, v in enumerate(order)}
+        for v in vertices:
+            for edge in v.edges:
+                assert positions[v] < positions[edge.vertex]
+
+def test_same_name_separate_graphs():
+    g1 = Graph([Vertex("A37")])
+    g2 = Graph([Vertex("A37")])
+    assert g1.get_vertex("A37") is not g2.get_vertex("A37")
+
+def test_get_vertex():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    g = Graph([a])
+    g.add_vertex(b)
+    assert g.get_vertex(b.name) is b
+    assert g.unique == set([a, b])
+    assert g.id_of(a.name) == 0
+    assert g.id_of(b.name) == 1
+    assert_raises(ValueError, g.get_vertex, "Not a name")
+    assert_raises(ValueError, g.id_of, "Not a name")
+
+def test_id_of_matches_compact():
+    a = Vertex(Vertex._make_test_vertex())
+    b = Vertex(Vertex._make_test_vertex())
+    b.add_edge(Edge(a))
+    g = Graph([b, a])
+    c = CompactGraph.from_graph(g)
+    assert c.index[a.name] == g.id_of(a.name)
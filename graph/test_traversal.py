@@ -0,0 +1,91 @@
+from random import randint
+from graph import Vertex
+from graph import Edge
+from graph import CompactGraph
+from traversal import bfs_tree
+from traversal import path_from_tree
+from traversal import find_paths
+from traversal import bidirectional_path
+from traversal import hop_distances
+from nose.tools import assert_equals
+
+def _chain(count):
+    vertices = [Vertex(Vertex._make_test_vertex()) for i in xrange(count)]
+    for i in xrange(count - 1):
+        vertices[i].add_edge(Edge(vertices[i + 1]))
+    return vertices
+
+def test_bfs_tree_single():
+    a = Vertex(Vertex._make_test_vertex())
+    assert_equals(bfs_tree(a), {a:None})
+
+def test_bfs_tree_chain():
+    a, b, c = _chain(3)
+    assert_equals(bfs_tree(a), {a:None, b:a, c:b})
+
+def test_bfs_tree_stops_at_targets():
+    a, b, c = _chain(3)
+    assert_equals(bfs_tree(a, [b]), {a:None, b:a})
+
+def test_path_from_tree_missing():
+    a, b = _chain(2)
+    assert_equals(path_from_tree(bfs_tree(b), a), [])
+
+def test_find_paths():
+    a, b, c = _chain(3)
+    d = Vertex(Vertex._make_test_vertex())
+    a.add_edge(Edge(c))
+    assert_equals(find_paths(a, [a, b, c, d]),
+            {a:[a], b:[a, b], c:[a, c], d:[]})
+
+def test_find_paths_no_targets():
+    a, b = _chain(2)
+    assert_equals(find_paths(a, []), {})
+
+def test_bidirectional_path_same():
+    c = CompactGraph.from_edges([(0, 1)])
+    assert_equals(bidirectional_path(c, 0, 0), [0])
+
+def test_bidirectional_path_no_path():
+    c = CompactGraph.from_edges([(0, 1), (2, 1)])
+    assert_equals(bidirectional_path(c, 0, 2), [])
+
+def test_bidirectional_path_chain():
+    c = CompactGraph.from_edges([(i, i + 1) for i in xrange(10)])
+    assert_equals(bidirectional_path(c, 0, 10), range(11))
+    assert_equals(bidirectional_path(c, 10, 0), [])
+
+def test_bidirectional_path_shortcut():
+    edges = [(0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 4)]
+    c = CompactGraph.from_edges(edges)
+    assert_equals(bidirectional_path(c, 0, 4), [0, 5, 4])
+
+def test_bidirectional_path_matches_find_path():
+    for trial in xrange(20):
+        edges = [(randint(0, 40), randint(0, 40)) for i in xrange(80)]
+        c = CompactGraph.from_edges(edges)
+        for start in xrange(0, c.size(), 5):
+            for end in xrange(c.size()):
+                path = bidirectional_path(c, start, end)
+                assert_equals(len(path), len(c.find_path(start, end)))
+                for i in xrange(len(path) - 1):
+                    assert path[i + 1] in c.neighbors(path[i])
+
+def test_hop_distances_single():
+    c = CompactGraph.from_edges([], [0])
+    assert_equals(list(hop_distances(c, 0)), [0])
+
+def test_hop_distances_chain():
+    c = CompactGraph.from_edges([(0, 1), (1, 2), (3, 2)])
+    assert_equals(list(hop_distances(c, 0)), [0, 1, 2, -1])
+
+def test_hop_distances_matches_find_path():
+    for trial in xrange(20):
+        edges = [(randint(0, 60), randint(0, 60)) for i in xrange(200)]
+        c = CompactGraph.from_edges(edges)
+        # Default switching, switching every level, and always top-down
+        for alpha, beta in ((14, 24), (10 ** 9, 1), (0, 10 ** 9)):
+            distances = hop_distances(c, 0, alpha, beta)
+            for vertex in xrange(c.size()):
+                assert_equals(distances[vertex],
+                        len(c.find_path(0, vertex)) - 1)
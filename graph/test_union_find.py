@@ -0,0 +1,71 @@
+from StringIO import StringIO
+from union_find import UnionFind
+from union_find import components_from_file
+from union_find import components_from_edges
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+def test_union_find_new():
+    u = UnionFind(3)
+    assert_equals(u.size(), 3)
+    assert_equals(u.count, 3)
+    assert_equals([u.find(i) for i in xrange(3)], [0, 1, 2])
+
+def test_union_find_add():
+    u = UnionFind()
+    assert_equals(u.add(), 0)
+    assert_equals(u.add(), 1)
+    assert_equals(u.count, 2)
+
+def test_union_find_union():
+    u = UnionFind(4)
+    assert u.union(0, 1)
+    assert u.union(2, 3)
+    assert not u.union(1, 0)
+    assert_equals(u.count, 2)
+    assert u.find(0) == u.find(1)
+    assert u.find(0) != u.find(2)
+    assert u.union(1, 3)
+    assert_equals(u.set_size(2), 4)
+    assert_equals(u.count, 1)
+
+def test_union_find_long_chain():
+    u = UnionFind(10000)
+    for i in xrange(9999):
+        u.union(i, i + 1)
+    assert_equals(u.set_size(0), 10000)
+    assert max(u.rank) <= 14
+
+def test_components_from_edges():
+    lines = ["a b", "c d", "b e 5", "f f"]
+    labels, sizes = components_from_edges(lines)
+    assert_equals(labels, {"a":0, "b":0, "e":0, "c":1, "d":1, "f":2})
+    assert_equals(sizes, [3, 2, 1])
+
+def test_components_from_edges_names():
+    labels, sizes = components_from_edges(["x|y\n"], "|", ["z"])
+    assert_equals(labels, {"z":0, "x":1, "y":1})
+    assert_equals(sizes, [1, 2])
+
+def test_components_from_edges_short_line():
+    assert_raises(ValueError, components_from_edges, ["a"])
+
+def test_components_from_file():
+    s = StringIO("4\nA\nB\nC\nD\nA|B|3\nC|B\n")
+    labels, sizes = components_from_file(s)
+    assert_equals(labels, {"A":0, "B":0, "C":0, "D":1})
+    assert_equals(sizes, [3, 1])
+
+def test_components_from_file_empty():
+    assert_equals(components_from_file(StringIO("0")), ({}, []))
+
+def test_components_from_file_unknown_name():
+    s = StringIO("2\nA\nB\nA|C")
+    assert_raises(ValueError, components_from_file, s)
+
+def test_components_from_file_duplicate_name():
+    assert_raises(ValueError, components_from_file, StringIO("2\nA\nA"))
+
+def test_components_from_file_invalid_count():
+    assert_raises(ValueError, components_from_file, StringIO(""))
+    assert_raises(ValueError, components_from_file, StringIO("2.5"))
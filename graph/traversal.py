@@ -0,0 +1,223 @@
+from array import array
+from collections import deque
+
+def bfs_tree(start, targets=None):
+    """Builds a breadth first search tree from start.
+
+    Args:
+        start: The Vertex object from which to search.
+        targets (optional): An iterable of Vertex objects. If given, the
+            search stops as soon as all of them have been reached, so the
+            tree may not contain every reachable Vertex.
+
+    Returns:
+        A dictionary of the format {vertex: parent} for each Vertex reached,
+            where parent is the Vertex before it on a shortest path (by
+            number of vertices) from start. The parent of start is None.
+    """
+    parent = {start:None}
+    remaining = None
+    if targets is not None:
+        remaining = set(targets)
+        remaining.discard(start)
+        if not remaining:
+            return parent
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for edge in current.edges:
+            if edge.vertex in parent:
+                continue
+            parent[edge.vertex] = current
+            queue.append(edge.vertex)
+            if remaining is not None:
+                remaining.discard(edge.vertex)
+                if not remaining:
+                    return parent
+    return parent
+
+def path_from_tree(parent, end):
+    """Returns the path to end stored in a tree from bfs_tree.
+
+    Args:
+        parent: A dictionary of {vertex: parent}, as returned by bfs_tree.
+        end: The Vertex at which the path should end.
+
+    Returns:
+        A list of Vertex objects from the root of the tree to end, or [] if
+            end is not part of the tree.
+    """
+    if end not in parent:
+        return []
+    path = []
+    while end is not None:
+        path.append(end)
+        end = parent[end]
+    path.reverse()
+    return path
+
+def find_paths(start, targets):
+    """Returns the shortest path from start to each of several targets.
+
+    Uses a single breadth first search for all of the targets, so this is
+    much faster than calling find_path once for each target.
+
+    Args:
+        start: The Vertex object from which to find paths.
+        targets: An iterable of Vertex objects to find paths to.
+
+    Returns:
+        A dictionary of the format {target: path}, where path is a list of
+            Vertex objects as returned by find_path, or [] if there is no
+            path from start to target.
+    """
+    targets = list(targets)
+    parent = bfs_tree(start, targets)
+    return {target:path_from_tree(parent, target) for target in targets}
+
+def bidirectional_path(graph, start, end):
+    """Returns the shortest path from start to end in a CompactGraph.
+
+    Searches forward from start and backward from end at the same time,
+    always expanding the smaller of the two frontiers, so that far fewer
+    vertices are explored than by find_path on large graphs.
+    Vertex objects only know their outgoing edges, so this search
+    requires a CompactGraph, which can provide the reverse edges.
+
+    Args:
+        graph: The CompactGraph to search.
+        start, end: The ids of the vertices between which to find a path.
+
+    Returns:
+        A list of vertex ids representing the shortest path (by number of
+            vertices) from start to end, or [] if there is no such path.
+    """
+    if start == end:
+        return [start]
+    reverse = graph.transpose()
+    count = graph.size()
+    # parents[0] is the forward search and parents[1] the backward search
+    parents = (array('l', [-1] * count), array('l', [-1] * count))
+    distances = (array('l', [0] * count), array('l', [0] * count))
+    parents[0][start] = start
+    parents[1][end] = end
+    frontiers = ([start], [end])
+    sides = (graph, reverse)
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other_parent = parents[side], parents[1 - side]
+        distance, other_distance = distances[side], distances[1 - side]
+        offsets, targets = sides[side].offsets, sides[side].targets
+        # Finish the whole level so that the best meeting point is found
+        best = None
+        best_length = None
+        next_frontier = []
+        for current in frontiers[side]:
+            for i in xrange(offsets[current], offsets[current + 1]):
+                target = targets[i]
+                if other_parent[target] != -1:
+                    length = distance[current] + 1 + other_distance[target]
+                    if best is None or length < best_length:
+                        best = (current, target)
+                        best_length = length
+                if parent[target] == -1:
+                    parent[target] = current
+                    distance[target] = distance[current] + 1
+                    next_frontier.append(target)
+        if best is not None:
+            near, far = best
+            if side == 1:
+                # Convert the meeting edge to the forward direction
+                near, far = far, near
+            return (_walk_back(parents[0], start, near)[::-1] +
+                    _walk_back(parents[1], end, far))
+        frontiers = ((next_frontier, frontiers[1]) if side == 0
+                else (frontiers[0], next_frontier))
+    return []
+
+def _walk_back(parent, root, vertex):
+    """Returns the ids from vertex back to root in a parent array."""
+    path = [vertex]
+    while vertex != root:
+        vertex = parent[vertex]
+        path.append(vertex)
+    return path
+
+def hop_distances(graph, source, alpha=14, beta=24):
+    """Returns the number of edges on the shortest path to each vertex.
+
+    Uses direction-optimizing breadth first search: small frontiers are
+    expanded top-down by following their outgoing edges, while large
+    frontiers are expanded bottom-up, by having each unvisited vertex
+    look for any incoming edge from the frontier and stopping at the
+    first one. On low-diameter graphs, this skips most of the edges
+    that a top-down search would check in its largest levels.
+
+    Args:
+        graph: The CompactGraph to search.
+        source: The id of the vertex from which to search.
+        alpha (optional): Switch to bottom-up once the frontier has more
+            than 1/alpha of the edges of the unvisited vertices.
+        beta (optional): Switch back to top-down once the frontier has
+            fewer than 1/beta of all vertices.
+
+    Returns:
+        An array of the distance (in edges) to each vertex id, where
+            unreachable vertices have a distance of -1.
+    """
+    count = graph.size()
+    offsets, targets = graph.offsets, graph.targets
+    reverse = graph.transpose()
+    reverse_offsets, reverse_targets = reverse.offsets, reverse.targets
+    distances = array('l', [-1] * count)
+    distances[source] = 0
+    visited = bytearray(count)
+    visited[source] = 1
+    # Unvisited vertices, only kept while searching bottom-up
+    remaining = None
+    # Edges leaving vertices that have not been visited yet
+    unexplored = len(targets) - (offsets[source + 1] - offsets[source])
+    frontier = [source]
+    level = 0
+    bottom_up = False
+    while frontier:
+        frontier_edges = 0
+        for vertex in frontier:
+            frontier_edges += offsets[vertex + 1] - offsets[vertex]
+        if not bottom_up and frontier_edges * alpha > unexplored:
+            bottom_up = True
+        elif bottom_up and len(frontier) * beta < count:
+            bottom_up = False
+            remaining = None
+        level += 1
+        next_frontier = []
+        if bottom_up:
+            in_frontier = bytearray(count)
+            for vertex in frontier:
+                in_frontier[vertex] = 1
+            if remaining is None:
+                remaining = [v for v in xrange(count) if not visited[v]]
+            still_remaining = []
+            for vertex in remaining:
+                for i in xrange(reverse_offsets[vertex],
+                        reverse_offsets[vertex + 1]):
+                    if in_frontier[reverse_targets[i]]:
+                        visited[vertex] = 1
+                        distances[vertex] = level
+                        next_frontier.append(vertex)
+                        break
+                else:
+                    still_remaining.append(vertex)
+            remaining = still_remaining
+        else:
+            for vertex in frontier:
+                for i in xrange(offsets[vertex], offsets[vertex + 1]):
+                    target = targets[i]
+                    if not visited[target]:
+                        visited[target] = 1
+                        distances[target] = level
+                        next_frontier.append(target)
+        for vertex in next_frontier:
+            unexplored -= offsets[vertex + 1] - offsets[vertex]
+        frontier = next_frontier
+    return distances
@@ -0,0 +1,180 @@
+from array import array
+
+class UnionFind(object):
+    """An array-backed union-find (disjoint set) structure.
+
+    Elements are integer ids from 0 to size() - 1. Uses path compression
+    and union by rank, so any sequence of operations takes nearly linear
+    time, and memory is a few bytes per element.
+    """
+
+    def __init__(self, size=0):
+        """Creates a new UnionFind with size elements, each in its own set."""
+        self.parent = array('l', xrange(size))
+        # Ranks are at most log2(size), so they always fit in a byte
+        self.rank = bytearray(size)
+        self.sizes = array('l', [1] * size)
+        self.count = size
+
+    def size(self):
+        """Returns the number of elements in the UnionFind."""
+        return len(self.parent)
+
+    def add(self):
+        """Adds a new element in its own set and returns its id."""
+        self.parent.append(len(self.parent))
+        self.rank.append(0)
+        self.sizes.append(1)
+        self.count += 1
+        return len(self.parent) - 1
+
+    def find(self, element):
+        """Returns the id of the representative of element's set."""
+        parent = self.parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+        # Point everything on the path directly at the root
+        while parent[element] != root:
+            parent[element], element = root, parent[element]
+        return root
+
+    def union(self, first, second):
+        """Merges the sets containing first and second.
+
+        Returns:
+            True if the sets were merged, or False if first and second
+            were already in the same set.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.rank[first] < self.rank[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.sizes[first] += self.sizes[second]
+        if self.rank[first] == self.rank[second]:
+            self.rank[first] += 1
+        self.count -= 1
+        return True
+
+    def set_size(self, element):
+        """Returns the number of elements in element's set."""
+        return self.sizes[self.find(element)]
+
+def components_from_file(handle):
+    """Finds the connected components of a graph file without building it.
+
+    The file must be in the format read by file_graph.graph_from_file.
+    Edges are treated as undirected, and only the vertex names and one
+    union-find are kept in memory, so files with far more edges than
+    would fit as Edge objects can be processed in one pass.
+
+    Args:
+        handle: The file handle from which to read the graph.
+
+    Returns:
+        A tuple of (labels, sizes), as returned by components_from_edges.
+
+    Raises:
+        ValueError: The file handle was incorrectly formatted.
+    """
+    lines = (line.rstrip("\n") for line in handle)
+    names = _read_vertex_names(lines)
+    return components_from_edges(lines, "|", names, False)
+
+def _read_vertex_names(lines):
+    """Reads the vertex count and vertex names at the start of a graph file.
+
+    The file must be in the format read by file_graph.graph_from_file, and
+    lines is left at the first edge line.
+
+    Args:
+        lines: An iterator over the lines of the file, without newlines.
+
+    Returns:
+        A list of the vertex names, in file order.
+
+    Raises:
+        ValueError: The vertex count or names were incorrectly formatted.
+    """
+    # An empty file has no count line, which is also caught by float()
+    count_line = next(lines, "")
+    # Check vertex count for floats
+    if float(count_line) % 1 != 0.0:
+        raise ValueError("Vertex count must be an integer")
+    vertex_count = int(count_line)
+    if vertex_count < 0:
+        raise ValueError("Vertex count must be a non-negative integer")
+    names = []
+    seen = set()
+    for i in xrange(vertex_count):
+        name = next(lines, None)
+        if name is None:
+            break
+        # Empty string is technically a valid Vertex name, but here an extra
+        # newline will cause parsing problems (was it supposed to be a Vertex
+        # name or just a formatting error?) so we will not allow it.
+        if name == "":
+            raise ValueError("Extra newline found in vertex names")
+        if "|" in name:
+            raise ValueError("Vertex names may not contain pipes")
+        if name in seen:
+            raise ValueError("Name {} already exists".format(name))
+        seen.add(name)
+        names.append(name)
+    return names
+
+def components_from_edges(lines, separator=None, names=None, add_names=True):
+    """Finds the connected components of a stream of edges.
+
+    Edges are treated as undirected and read one at a time, so memory
+    use depends on the number of vertices, not the number of edges.
+
+    Args:
+        lines: An iterable (such as a file handle) of edge lines, each
+            containing at least two vertex names separated by separator.
+            Anything after the second name, such as a weight, is ignored.
+        separator (optional): The string between vertex names. Defaults to
+            any whitespace.
+        names (optional): An iterable of vertex names, including vertices
+            with no edges. Names are labeled in order, followed by new
+            names in the order they appear in lines.
+        add_names (optional): Whether names that appear in lines but not in
+            names are allowed. Defaults to True.
+
+    Returns:
+        A tuple of (labels, sizes), where labels is a dictionary of the
+            format {name: component} and sizes is a list of the number of
+            vertices in each component. Components are numbered from 0 in
+            order of their first vertex.
+
+    Raises:
+        ValueError: A line contains fewer than two names, or names a vertex
+            that is not in names when add_names is False.
+    """
+    ids = {}
+    sets = UnionFind()
+    for name in names or []:
+        if name not in ids:
+            ids[name] = sets.add()
+    for line in lines:
+        line = line.rstrip("\n").split(separator)
+        if len(line) < 2:
+            raise ValueError("Edge lines must contain two vertex names")
+        for name in line[:2]:
+            if name not in ids:
+                if not add_names:
+                    raise ValueError("Edge data does not match Vertex names")
+                ids[name] = sets.add()
+        sets.union(ids[line[0]], ids[line[1]])
+    # Number components by the first id in each, without an extra dict
+    numbers = array('l', [-1] * sets.size())
+    sizes = []
+    for element in xrange(sets.size()):
+        root = sets.find(element)
+        if numbers[root] == -1:
+            numbers[root] = len(sizes)
+            sizes.append(sets.sizes[root])
+    labels = {name:numbers[sets.find(i)] for name, i in ids.iteritems()}
+    return labels, sizes
@@ -1,94 +1,286 @@
-from collections import defaultdict
+from array import array
+from collections import deque
 import math
 
-def max_flow(edges, source, sink):
+# Excess and residual capacity smaller than this fraction of the total
+# capacity are treated as zero, since float rounding can leave tiny
+# amounts that could never be pushed anywhere
+TOLERANCE = 1e-12
+
+def max_flow(edges, source, sink, selection="highest"):
     """Returns the maximum flow that can be routed from source to sink.
 
     Uses the push-relabel algorithm (also known as pre-flow push) to push
         flow to nodes, then divert any excess flow at the nodes to 'downhill'
         (lower labeled) nodes until the flow reaches sink.
-    
+
+    Nodes with excess flow (active nodes) are kept in a queue as they gain
+        excess, instead of being searched for after every step. Two more
+        heuristics keep the labels close to the real distance to sink:
+        global relabeling, which sets every label to the distance to sink
+        (or back to source) with a breadth first search after every V
+        relabels, and the gap heuristic, which lifts every node above an
+        empty label at once, since they can no longer reach sink.
+
     Args:
-        edges: A list of directed edge tuples of the form 
+        edges: A list of directed edge tuples of the form
             (start, end, capacity), where start and end both represent nodes,
             and capacity represents the maximum capacity that can pass through
             this edge at once.
 
             start and end may be strings or numbers, and capacity must be a
-            number.
+            number. Negative capacities are treated as 0.
 
         source, sink: Node names identifying the start (source) and end (sink)
             nodes of the paths. May be numbers or strings.
             If both names are not included in edges, the maximum flow will be 0.
 
+        selection (optional): The order in which to process active nodes;
+            either "highest" for the node with the highest label first, or
+            "fifo" for the order in which they became active. Defaults to
+            "highest".
+
     Returns:
         A floating point number indicating the maximum flow that can be routed
             from source to sink through edges.
+
+    Raises:
+        ValueError: selection is not "highest" or "fifo".
     """
-    flow, labels, outgoing_edges, incoming_edges = _initialize(edges, source)
-    # Start with the nodes that are adjacent to source, since they can get flow
-    excess_nodes = [edge[1] for edge in outgoing_edges[source]]
-    while len(excess_nodes) > 0:
-        current = excess_nodes.pop()
-        pushed = _push(
-                outgoing_edges[current], incoming_edges[current], labels, flow)
-        if not (pushed or _relabel(outgoing_edges[current], labels)):
-            # Try next node if nothing could be pushed or relabeled
-            continue
-        # Only check nodes with outgoing edges
-        excess_nodes = [node for node in outgoing_edges if _excess(
-            flow, outgoing_edges[node], incoming_edges[node]) > 0]
+    if selection not in ("highest", "fifo"):
+        raise ValueError('selection must be "highest" or "fifo"')
+    network = _Network(edges)
+    if (source == sink or source not in network.index or
+            sink not in network.index):
+        return 0.0
+    network.run(network.index[source], network.index[sink], selection)
     # Use fsum for precision in case capacities are floats
-    return math.fsum(flow[x] for x in incoming_edges[sink]) 
-
-def _initialize(edges, source):
-    """Creates data structures of nodes and edges for max_flow."""
-    # Track all outgoing and incoming edges for each node
-    outgoing_edges = defaultdict(list)
-    incoming_edges = defaultdict(list)
-    for edge in edges:
-        start, end, capacity = edge
-        outgoing_edges[start].append(edge)
-        incoming_edges[end].append(edge)
-    all_nodes = outgoing_edges.keys() + incoming_edges.keys()
-    # Labels or heights of nodes; flow can only flow to a smaller labeled node
-    labels = {node:0 for node in all_nodes}
-    # Source can flow to any other node
-    labels[source] = len(all_nodes)
-    # Amount of flow (<= capacity) for each edge
-    flow = {edge:0 for edge in edges}
-    # All edges start with 0 flow, except for edges adjacent to source,
-    # which have maximum flow for their capacity
-    for source_edge in outgoing_edges[source]:
-        flow[source_edge] = source_edge[2]
-    return flow, labels, outgoing_edges, incoming_edges
-
-def _excess(flow, outgoing, incoming):
-    """Returns the amount of excess flow (if any) for a single node."""
-    out_flow = sum(flow[edge] for edge in outgoing)
-    in_flow = sum(flow[edge] for edge in incoming)
-    return in_flow - out_flow
-
-def _relabel(v_edges, labels):
-    """Raises the label of a node such that it can push to more edges."""
-    for edge in v_edges:
-        v, w, capacity = edge
-        if labels[w] >= labels[v]:
-            labels[v] += 1
-            return True
-    # Nothing to relabel
-    return False
-
-def _push(edges_out, edges_in, labels, flow):
-    """Pushes flow from a node to one of its edges."""
-    for edge in edges_out:
-        v, w, capacity = edge
-        if labels[w] < labels[v]:
-            # Node is downhill; try to push flow to edge
-            v_excess = _excess(flow, edges_out, edges_in)
-            push_amount = min(v_excess, capacity - flow[edge])
-            if push_amount > 0:
-                flow[edge] += push_amount
-                return True
-    # Could not push to any edges
-    return False
+    return math.fsum(network.flow(i) for i, edge in enumerate(edges)
+            if edge[1] == sink and edge[0] != sink)
+
+class _Network(object):
+    """Residual capacities of a flow network, stored in arrays.
+
+    Each edge i becomes two arcs: arc 2 * i in the edge's direction, with
+    the edge's capacity, and arc 2 * i + 1 in the opposite direction, with
+    no capacity. Pushing flow along an arc moves residual capacity to its
+    partner, arc ^ 1. The arcs leaving node v are arcs[offsets[v]] to
+    arcs[offsets[v + 1] - 1].
+
+    Amounts up to epsilon are treated as zero, so that rounding errors in
+    float capacities can not keep a node active forever.
+    """
+
+    def __init__(self, edges):
+        self.index = {}
+        heads = array('l', [0] * (2 * len(edges)))
+        tails = array('l', [0] * (2 * len(edges)))
+        self.capacities = array('d', [0.0] * len(edges))
+        for i, (start, end, capacity) in enumerate(edges):
+            for node in (start, end):
+                if node not in self.index:
+                    self.index[node] = len(self.index)
+            heads[2 * i] = tails[2 * i + 1] = self.index[end]
+            tails[2 * i] = heads[2 * i + 1] = self.index[start]
+            self.capacities[i] = max(capacity, 0)
+        self.size = len(self.index)
+        self.heads = heads
+        self.residual = array('d', [0.0] * len(heads))
+        for i, capacity in enumerate(self.capacities):
+            self.residual[2 * i] = capacity
+        self.epsilon = math.fsum(self.capacities) * TOLERANCE
+        counts = [0] * (self.size + 1)
+        for tail in tails:
+            counts[tail + 1] += 1
+        self.offsets = array('l', [0] * (self.size + 1))
+        for node in xrange(self.size):
+            self.offsets[node + 1] = self.offsets[node] + counts[node + 1]
+        self.arcs = array('l', [0] * len(heads))
+        position = self.offsets[:-1]
+        for arc, tail in enumerate(tails):
+            self.arcs[position[tail]] = arc
+            position[tail] += 1
+
+    def flow(self, edge):
+        """Returns the flow along an edge, by its position in edges."""
+        return self.capacities[edge] - self.residual[2 * edge]
+
+    def run(self, source, sink, selection):
+        """Pushes the maximum flow from source to sink."""
+        size = self.size
+        heads, residual, arcs, offsets = (
+                self.heads, self.residual, self.arcs, self.offsets)
+        self.source, self.sink = source, sink
+        self.excess = array('d', [0.0] * size)
+        self.labels = array('l', [0] * size)
+        # Next arc to try for each node; earlier arcs are not admissible
+        self.current = array('l', offsets[:-1])
+        # Number of nodes with each label, for the gap heuristic
+        self.label_counts = array('l', [0] * (2 * size + 1))
+        # Saturate every arc out of source
+        for i in xrange(offsets[source], offsets[source + 1]):
+            arc = arcs[i]
+            amount = residual[arc]
+            if amount > 0:
+                residual[arc] = 0
+                residual[arc ^ 1] += amount
+                self.excess[heads[arc]] += amount
+        self._global_relabel()
+        active = _ActiveNodes(self, selection)
+        while active:
+            self._discharge(active.pop(), active)
+            if self.relabels >= size:
+                # Any node left with excess is found again by reset
+                self._global_relabel()
+                active.reset()
+
+    def _discharge(self, node, active):
+        """Pushes all of node's excess, relabeling it as needed.
+
+        Stops early if a relabel makes a global relabel due, or if node can
+        no longer reach sink or source, which only rounding error can cause.
+        """
+        heads, residual, arcs = self.heads, self.residual, self.arcs
+        excess, labels, current = self.excess, self.labels, self.current
+        epsilon = self.epsilon
+        end = self.offsets[node + 1]
+        while excess[node] > epsilon:
+            if current[node] == end:
+                self._relabel(node)
+                if (self.relabels >= self.size or
+                        labels[node] >= 2 * self.size):
+                    return
+                continue
+            arc = arcs[current[node]]
+            head = heads[arc]
+            if residual[arc] > epsilon and labels[node] == labels[head] + 1:
+                amount = min(excess[node], residual[arc])
+                residual[arc] -= amount
+                residual[arc ^ 1] += amount
+                excess[node] -= amount
+                if excess[head] <= epsilon and head != self.sink and (
+                        head != self.source):
+                    active.add(head)
+                excess[head] += amount
+            else:
+                current[node] += 1
+
+    def _relabel(self, node):
+        """Raises node's label to one above its lowest residual neighbor."""
+        heads, residual, arcs, labels = (
+                self.heads, self.residual, self.arcs, self.labels)
+        start, end = self.offsets[node], self.offsets[node + 1]
+        lowest = 2 * self.size - 1
+        for i in xrange(start, end):
+            arc = arcs[i]
+            if residual[arc] > self.epsilon and labels[heads[arc]] < lowest:
+                lowest = labels[heads[arc]]
+        old = labels[node]
+        self._set_label(node, min(lowest + 1, 2 * self.size))
+        self.relabels += 1
+        self.current[node] = start
+        if old < self.size and self.label_counts[old] == 0:
+            self._gap(old)
+
+    def _gap(self, empty):
+        """Lifts every node above an empty label, which can not reach sink."""
+        size = self.size
+        for node in xrange(size):
+            if empty < self.labels[node] < size:
+                self._set_label(node, size + 1)
+                self.current[node] = self.offsets[node]
+
+    def _set_label(self, node, label):
+        """Changes node's label, keeping label_counts up to date."""
+        self.label_counts[self.labels[node]] -= 1
+        self.labels[node] = label
+        self.label_counts[label] += 1
+
+    def _global_relabel(self):
+        """Sets each label to the exact residual distance to sink.
+
+        Nodes that can not reach sink are labeled by their distance back to
+        source, plus the number of nodes, and the rest are labeled twice the
+        number of nodes, where they are never active.
+        """
+        size = self.size
+        heads, residual, arcs, offsets = (
+                self.heads, self.residual, self.arcs, self.offsets)
+        labels = self.labels
+        unreached = 2 * size
+        for node in xrange(size):
+            labels[node] = unreached
+        for root, base in ((self.sink, 0), (self.source, size)):
+            labels[root] = base
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                for i in xrange(offsets[node], offsets[node + 1]):
+                    # Search the reverse of each arc into node
+                    arc = arcs[i]
+                    neighbor = heads[arc]
+                    if residual[arc ^ 1] > self.epsilon and (
+                            labels[neighbor] == unreached):
+                        labels[neighbor] = labels[node] + 1
+                        queue.append(neighbor)
+        self.relabels = 0
+        counts = self.label_counts
+        for label in xrange(len(counts)):
+            counts[label] = 0
+        for node in xrange(size):
+            counts[labels[node]] += 1
+            self.current[node] = offsets[node]
+
+class _ActiveNodes(object):
+    """The nodes with excess flow, in the order they should be discharged.
+
+    For "fifo", a queue in the order nodes became active. For "highest",
+    one bucket of nodes per label, with the highest non-empty label tracked
+    lazily; a node whose label changed while it was waiting is moved to its
+    new bucket when found.
+    """
+
+    def __init__(self, network, selection):
+        self.network = network
+        self.fifo = selection == "fifo"
+        self.reset()
+
+    def reset(self):
+        """Rebuilds the structure, after the labels have changed."""
+        network = self.network
+        self.queue = deque()
+        self.buckets = [[] for i in xrange(2 * network.size + 1)]
+        self.highest = 0
+        self.count = 0
+        for node in xrange(network.size):
+            if (network.excess[node] > network.epsilon and
+                    network.labels[node] < 2 * network.size and
+                    node != network.sink and node != network.source):
+                self.add(node)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, node):
+        self.count += 1
+        if self.fifo:
+            self.queue.append(node)
+        else:
+            label = self.network.labels[node]
+            self.buckets[label].append(node)
+            self.highest = max(self.highest, label)
+
+    def pop(self):
+        self.count -= 1
+        if self.fifo:
+            return self.queue.popleft()
+        labels = self.network.labels
+        while True:
+            while not self.buckets[self.highest]:
+                self.highest -= 1
+            node = self.buckets[self.highest].pop()
+            if labels[node] == self.highest:
+                return node
+            # Labels only rise between resets
+            self.buckets[labels[node]].append(node)
+            self.highest = labels[node]
@@ -1,5 +1,12 @@
+from collections import defaultdict
+from collections import deque
+from random import randint
+from random import seed
+from random import uniform
 from maxflow import max_flow
 from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_almost_equals
 
 def test_no_edges():
     assert_equals(max_flow([], 1, 2), 0.0)
@@ -44,3 +51,101 @@ def test_large():
                 ("a", "c", 10), ("c", "a", 4), ("b", "c", 9), ("c", "d", 14),
                 ("d", "b", 7), ("d", "t", 4)]
     assert_equals(max_flow(edges, "s", "t"), 23.0)
+
+def _augmenting_paths_flow(edges, source, sink):
+    """Returns the maximum flow using shortest augmenting paths."""
+    residual = defaultdict(lambda: defaultdict(int))
+    for start, end, capacity in edges:
+        residual[start][end] += max(capacity, 0)
+        residual[end][start] += 0
+    total = 0
+    while True:
+        previous = {source:None}
+        queue = deque([source])
+        while queue and sink not in previous:
+            node = queue.popleft()
+            for neighbor, capacity in residual[node].iteritems():
+                if capacity > 0 and neighbor not in previous:
+                    previous[neighbor] = node
+                    queue.append(neighbor)
+        if sink not in previous or source == sink:
+            return total
+        path = []
+        node = sink
+        while previous[node] is not None:
+            path.append((previous[node], node))
+            node = previous[node]
+        amount = min(residual[u][v] for u, v in path)
+        for u, v in path:
+            residual[u][v] -= amount
+            residual[v][u] += amount
+        total += amount
+
+def test_invalid_selection():
+    assert_raises(ValueError, max_flow, [(0, 1, 5)], 0, 1, "lowest")
+
+def test_source_is_sink():
+    assert_equals(max_flow([(0, 1, 5), (1, 0, 5)], 0, 0), 0.0)
+
+def test_flow_must_be_rerouted():
+    # Pushing along s-a-b-t first blocks both other paths without the
+    # reverse (residual) edges
+    edges = [("s", "a", 1), ("s", "b", 1), ("a", "b", 1), ("a", "t", 1),
+            ("b", "t", 1)]
+    for selection in ("highest", "fifo"):
+        assert_equals(max_flow(edges, "s", "t", selection), 2.0)
+
+def test_fifo_large():
+    edges = [("s", "a", 16), ("a", "b", 12), ("b", "t", 20), ("s", "c", 13),
+                ("a", "c", 10), ("c", "a", 4), ("b", "c", 9), ("c", "d", 14),
+                ("d", "b", 7), ("d", "t", 4)]
+    assert_equals(max_flow(edges, "s", "t", "fifo"), 23.0)
+
+def test_random_networks():
+    seed(25)
+    for trial in xrange(40):
+        size = randint(2, 25)
+        edges = [(randint(0, size - 1), randint(0, size - 1), randint(-2, 20))
+                for i in xrange(randint(0, 80))]
+        expected = _augmenting_paths_flow(edges, 0, size - 1)
+        for selection in ("highest", "fifo"):
+            assert_equals(max_flow(edges, 0, size - 1, selection), expected)
+
+def test_random_float_networks():
+    seed(27)
+    for trial in xrange(200):
+        size = randint(2, 12)
+        edges = [(randint(0, size - 1), randint(0, size - 1),
+                round(uniform(0, 10), 3)) for i in xrange(randint(0, 40))]
+        expected = _augmenting_paths_flow(edges, 0, size - 1)
+        for selection in ("highest", "fifo"):
+            assert_almost_equals(
+                    max_flow(edges, 0, size - 1, selection), expected)
+
+def test_float_rounding_terminates():
+    edges = [(2, 0, 7.739), (1, 5, 9.789), (0, 5, 0.376), (3, 3, 7.877),
+            (2, 5, 8.231), (6, 5, 5.203), (4, 2, 1.893), (5, 4, 1.264),
+            (0, 6, 6.316), (2, 5, 6.892), (2, 4, 6.074), (0, 1, 8.053),
+            (1, 3, 8.767), (0, 3, 8.581), (5, 0, 1.599), (2, 0, 0.109),
+            (2, 1, 1.264), (4, 1, 9.819), (2, 0, 9.664), (4, 1, 7.785),
+            (5, 5, 6.963), (0, 6, 5.543), (1, 0, 8.645), (4, 2, 5.982),
+            (0, 3, 2.402), (4, 6, 4.512), (0, 1, 9.437), (0, 4, 9.081),
+            (2, 6, 1.072), (0, 2, 8.493), (6, 2, 8.613), (2, 0, 0.118),
+            (6, 2, 0.187)]
+    expected = _augmenting_paths_flow(edges, 0, 6)
+    for selection in ("highest", "fifo"):
+        assert_almost_equals(max_flow(edges, 0, 6, selection), expected)
+
+def test_layered_network():
+    # Many relabels, so global relabeling and gaps are both used
+    layers, width = 30, 20
+    seed(26)
+    edges = [("s", (0, i), 10) for i in xrange(width)]
+    edges.extend(((layers - 1, i), "t", 10) for i in xrange(width))
+    for layer in xrange(layers - 1):
+        for i in xrange(width):
+            for j in (randint(0, width - 1), randint(0, width - 1)):
+                edges.append(((layer, i), (layer + 1, j), randint(1, 10)))
+    expected = _augmenting_paths_flow(edges, "s", "t")
+    for selection in ("highest", "fifo"):
+        assert_equals(max_flow(edges, "s", "t", selection), expected)
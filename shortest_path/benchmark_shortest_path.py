@@ -0,0 +1,79 @@
+"""Compares shortest_path with the implementation it replaced.
+
+The original shortest_path scanned every vertex to find the next closest
+one, taking O(V^2) time, so it is kept here as original_shortest_path.
+The binary heap fallback is timed as well, to separate the gain from the
+heap from the gain from the integer weight bucket queues.
+
+Run with: python benchmark_shortest_path.py [vertices] [edges per vertex]
+"""
+from collections import defaultdict
+from random import randint
+from random import seed
+import sys
+import timeit
+import shortest_path
+from shortest_path import _heap_dijkstra
+
+def original_shortest_path(edges, start):
+    """The shortest_path implementation before the bucket queues."""
+    vertex_edges = defaultdict(list)
+    all_vertices = set()
+    for edge in edges:
+        vertex_edges[edge[0]].append(edge)
+        all_vertices.update((edge[0], edge[1]))
+    distances = {vertex:float("inf") for vertex in all_vertices}
+    distances[start] = 0
+    visited = set()
+    visited.add(start)
+    for edge in vertex_edges[start]:
+        v1, v2, weight = edge
+        distances[v2] = weight if v2 != start else 0
+    while len(visited) < len(vertex_edges):
+        current = None
+        closest_distance = float("inf")
+        for v in distances:
+            if v not in visited and distances[v] < closest_distance:
+                closest_distance = distances[v]
+                current = v
+        if current is None:
+            break
+        for edge in vertex_edges[current]:
+            v1, v2, weight = edge
+            distances[v2] = min(distances[v2], distances[v1] + weight)
+        visited.add(current)
+    return distances
+
+def random_edges(vertices, degree, max_weight):
+    """Returns a random graph with integer weights up to max_weight."""
+    return [(v, randint(0, vertices - 1), randint(1, max_weight))
+            for v in xrange(vertices) for i in xrange(degree)]
+
+def best_time(function, repeat=3):
+    """Returns the fastest of repeat runs of function, in seconds."""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def main():
+    vertices = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    seed(0)
+    print "%d vertices, %d edges" % (vertices, vertices * degree)
+    print "%12s %10s %10s %10s %10s" % (
+            "max weight", "queue", "original", "heap", "new")
+    for max_weight in (1, 10, shortest_path.DIAL_MAX_WEIGHT, 1000, 10 ** 6):
+        edges = random_edges(vertices, degree, max_weight)
+        if max_weight <= shortest_path.DIAL_MAX_WEIGHT:
+            queue = "dial"
+        else:
+            queue = "radix"
+        expected = original_shortest_path(edges, 0)
+        if shortest_path.shortest_path(edges, 0) != expected:
+            raise AssertionError("Distances differ from the original")
+        original = best_time(lambda: original_shortest_path(edges, 0), 1)
+        heap = best_time(lambda: _heap_dijkstra(edges, 0))
+        new = best_time(lambda: shortest_path.shortest_path(edges, 0))
+        print "%12d %10s %9.3fs %9.3fs %9.3fs" % (
+                max_weight, queue, original, heap, new)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from array import array
+import heapq
+from shortest_path import _weighted_edges
+
+class ContractionHierarchy(object):
+    """A contraction hierarchy for fast point-to-point distance queries.
+
+    Building the hierarchy contracts the vertices one at a time, from least
+    to most important. Contracting a vertex removes it from the remaining
+    graph, and adds a shortcut edge u -> w for each path u -> v -> w that
+    was the only shortest path between its neighbors u and w.
+
+    A query then only needs to search upward (toward more important
+    vertices) from both the start and the goal, which settles a small
+    number of vertices on road-like networks, regardless of their size.
+    """
+
+    def __init__(self, vertices, edges, witness_limit=50):
+        """Builds a contraction hierarchy.
+
+        Args:
+            vertices: A list of vertex tuples in the form (name, x, y), as
+                for a_star.
+
+            edges: A list of directed edge tuples in the form (v1, v2), as for
+                a_star, whose weight is the straight line distance between
+                v1 and v2. Tuples of the form (v1, v2, weight) may also be
+                used to give an edge a different non-negative weight.
+
+            witness_limit (optional): The maximum number of vertices to
+                settle when looking for a path that makes a shortcut
+                unnecessary. Higher limits add fewer shortcuts but take
+                longer to build. Defaults to 50.
+
+        Raises:
+            ValueError: An edge uses a vertex that is not in vertices.
+        """
+        coords = {name:(x, y) for name, x, y in vertices}
+        self.names = list(coords)
+        self.index = {name:i for i, name in enumerate(self.names)}
+        count = len(self.names)
+        # Remaining graph, as {neighbor: weight} for each vertex
+        outgoing = [{} for i in xrange(count)]
+        incoming = [{} for i in xrange(count)]
+        for v1, v2, weight in _weighted_edges(edges, coords):
+            if v1 not in self.index or v2 not in self.index:
+                raise ValueError("Edge vertices must be in vertex list")
+            start, end = self.index[v1], self.index[v2]
+            # Self loops never shorten a path, and only the lightest of
+            # several parallel edges matters
+            if start != end and (
+                    weight < outgoing[start].get(end, float("inf"))):
+                outgoing[start][end] = weight
+                incoming[end][start] = weight
+        self.witness_limit = witness_limit
+        self.shortcuts = 0
+        self.rank = array('l', [-1] * count)
+        # Upward edges for the forward and backward searches
+        up = [None] * count
+        down = [None] * count
+        # Number of contracted neighbors; spreads contraction evenly
+        contracted_neighbors = array('l', [0] * count)
+        queue = [(self._priority(
+                v, outgoing, incoming, contracted_neighbors), v)
+                for v in xrange(count)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            priority, vertex = heapq.heappop(queue)
+            # Priorities change as neighbors are contracted, so recheck
+            # lazily and put the vertex back if it is no longer the best
+            priority = self._priority(
+                    vertex, outgoing, incoming, contracted_neighbors)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, vertex))
+                continue
+            for start, end, weight in self._shortcuts(
+                    vertex, outgoing, incoming):
+                if weight < outgoing[start].get(end, float("inf")):
+                    outgoing[start][end] = weight
+                    incoming[end][start] = weight
+                    self.shortcuts += 1
+            # Every remaining neighbor will be ranked higher than vertex
+            up[vertex] = outgoing[vertex]
+            down[vertex] = incoming[vertex]
+            for neighbor in outgoing[vertex]:
+                del incoming[neighbor][vertex]
+                contracted_neighbors[neighbor] += 1
+            for neighbor in incoming[vertex]:
+                del outgoing[neighbor][vertex]
+                contracted_neighbors[neighbor] += 1
+            outgoing[vertex] = incoming[vertex] = None
+            self.rank[vertex] = order
+            order += 1
+        self._up = _to_arrays(up)
+        self._down = _to_arrays(down)
+
+    def _shortcuts(self, vertex, outgoing, incoming):
+        """Returns the shortcuts needed to contract vertex.
+
+        Returns:
+            A list of (start, end, weight) tuples of vertex ids.
+        """
+        shortcuts = []
+        if not outgoing[vertex]:
+            return shortcuts
+        longest_out = max(outgoing[vertex].itervalues())
+        for start, in_weight in incoming[vertex].iteritems():
+            # Distances from start that avoid vertex
+            witness = self._witness_search(start, vertex, outgoing[vertex],
+                    in_weight + longest_out, outgoing)
+            for end, out_weight in outgoing[vertex].iteritems():
+                if end == start:
+                    continue
+                through = in_weight + out_weight
+                if witness.get(end, float("inf")) > through:
+                    shortcuts.append((start, end, through))
+        return shortcuts
+
+    def _witness_search(self, start, avoid, ends, limit, outgoing):
+        """Limited Dijkstra search in the remaining graph, avoiding a vertex.
+
+        Stops once every vertex in ends is settled, no vertex closer than
+        limit is left, or witness_limit vertices are settled.
+
+        Returns:
+            A dictionary of {vertex: distance} of the vertices reached,
+                whose distances are upper bounds of the true distances.
+        """
+        distances = {start:0.0}
+        queue = [(0.0, start)]
+        remaining = set(ends)
+        remaining.discard(start)
+        settled = 0
+        while queue and remaining and settled < self.witness_limit:
+            distance, current = heapq.heappop(queue)
+            if distance > distances[current]:
+                continue
+            if distance > limit:
+                break
+            settled += 1
+            remaining.discard(current)
+            for neighbor, weight in outgoing[current].iteritems():
+                if neighbor == avoid:
+                    continue
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = new_distance
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return distances
+
+    def _priority(self, vertex, outgoing, incoming, contracted_neighbors):
+        """Returns the contraction priority of vertex; lower goes first.
+
+        Uses the edge difference (shortcuts added minus edges removed) plus
+        the number of neighbors already contracted.
+        """
+        added = len(self._shortcuts(vertex, outgoing, incoming))
+        removed = len(outgoing[vertex]) + len(incoming[vertex])
+        return added - removed + contracted_neighbors[vertex]
+
+    def distance(self, start, goal):
+        """Returns the shortest path distance from start to goal.
+
+        Args:
+            start, goal: The names of the vertices between which to find the
+                distance.
+
+        Returns:
+            A floating point number with the same value a_star returns, or
+                the float value for infinity if there is no path.
+
+        Raises:
+            ValueError: start or goal is not in the vertex list.
+        """
+        if start not in self.index or goal not in self.index:
+            raise ValueError("Start and goal vertices must be in vertex list")
+        source, target = self.index[start], self.index[goal]
+        if source == target:
+            return 0.0
+        # Index 0 searches up from start, and index 1 up (backward) from goal
+        graphs = (self._up, self._down)
+        distances = ({source:0.0}, {target:0.0})
+        queues = ([(0.0, source)], [(0.0, target)])
+        best = float("inf")
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                # A direction is done once it can not improve on best
+                if not queue or queue[0][0] >= best:
+                    del queue[:]
+                    continue
+                distance, current = heapq.heappop(queue)
+                if distance > distances[side][current]:
+                    continue
+                other = distances[1 - side].get(current)
+                if other is not None and distance + other < best:
+                    best = distance + other
+                if self._stalled(current, distance, distances[side],
+                        graphs[1 - side]):
+                    continue
+                offsets, targets, weights = graphs[side]
+                for i in xrange(offsets[current], offsets[current + 1]):
+                    neighbor = targets[i]
+                    new_distance = distance + weights[i]
+                    if new_distance < distances[side].get(
+                            neighbor, float("inf")):
+                        distances[side][neighbor] = new_distance
+                        heapq.heappush(queue, (new_distance, neighbor))
+        return best
+
+    @staticmethod
+    def _stalled(vertex, distance, distances, other_graph):
+        """Determines whether a search can skip expanding vertex.
+
+        If a higher ranked vertex that the search has reached offers a
+        shorter path to vertex than the one found going upward, vertex is
+        not on any shortest path found by this search (stall-on-demand).
+        """
+        offsets, targets, weights = other_graph
+        for i in xrange(offsets[vertex], offsets[vertex + 1]):
+            higher = distances.get(targets[i])
+            if higher is not None and higher + weights[i] < distance:
+                return True
+        return False
+
+def _to_arrays(adjacency):
+    """Converts a list of {neighbor: weight} dictionaries to CSR arrays."""
+    offsets = array('l', [0])
+    targets = array('l')
+    weights = array('d')
+    for neighbors in adjacency:
+        for neighbor, weight in neighbors.iteritems():
+            targets.append(neighbor)
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
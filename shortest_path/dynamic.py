@@ -0,0 +1,172 @@
+from collections import defaultdict
+import heapq
+from shortest_path import dijkstra
+
+class DynamicShortestPathTree(object):
+    """A shortest path tree from one source that is repaired after updates.
+
+    Changing the weight of an edge only revisits the vertices whose
+    shortest paths can change, as in the algorithm of Ramalingam and Reps:
+
+    A decrease can only shorten paths that use the changed edge, so a
+    Dijkstra search is started from its end, and stops wherever it fails to
+    improve on a known distance.
+
+    An increase of an edge that is not in the tree changes nothing. For an
+    edge that is in the tree, only the vertices in the subtree below it can
+    become further away. Each of them is given the best distance that
+    avoids the subtree, and a Dijkstra search within the subtree finishes
+    the repair.
+
+    Parallel edges are collapsed into the lightest one, so that each pair
+    of vertices has at most one edge, whose weight update sets.
+
+    Attributes:
+        distances: A dictionary of {v: length}, in the format shortest_path
+            returns.
+        predecessors: A dictionary of {v: previous}, in the format dijkstra
+            returns, which may be passed to build_path.
+    """
+
+    def __init__(self, edges, source):
+        """Builds the shortest path tree.
+
+        Args:
+            edges: A list of edge tuples in the form (v1, v2, weight), as for
+                shortest_path.
+
+            source: The name of the vertex from which to find paths.
+
+        Raises:
+            ValueError: An edge has a negative weight.
+        """
+        self.source = source
+        # Edges as {v1: {v2: weight}} and {v2: {v1: weight}}
+        self._outgoing = defaultdict(dict)
+        self._incoming = defaultdict(dict)
+        for v1, v2, weight in edges:
+            if weight < 0:
+                raise ValueError("Edge weights must be non-negative")
+            if weight < self._outgoing[v1].get(v2, float("inf")):
+                self._outgoing[v1][v2] = weight
+                self._incoming[v2][v1] = weight
+        self.distances, self.predecessors = dijkstra(
+                [(v1, v2, weight) for v1 in self._outgoing
+                    for v2, weight in self._outgoing[v1].iteritems()],
+                source)
+        self._children = defaultdict(set)
+        for vertex, parent in self.predecessors.iteritems():
+            if parent is not None:
+                self._children[parent].add(vertex)
+
+    def update(self, v1, v2, weight):
+        """Sets the weight of the edge from v1 to v2, and repairs the tree.
+
+        Args:
+            v1, v2: The names of the vertices at the start and end of the
+                edge. The edge, and either vertex, are added if they are
+                not already in the graph.
+
+            weight: The new non-negative weight of the edge. The float value
+                for infinity removes the edge.
+
+        Returns:
+            A dictionary of {v: length} of the vertices whose shortest path
+                length from the source changed, with their new lengths.
+
+        Raises:
+            ValueError: weight is negative.
+        """
+        if weight < 0:
+            raise ValueError("Edge weights must be non-negative")
+        for vertex in (v1, v2):
+            self.distances.setdefault(vertex, float("inf"))
+        old_weight = self._outgoing[v1].get(v2, float("inf"))
+        if weight == float("inf"):
+            self._outgoing[v1].pop(v2, None)
+            self._incoming[v2].pop(v1, None)
+        else:
+            self._outgoing[v1][v2] = weight
+            self._incoming[v2][v1] = weight
+        if weight < old_weight:
+            return self._decrease(v1, v2, weight)
+        if weight > old_weight and self.predecessors.get(v2) == v1:
+            return self._increase(v2)
+        return {}
+
+    def remove_edge(self, v1, v2):
+        """Removes the edge from v1 to v2, and repairs the tree.
+
+        Returns:
+            A dictionary of changed lengths, as returned by update.
+        """
+        return self.update(v1, v2, float("inf"))
+
+    def _set_parent(self, vertex, parent):
+        """Moves vertex below parent in the tree, or out of it if None."""
+        old_parent = self.predecessors.pop(vertex, None)
+        if old_parent is not None:
+            self._children[old_parent].discard(vertex)
+        if parent is not None:
+            self.predecessors[vertex] = parent
+            self._children[parent].add(vertex)
+
+    def _decrease(self, v1, v2, weight):
+        """Repairs the tree after the edge from v1 to v2 became lighter."""
+        new_distance = self.distances[v1] + weight
+        if new_distance >= self.distances[v2]:
+            return {}
+        self.distances[v2] = new_distance
+        self._set_parent(v2, v1)
+        changed = {}
+        queue = [(new_distance, v2)]
+        while queue:
+            distance, current = heapq.heappop(queue)
+            if distance > self.distances[current]:
+                continue
+            changed[current] = distance
+            for neighbor, weight in self._outgoing[current].iteritems():
+                new_distance = distance + weight
+                if new_distance < self.distances[neighbor]:
+                    self.distances[neighbor] = new_distance
+                    self._set_parent(neighbor, current)
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return changed
+
+    def _increase(self, root):
+        """Repairs the subtree below root after its tree edge got heavier."""
+        # Every vertex whose tree path uses the changed edge
+        affected = set([root])
+        stack = [root]
+        while stack:
+            for child in self._children[stack.pop()]:
+                affected.add(child)
+                stack.append(child)
+        old_distances = {}
+        queue = []
+        for vertex in affected:
+            old_distances[vertex] = self.distances[vertex]
+            # The best path that enters the subtree last at vertex
+            best, parent = float("inf"), None
+            for neighbor, weight in self._incoming[vertex].iteritems():
+                if neighbor not in affected and (
+                        self.distances[neighbor] + weight < best):
+                    best, parent = self.distances[neighbor] + weight, neighbor
+            self.distances[vertex] = best
+            self._set_parent(vertex, parent)
+            if parent is not None:
+                queue.append((best, vertex))
+        heapq.heapify(queue)
+        while queue:
+            distance, current = heapq.heappop(queue)
+            if distance > self.distances[current]:
+                continue
+            for neighbor, weight in self._outgoing[current].iteritems():
+                new_distance = distance + weight
+                if neighbor in affected and (
+                        new_distance < self.distances[neighbor]):
+                    self.distances[neighbor] = new_distance
+                    self._set_parent(neighbor, current)
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return {vertex:self.distances[vertex] for vertex in affected
+                if self.distances[vertex] != old_distances[vertex]}
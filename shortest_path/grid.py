@@ -0,0 +1,149 @@
+import heapq
+from math import sqrt
+
+SQRT2 = sqrt(2)
+
+def jump_point_search(grid, width, start, goal):
+    """Returns the distance of the shortest path between two grid cells.
+
+    Uses A* with jump point search on an 8-connected grid in which every
+        step costs its straight-line length: 1 for a horizontal or vertical
+        step, and sqrt(2) for a diagonal one. A diagonal step is only
+        allowed if both of the cells it passes between are open, so paths
+        never cut the corner of an obstacle.
+
+    Instead of adding every neighbor of a cell to the open list, the search
+        jumps in a straight line until it reaches a cell where a path could
+        turn (a jump point), and only adds that. Paths that only differ in
+        the order of their steps are not searched more than once, and no
+        edges are ever built.
+
+    Args:
+        grid: A bytearray of the cells of the map, row by row, where cell
+            (x, y) is at grid[y * width + x]. A cell is open if its value
+            is 0, and blocked otherwise.
+
+        width: The number of cells in each row of grid.
+
+        start, goal: The cells as (x, y) tuples between which to find the
+            distance.
+
+    Returns:
+        A floating point number with the same value a_star returns for the
+            grid's cells and moves given as vertices and edges, or the float
+            value for infinity if there is no path. A blocked start or
+            goal has no path, unless they are the same cell.
+
+    Raises:
+        ValueError: width does not evenly divide the size of grid, or start
+            or goal is not in the grid.
+    """
+    if width < 1 or len(grid) % width:
+        raise ValueError("Grid size must be a multiple of width")
+    height = len(grid) // width
+    for x, y in (start, goal):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError("Start and goal must be in the grid")
+
+    def is_open(x, y):
+        return 0 <= x < width and 0 <= y < height and not grid[y * width + x]
+
+    def jump_straight(x, y, dx, dy):
+        """Returns the first jump point from (x, y) in a straight line."""
+        while True:
+            x += dx
+            y += dy
+            if not is_open(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            # A cell next to the line is only reached best from here if the
+            # cell behind it is blocked (a forced neighbor)
+            if dx:
+                if ((is_open(x, y - 1) and not is_open(x - dx, y - 1)) or
+                        (is_open(x, y + 1) and not is_open(x - dx, y + 1))):
+                    return x, y
+            elif ((is_open(x - 1, y) and not is_open(x - 1, y - dy)) or
+                    (is_open(x + 1, y) and not is_open(x + 1, y - dy))):
+                return x, y
+
+    def jump(x, y, dx, dy):
+        """Returns the first jump point after stepping from (x, y)."""
+        if not (dx and dy):
+            return jump_straight(x, y, dx, dy)
+        while True:
+            x += dx
+            y += dy
+            if not is_open(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            # A diagonal line stops where either of its straight lines
+            # reaches a jump point
+            if (jump_straight(x, y, dx, 0) is not None or
+                    jump_straight(x, y, 0, dy) is not None):
+                return x, y
+            if not (is_open(x + dx, y) and is_open(x, y + dy)):
+                return None
+
+    def directions(x, y, parent):
+        """Returns the directions that a path through (x, y) may continue."""
+        if parent is None:
+            moves = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    if dx or dy]
+            return [(dx, dy) for dx, dy in moves if is_open(x + dx, y + dy)
+                    and is_open(x + dx, y) and is_open(x, y + dy)]
+        dx = cmp(x, parent[0])
+        dy = cmp(y, parent[1])
+        moves = []
+        if dx and dy:
+            if is_open(x, y + dy):
+                moves.append((0, dy))
+            if is_open(x + dx, y):
+                moves.append((dx, 0))
+            if is_open(x, y + dy) and is_open(x + dx, y):
+                moves.append((dx, dy))
+        else:
+            # The two directions perpendicular to the line
+            sides = [(dy, dx), (-dy, -dx)]
+            if is_open(x + dx, y + dy):
+                moves.append((dx, dy))
+                moves.extend((dx + sx, dy + sy) for sx, sy in sides
+                        if is_open(x + sx, y + sy))
+            moves.extend(side for side in sides
+                    if is_open(x + side[0], y + side[1]))
+        return moves
+
+    def octile(start, end):
+        """Returns the length of the shortest path on an open grid."""
+        dx = abs(start[0] - end[0])
+        dy = abs(start[1] - end[1])
+        return abs(dx - dy) + min(dx, dy) * SQRT2
+
+    if start == goal:
+        return 0.0
+    if not is_open(*start) or not is_open(*goal):
+        return float("inf")
+    distances = {start:0.0}
+    parents = {start:None}
+    closed = set()
+    queue = [(octile(start, goal), 0.0, start)]
+    while queue:
+        estimate, distance, current = heapq.heappop(queue)
+        if current == goal:
+            return distance
+        if current in closed:
+            continue
+        closed.add(current)
+        x, y = current
+        for dx, dy in directions(x, y, parents[current]):
+            point = jump(x, y, dx, dy)
+            if point is None or point in closed:
+                continue
+            new_distance = distance + octile(current, point)
+            if new_distance < distances.get(point, float("inf")):
+                distances[point] = new_distance
+                parents[point] = current
+                heapq.heappush(queue, (new_distance + octile(point, goal),
+                        new_distance, point))
+    return float("inf")
@@ -0,0 +1,124 @@
+from array import array
+from shortest_path import _compact_adjacency
+from shortest_path import _dijkstra_arrays
+from shortest_path import _weighted_edges
+
+class LandmarkHeuristic(object):
+    """A landmark (ALT) lower bound on distances, as an a_star heuristic.
+
+    Distances to and from a few landmark vertices are computed once with
+    Dijkstra's algorithm. By the triangle inequality, for any landmark L,
+
+    d(v, goal) >= d(L, goal) - d(L, v)
+    d(v, goal) >= d(v, L) - d(goal, L)
+
+    and the largest of these bounds is used as the estimate. Unlike the
+    straight-line distance, this works for any non-negative edge weights,
+    and is usually much tighter on road-like networks.
+    """
+
+    def __init__(self, vertices, edges, count=4, landmarks=None):
+        """Chooses landmarks and precomputes their distances.
+
+        Args:
+            vertices: A list of (name, x, y) vertex tuples, as for a_star.
+
+            edges: A list of (v1, v2) or (v1, v2, weight) edge tuples, as for
+                a_star.
+
+            count (optional): The number of landmarks to choose. Each one
+                takes two Dijkstra searches to prepare and two array
+                lookups per estimate. Defaults to 4.
+
+            landmarks (optional): A list of vertex names to use as landmarks
+                instead of choosing them. If given, count is ignored.
+
+        Raises:
+            ValueError: A landmark or edge vertex is not in vertices.
+        """
+        coords = {name:(x, y) for name, x, y in vertices}
+        weighted = _weighted_edges(edges, coords)
+        names, self.index, offsets, targets, weights = _compact_adjacency(
+                weighted, list(coords))
+        if len(names) != len(coords):
+            raise ValueError("Edge vertices must be in vertex list")
+        reverse = _compact_adjacency(
+                [(v2, v1, weight) for v1, v2, weight in weighted], names)
+        forward = (offsets, targets, weights)
+        backward = reverse[2:]
+        if landmarks is None:
+            landmarks = self._choose(names, forward, backward, count)
+        for name in landmarks:
+            if name not in self.index:
+                raise ValueError("Landmarks must be in vertex list")
+        self.landmarks = list(landmarks)
+        # Distances from each landmark, and to each landmark, by vertex id
+        self.from_landmark = []
+        self.to_landmark = []
+        for name in self.landmarks:
+            source = self.index[name]
+            self.from_landmark.append(
+                    _dijkstra_arrays(*forward + (source,))[0])
+            self.to_landmark.append(
+                    _dijkstra_arrays(*backward + (source,))[0])
+
+    def _choose(self, names, forward, backward, count):
+        """Chooses landmarks that are far apart (farthest selection).
+
+        Starting from the vertex farthest from an arbitrary vertex, each new
+        landmark is the vertex farthest from its nearest chosen landmark.
+        """
+        if not names:
+            return []
+        # Distance from each vertex to its nearest landmark so far
+        nearest = array('d', [float("inf")] * len(names))
+        _update_nearest(nearest, forward, backward, 0)
+        current = _farthest(nearest, set())
+        nearest = array('d', [float("inf")] * len(names))
+        chosen = []
+        for i in xrange(min(count, len(names))):
+            chosen.append(current)
+            _update_nearest(nearest, forward, backward, current)
+            current = _farthest(nearest, set(chosen))
+        return [names[v] for v in chosen]
+
+    def estimate(self, vertex, goal):
+        """Returns a lower bound on the distance from vertex to goal."""
+        v, g = self.index[vertex], self.index[goal]
+        best = 0.0
+        infinity = float("inf")
+        for from_landmark, to_landmark in zip(
+                self.from_landmark, self.to_landmark):
+            # A bound is only meaningful when the subtracted distance is
+            # finite; an infinite result then means goal is unreachable
+            if from_landmark[v] != infinity:
+                bound = from_landmark[g] - from_landmark[v]
+                if bound > best:
+                    best = bound
+            if to_landmark[g] != infinity:
+                bound = to_landmark[v] - to_landmark[g]
+                if bound > best:
+                    best = bound
+        return best
+
+def _update_nearest(nearest, forward, backward, source):
+    """Lowers nearest to the distances to and from source, where smaller."""
+    out_distances = _dijkstra_arrays(*forward + (source,))[0]
+    in_distances = _dijkstra_arrays(*backward + (source,))[0]
+    for v in xrange(len(nearest)):
+        nearest[v] = min(nearest[v], out_distances[v], in_distances[v])
+
+def _farthest(nearest, exclude):
+    """Returns the vertex id with the largest finite distance in nearest.
+
+    Vertices that can not reach (or be reached from) any landmark make
+    poor landmarks, so they are only chosen if nothing else is left.
+    """
+    best = None
+    for v in xrange(len(nearest)):
+        if v in exclude:
+            continue
+        if best is None or (nearest[v] != float("inf") and (
+                nearest[best] == float("inf") or nearest[v] > nearest[best])):
+            best = v
+    return best
@@ -0,0 +1,109 @@
+from array import array
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+from shortest_path import _compact_adjacency
+from shortest_path import _dijkstra_arrays
+
+# Adjacency, target and output arrays shared with each worker process by
+# _init_worker
+_shared = None
+
+# Fewest edges times sources for which distance_matrix starts worker
+# processes by default; below this, starting the pool costs more than the
+# parallel searches save
+PARALLEL_MIN_WORK = 1000000
+
+def distance_matrix(edges, sources, targets, workers=None):
+    """Returns the shortest path lengths from each source to each target.
+
+    Builds one array-backed adjacency structure in shared memory, which
+    worker processes read without copying, and runs one single-source
+    Dijkstra search per source in parallel. Each search writes its row of
+    distances directly into a shared output array.
+
+    Args:
+        edges: A list of edge tuples in the form (v1, v2, weight), as for
+            shortest_path.
+
+        sources: A list of vertex names from which to find distances.
+
+        targets: A list of vertex names to which to find distances.
+
+        workers (optional): The number of worker processes to use. Defaults
+            to the number of CPUs, or to 1 if len(edges) * len(sources) is
+            less than PARALLEL_MIN_WORK. If 1, the searches run in this
+            process.
+
+    Returns:
+        An array of len(sources) * len(targets) floats in row-major order,
+            where the distance from sources[i] to targets[j] is at index
+            i * len(targets) + j. Unreachable targets have a distance of
+            infinity, and the distance from a vertex to itself is 0.
+
+    Raises:
+        ValueError: workers is less than 1.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+        if len(edges) * len(sources) < PARALLEL_MIN_WORK:
+            workers = 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    global _shared
+    names, index, offsets, edge_targets, weights = _compact_adjacency(edges)
+    target_ids = array('l', [index.get(name, -1) for name in targets])
+    jobs = [(row, index.get(name, -1)) for row, name in enumerate(sources)]
+    arrays = (offsets, edge_targets, weights, target_ids)
+    size = len(sources) * len(targets)
+    try:
+        if workers == 1 or len(jobs) < 2:
+            matrix = array('d', [0.0]) * size
+            _init_worker(*arrays + (matrix,))
+            map(_distance_row, jobs)
+        else:
+            shared = [RawArray(values.typecode, values) for values in arrays]
+            output = RawArray('d', size)
+            pool = multiprocessing.Pool(min(workers, len(jobs)),
+                    _init_worker, shared + [output])
+            try:
+                pool.map(_distance_row, jobs)
+            finally:
+                pool.close()
+                pool.join()
+            # Copy the shared output's bytes into a plain array at once
+            matrix = array('d', str(buffer(output)))
+    finally:
+        # Don't keep the arrays alive after the call
+        _shared = None
+    # Vertices that are in no edges still have a distance to themselves
+    columns = {}
+    for j, target_name in enumerate(targets):
+        columns.setdefault(target_name, []).append(j)
+    for i, source_name in enumerate(sources):
+        for j in columns.get(source_name, ()):
+            matrix[i * len(targets) + j] = 0.0
+    return matrix
+
+def _init_worker(offsets, targets, weights, target_ids, matrix):
+    """Stores the adjacency, target and output arrays for _distance_row."""
+    global _shared
+    _shared = (offsets, targets, weights, target_ids, matrix)
+
+def _distance_row(job):
+    """Fills in the row of distances from one source id to each target id.
+
+    Args:
+        job: A tuple of (row, source), where row is the row of the matrix
+            to fill and source is the id of the source vertex, or -1 if it
+            is in no edges.
+    """
+    row, source = job
+    offsets, targets, weights, target_ids, matrix = _shared
+    start = row * len(target_ids)
+    if source == -1:
+        for j in xrange(len(target_ids)):
+            matrix[start + j] = float("inf")
+        return
+    distances = _dijkstra_arrays(offsets, targets, weights, source)[0]
+    for j, target in enumerate(target_ids):
+        matrix[start + j] = distances[target] if target != -1 else float("inf")
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from shortest_path import _compact_adjacency
+from shortest_path import _dijkstra_arrays
+from shortest_path import _weighted_edges
+
+class ShortestPathIndex(object):
+    """A prepared index for many shortest path queries on the same edges.
+
+    The edges are converted once to array-backed adjacency lists with
+    integer vertex ids, and the results of the most recent single-source
+    searches are kept in a bounded least recently used (LRU) cache.
+
+    If the edges change, call update_edges with the new list, or
+    invalidate if the same edge list was changed in place, so that the
+    adjacency lists are rebuilt and cached results are not reused.
+    """
+
+    def __init__(self, edges, vertices=None, cache_size=64):
+        """Creates a new ShortestPathIndex.
+
+        Args:
+            edges: A list of edge tuples in the form (v1, v2, weight), as for
+                shortest_path. If vertices is given, edges may instead be
+                (v1, v2) tuples as for a_star, whose weight is the straight
+                line distance between v1 and v2.
+
+            vertices (optional): A list of vertex tuples in the form
+                (name, x, y), as for a_star. Required for a_star queries.
+
+            cache_size (optional): The number of single-source results to
+                keep. Must be at least 1. Defaults to 64.
+
+        Raises:
+            ValueError: cache_size is less than 1, or an edge has no weight
+                and vertices is not given.
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.cache_size = cache_size
+        self.vertices = vertices
+        self.update_edges(edges)
+
+    def update_edges(self, edges):
+        """Replaces the indexed edges and clears all cached results."""
+        self.edges = edges
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuilds the index from the current edges and clears the cache."""
+        coords = {}
+        if self.vertices is not None:
+            coords = {name:(x, y) for name, x, y in self.vertices}
+        weighted = _weighted_edges(self.edges, coords)
+        (self.names, self.index, self.offsets, self.targets,
+                self.weights) = _compact_adjacency(weighted, list(coords))
+        # Distances are stored as floats, but shortest_path returns integer
+        # sums for integer weights
+        self.integer_weights = all(isinstance(weight, (int, long))
+                for v1, v2, weight in weighted)
+        self.coords = coords
+        self._cache = OrderedDict()
+
+    def _distance(self, value):
+        """Returns a stored distance with the type shortest_path gives it."""
+        if self.integer_weights and value != float("inf"):
+            return int(value)
+        return value
+
+    def _search(self, start):
+        """Returns the cached (distances, predecessors) arrays for start."""
+        source = self.index[start]
+        if source in self._cache:
+            # Move to the most recently used end
+            result = self._cache.pop(source)
+        else:
+            result = _dijkstra_arrays(
+                    self.offsets, self.targets, self.weights, source)
+            if len(self._cache) >= self.cache_size:
+                self._cache.popitem(last=False)
+        self._cache[source] = result
+        return result
+
+    def shortest_path(self, start):
+        """Returns the shortest path length to each vertex from start.
+
+        Returns:
+            A dictionary in the same format as shortest_path returns. If
+                every weight is an integer, so are the finite distances;
+                otherwise they are floats.
+        """
+        if start not in self.index:
+            result = {name:float("inf") for name in self.names}
+        else:
+            distances = self._search(start)[0]
+            result = {name:self._distance(distances[i])
+                    for i, name in enumerate(self.names)}
+        result[start] = 0
+        return result
+
+    def path(self, start, goal):
+        """Returns the shortest path from start to goal.
+
+        Returns:
+            A tuple of (distance, path), where path is a list of vertex
+                names from start to goal. If there is no path, returns the
+                float value for infinity and an empty list.
+        """
+        if start == goal:
+            return 0, [start]
+        if start not in self.index or goal not in self.index:
+            return float("inf"), []
+        distances, predecessors = self._search(start)
+        current = self.index[goal]
+        if predecessors[current] == -1:
+            return float("inf"), []
+        path = [goal]
+        while current != self.index[start]:
+            current = predecessors[current]
+            path.append(self.names[current])
+        path.reverse()
+        return self._distance(distances[self.index[goal]]), path
+
+    def a_star(self, start, goal):
+        """Returns the shortest path distance from start to goal.
+
+        Gives the same result as a_star, but uses the cached single-source
+        results from start.
+
+        Raises:
+            ValueError: The index was created without vertices, or start or
+                goal is not one of them.
+        """
+        if start not in self.coords or goal not in self.coords:
+            raise ValueError("Start and goal vertices must be in vertex list")
+        if start == goal:
+            return 0.0
+        return self.path(start, goal)[0]
@@ -1,5 +1,10 @@
+from array import array
 from collections import defaultdict
 import heapq
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 def shortest_path(edges, start):
     """Returns the shortest path length to each vertex from a start vertex.
@@ -26,44 +31,207 @@ def shortest_path(edges, start):
             unreachable vertex is the float value for infinity.
             Returns the dictionary {start:0} if edges is empty.
     """
+    distances, predecessors = dijkstra(edges, start)
+    return distances
+
+def dijkstra(edges, start, target=None):
+    """Finds shortest paths from a start vertex using Dijkstra's algorithm.
+
+    If every weight is a non-negative integer, the search uses a monotone
+        bucket queue instead of a heap: Dial's buckets for weights up to
+        DIAL_MAX_WEIGHT, and a radix heap for larger ones. Otherwise, it
+        uses a binary heap with lazy deletion: when a shorter path to a
+        vertex is found, a new entry is pushed onto the heap, and the
+        outdated entry is skipped when it is popped. This takes O(E log E)
+        time.
+
+    Args:
+        edges: A list of edge tuples in the form (v1, v2, weight), as for
+            shortest_path.
+
+        start: The name of the vertex from which to find paths.
+
+        target (optional): The name of a vertex at which to stop. Once
+            target's distance is final, the search ends, so vertices that
+            are further from start than target may have distances that are
+            too large (including infinity).
+
+    Returns:
+        A tuple of (distances, predecessors), where distances is a
+            dictionary as returned by shortest_path, and predecessors is a
+            dictionary of the format {v: previous}, where previous is the
+            vertex before v on a shortest path from start. The predecessor
+            of start is None, and unreachable vertices are not included.
+    """
+    max_weight = _max_integer_weight(edges)
+    if max_weight is None:
+        return _heap_dijkstra(edges, start, target)
+    if max_weight <= DIAL_MAX_WEIGHT:
+        return _dial_dijkstra(edges, start, target, max_weight)
+    return _radix_dijkstra(edges, start, target)
+
+def _search_state(edges, start):
+    """Returns the starting state shared by the dijkstra implementations.
+
+    Returns:
+        A tuple of (vertex_edges, distances, predecessors), where
+            vertex_edges is a dictionary of {v: edges leaving v}, and
+            distances and predecessors are as returned by dijkstra before
+            the search.
+    """
     # Edges originating from each vertex
     vertex_edges = defaultdict(list)
-    # Set of all vertices, including vertices with no outgoing edges
-    all_vertices = set()
+    # Minimum known distances, including vertices with no outgoing edges
+    distances = {}
     for edge in edges:
         vertex_edges[edge[0]].append(edge)
-        all_vertices.update((edge[0], edge[1]))
-    # Minimum known distances for each vertex
-    distances = {vertex:float("inf") for vertex in all_vertices}
+        distances[edge[0]] = distances[edge[1]] = float("inf")
     distances[start] = 0
+    return vertex_edges, distances, {start:None}
+
+def _heap_dijkstra(edges, start, target=None):
+    """Runs dijkstra using a binary heap, for any non-negative weights."""
+    vertex_edges, distances, predecessors = _search_state(edges, start)
     # The set of vertices for which we know we have the minimum path
     visited = set()
-    visited.add(start)
-    # A shorter path could exist to these vertices, so don't mark them visited
-    for edge in vertex_edges[start]:
-        v1, v2, weight = edge
-        # Don't change the 0 from start if there is a self loop from start
-        distances[v2] = weight if v2 != start else 0
-    # Reach all accessible vertices by traversing all outgoing edges
-    while len(visited) < len(vertex_edges):
-        current = None
-        closest_distance = float("inf")
-        # Select next vertex from which to branch
-        for v in distances:
-            if v not in visited and distances[v] < closest_distance:
-                closest_distance = distances[v]
-                current = v
-        if current is None:
-            # Only unreachable vertices are unvisited
+    queue = [(0, start)]
+    while queue:
+        distance, current = heapq.heappop(queue)
+        if current in visited:
+            # Outdated entry; a shorter path was already found
+            continue
+        visited.add(current)
+        if current == target:
             break
-        for edge in vertex_edges[current]:
-            v1, v2, weight = edge
-            distances[v2] = min(distances[v2], distances[v1] + weight)
-        # Now have the minimum possible distance for current
+        for v1, v2, weight in vertex_edges[current]:
+            new_distance = distance + weight
+            if new_distance < distances[v2]:
+                distances[v2] = new_distance
+                predecessors[v2] = current
+                heapq.heappush(queue, (new_distance, v2))
+    return distances, predecessors
+
+# Largest edge weight for which Dial's buckets are used instead of a radix heap
+DIAL_MAX_WEIGHT = 256
+
+def _max_integer_weight(edges):
+    """Returns the largest edge weight if every weight is an integer.
+
+    Returns:
+        The largest weight, which is 0 if edges is empty, or None if edges
+            has a weight that is not a non-negative integer.
+    """
+    max_weight = 0
+    for edge in edges:
+        weight = edge[2]
+        if not isinstance(weight, (int, long)) or weight < 0:
+            return None
+        if weight > max_weight:
+            max_weight = weight
+    return max_weight
+
+def _dial_dijkstra(edges, start, target, max_weight):
+    """Runs dijkstra for integer weights using Dial's buckets.
+
+    Every distance in the queue is between the current distance d and
+        d + max_weight, so max_weight + 1 buckets kept in a circle and
+        scanned in order never hold two different distances at once. This
+        takes O(E + V * max_weight) time, which is fastest for small weights.
+    """
+    vertex_edges, distances, predecessors = _search_state(edges, start)
+    visited = set()
+    width = max_weight + 1
+    buckets = [[] for i in xrange(width)]
+    buckets[0].append(start)
+    queued = 1
+    distance = 0
+    while queued:
+        bucket = buckets[distance % width]
+        # Zero weight edges may add to the bucket while it is emptied
+        while bucket:
+            current = bucket.pop()
+            queued -= 1
+            if current in visited:
+                continue
+            visited.add(current)
+            if current == target:
+                return distances, predecessors
+            for v1, v2, weight in vertex_edges[current]:
+                new_distance = distance + weight
+                if new_distance < distances[v2]:
+                    distances[v2] = new_distance
+                    predecessors[v2] = current
+                    buckets[new_distance % width].append(v2)
+                    queued += 1
+        distance += 1
+    return distances, predecessors
+
+def _radix_dijkstra(edges, start, target=None):
+    """Runs dijkstra for integer weights using a radix heap.
+
+    An entry with distance k is kept in bucket i, where i is the bit length
+        of k XOR the last distance removed, so bucket 0 holds only entries
+        equal to the last distance removed. When bucket 0 is empty, the
+        first non-empty bucket is emptied into lower buckets relative to its
+        smallest distance. Each entry moves down at most once per bit, so
+        this takes O(E + V log C) time for a maximum weight of C.
+    """
+    vertex_edges, distances, predecessors = _search_state(edges, start)
+    visited = set()
+    # Buckets are added as needed, one for each bit of the distances
+    buckets = [[(0, start)]]
+    queued = 1
+    last = 0
+    while queued:
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            entries = buckets[i]
+            buckets[i] = []
+            last = min(entry[0] for entry in entries)
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        distance, current = buckets[0].pop()
+        queued -= 1
+        if current in visited:
+            continue
         visited.add(current)
-    return distances
+        if current == target:
+            break
+        for v1, v2, weight in vertex_edges[current]:
+            new_distance = distance + weight
+            if new_distance < distances[v2]:
+                distances[v2] = new_distance
+                predecessors[v2] = current
+                bucket = (new_distance ^ last).bit_length()
+                while bucket >= len(buckets):
+                    buckets.append([])
+                buckets[bucket].append((new_distance, v2))
+                queued += 1
+    return distances, predecessors
+
+def build_path(predecessors, target):
+    """Returns the path to target from a predecessor map.
 
-def a_star(vertices, edges, start, goal):
+    Args:
+        predecessors: A dictionary of {v: previous}, as returned by dijkstra.
+        target: The name of the vertex at which the path should end.
+
+    Returns:
+        A list of vertex names from the start vertex to target, or an empty
+            list if target was not reached.
+    """
+    if target not in predecessors:
+        return []
+    path = []
+    while target is not None:
+        path.append(target)
+        target = predecessors[target]
+    path.reverse()
+    return path
+
+def a_star(vertices, edges, start, goal, heuristic=None):
     """Returns the distance of the shortest path from start to goal.
 
     Using the A* heuristic, finds the length of the shortest path
@@ -80,6 +248,8 @@ def a_star(vertices, edges, start, goal):
             All edges are treated as directed, with the edge going from
             v1 to v2. All vertex names must also be included in the vertices
             parameter.
+            The length of an edge is the straight-line distance between
+            v1 and v2, unless it is given as a third item, (v1, v2, weight).
 
         start: The name of the vertex from which to find a path to goal.
             May be a string or number, but must be included in vertices.
@@ -90,56 +260,371 @@ def a_star(vertices, edges, start, goal):
         start and goal must be both included in edges in order to return a
             non-infinite result.
 
+        heuristic (optional): An object with an estimate(vertex, goal)
+            method, which returns a lower bound on the distance from vertex
+            to goal. Defaults to EuclideanHeuristic(vertices), which is only
+            a lower bound if no weight is shorter than its straight-line
+            distance. ZeroHeuristic turns the search into Dijkstra's
+            algorithm, and landmarks.LandmarkHeuristic works for any
+            non-negative weights.
+
     Returns:
         A floating point number that shows the shortest path distance
             from start to goal using a subset of the edges in edges.
             Returns the float value for infinity if there is no path from start
             to goal.
     """
-    # The x,y coordinates of each vertex
-    coords = {name:(x,y) for name, x, y in vertices}
-    if start not in coords or goal not in coords:
+    return a_star_with_stats(vertices, edges, start, goal, heuristic)[0]
+
+def a_star_with_stats(vertices, edges, start, goal, heuristic=None):
+    """Runs a_star and also reports how much work the search did.
+
+    Useful for comparing heuristics: a better heuristic settles fewer
+        vertices before reaching goal.
+
+    Args:
+        vertices, edges, start, goal, heuristic: As for a_star.
+
+    Returns:
+        A tuple of (distance, settled), where distance is the result of
+            a_star and settled is the number of vertices whose shortest
+            path was confirmed during the search.
+    """
+    names, index, xs, ys, offsets, targets, lengths = _a_star_arrays(
+            vertices, edges)
+    if start not in index or goal not in index:
         raise ValueError("Start and goal vertices must be in vertex list")
-    # Track the connected vertices from each vertex
-    graph = {vertex:[] for vertex in coords}
-    for edge in edges:
-        graph[edge[0]].append(edge[1])
+    source, target = index[start], index[goal]
+    if heuristic is None:
+        estimates = _euclidean_estimates(xs, ys, target)
+    else:
+        estimates = _LazyEstimates(
+                lambda v: heuristic.estimate(names[v], goal), len(names))
+    count = len(names)
     # The best known path length for each vertex
-    distances = {vertex:float("inf") for vertex in coords}
-    distances[start] = 0.0
+    distances = array('d', [float("inf")] * count)
+    distances[source] = 0.0
     # The vertices for which we have confirmed the shortest path
-    visited = set()
+    visited = bytearray(count)
+    settled = 0
     # Track vertices in priority queue as (estimated distance, vertex) tuples
-    queue = [(_get_dist(coords[start], coords[goal]), start)]
-    while len(queue) > 0:
+    queue = [(estimates[source], source)]
+    while queue:
         # Get the vertex itself, no longer need to track its priority
         current = heapq.heappop(queue)[1]
-        if current == goal:
-            return distances[goal]
+        if current == target:
+            return distances[target], settled + 1
         # If we reach a neighbor with an outdated estimated value, it will
         # already have been visited with its updated (smaller) value
-        if current in visited:
+        if visited[current]:
             continue
-        visited.add(current)
-        for neighbor in graph[current]:
-            if neighbor in visited:
+        visited[current] = 1
+        settled += 1
+        current_distance = distances[current]
+        for i in xrange(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            if visited[neighbor]:
                 continue
-            edge_distance = _get_dist(coords[current], coords[neighbor])
             # Distance from start to this neighboring node
-            new_score = distances[current] + edge_distance
+            new_score = current_distance + lengths[i]
             if new_score >= distances[neighbor]:
                 # This path is not an improvement
                 continue
             # This path is an improvement, so add it
             distances[neighbor] = new_score
-            # Neighbor's minimum distance (if it had an edge directly to goal)
-            remaining_dist = _get_dist(coords[neighbor], coords[goal])
             # Estimated distance has been updated; re-add to heap
-            heapq.heappush(queue, (new_score + remaining_dist, neighbor))
-    return distances[goal]
+            heapq.heappush(queue, (new_score + estimates[neighbor], neighbor))
+    return distances[target], settled
+
+def _a_star_arrays(vertices, edges):
+    """Converts a_star's vertex and edge tuples to arrays.
+
+    Edge lengths are computed once here instead of during the search.
+
+    Returns:
+        A tuple of (names, index, xs, ys, offsets, targets, lengths), where
+            xs and ys are arrays of the coordinates of each vertex id, and
+            the rest are as returned by _compact_adjacency.
+
+    Raises:
+        ValueError: An edge uses a vertex that is not in vertices.
+    """
+    names = []
+    index = {}
+    xs = array('d')
+    ys = array('d')
+    for name, x, y in vertices:
+        # Later tuples for the same name replace earlier ones
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+            xs.append(x)
+            ys.append(y)
+        else:
+            xs[index[name]] = x
+            ys[index[name]] = y
+    weighted = []
+    for edge in edges:
+        if edge[0] not in index or edge[1] not in index:
+            raise ValueError("Edge vertices must be in vertex list")
+        if len(edge) > 2:
+            weighted.append(tuple(edge[:3]))
+        else:
+            v1, v2 = index[edge[0]], index[edge[1]]
+            weighted.append((edge[0], edge[1],
+                _get_dist((xs[v1], ys[v1]), (xs[v2], ys[v2]))))
+    names, index, offsets, targets, lengths = _compact_adjacency(
+            weighted, names)
+    return names, index, xs, ys, offsets, targets, lengths
+
+def _euclidean_estimates(xs, ys, goal):
+    """Returns the straight-line distance from every vertex id to goal.
+
+    Uses NumPy to compute all of the distances at once if it is installed.
+    Otherwise, each distance is computed the first time it is needed.
+    """
+    if numpy is not None:
+        x = numpy.frombuffer(xs, dtype=numpy.float64)
+        y = numpy.frombuffer(ys, dtype=numpy.float64)
+        return numpy.sqrt((x - xs[goal])**2 + (y - ys[goal])**2).tolist()
+    return _LazyEstimates(
+            lambda v: _get_dist((xs[v], ys[v]), (xs[goal], ys[goal])), len(xs))
+
+class _LazyEstimates(object):
+    """Heuristic estimates by vertex id, computed at most once each."""
+
+    def __init__(self, estimate, count):
+        self.estimate = estimate
+        self.values = [None] * count
+
+    def __getitem__(self, vertex):
+        value = self.values[vertex]
+        if value is None:
+            value = self.values[vertex] = self.estimate(vertex)
+        return value
+
+def bidirectional_dijkstra(edges, start, goal):
+    """Returns the shortest path length from start to goal.
+
+    Runs Dijkstra's algorithm forward from start and backward from goal
+        at the same time, which explores roughly half the radius of a
+        single search in each direction. Stops once the smallest distances
+        left in the two queues add up to at least the best path found.
+
+    Args:
+        edges: A list of edge tuples in the form (v1, v2, weight), as for
+            shortest_path.
+        start: The name of the vertex from which to find a path.
+        goal: The name of the vertex to which to find a path.
+
+    Returns:
+        The length of the shortest path from start to goal, or the float
+            value for infinity if there is no such path.
+    """
+    return _bidirectional(edges, start, goal, None)
+
+def bidirectional_a_star(vertices, edges, start, goal, heuristic=None):
+    """Returns the distance of the shortest path from start to goal.
+
+    A bidirectional version of a_star. Both searches use the average of
+        the forward and backward heuristic estimates, which keeps the two
+        searches consistent with each other, so the same stopping rule as
+        bidirectional_dijkstra applies.
+
+    Args:
+        vertices, edges, start, goal: As for a_star.
+        heuristic (optional): As for a_star. Must be consistent (as
+            EuclideanHeuristic, ZeroHeuristic and LandmarkHeuristic are),
+            and estimate(start, v) is used as the estimate from start to v.
+
+    Returns:
+        The same value as a_star.
+    """
+    coords = {name:(x,y) for name, x, y in vertices}
+    if start not in coords or goal not in coords:
+        raise ValueError("Start and goal vertices must be in vertex list")
+    if heuristic is None:
+        heuristic = EuclideanHeuristic(vertices)
+    return _bidirectional(_weighted_edges(edges, coords), start, goal,
+            heuristic, list(coords))
+
+def _bidirectional(edges, start, goal, heuristic, names=None):
+    """Bidirectional search shared by bidirectional_dijkstra and _a_star."""
+    if start == goal:
+        return 0.0
+    names, index, offsets, targets, weights = _compact_adjacency(edges, names)
+    if start not in index or goal not in index:
+        return float("inf")
+    reverse = _compact_adjacency(
+            [(v2, v1, weight) for v1, v2, weight in edges], names)
+    graphs = ((offsets, targets, weights), reverse[2:])
+    count = len(names)
+    source, target = index[start], index[goal]
+    infinity = float("inf")
+    # Forward potential of each vertex; the backward potential is its
+    # negative. None means not computed yet.
+    potentials = [None] * count
+
+    def potential(vertex):
+        if heuristic is None:
+            return 0.0
+        if potentials[vertex] is None:
+            to_goal = heuristic.estimate(names[vertex], goal)
+            from_start = heuristic.estimate(start, names[vertex])
+            if to_goal == infinity or from_start == infinity:
+                # Not on any path from start to goal
+                potentials[vertex] = infinity
+            else:
+                potentials[vertex] = (to_goal - from_start) / 2.0
+        return potentials[vertex]
+
+    distances = (array('d', [infinity] * count),
+            array('d', [infinity] * count))
+    distances[0][source] = distances[1][target] = 0
+    settled = (bytearray(count), bytearray(count))
+    queues = ([(potential(source), source)], [(-potential(target), target)])
+    best = infinity
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        # Expand whichever direction has the smaller queue
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        sign = 1 if side == 0 else -1
+        key, current = heapq.heappop(queues[side])
+        if settled[side][current]:
+            continue
+        settled[side][current] = 1
+        distance = distances[side][current]
+        side_offsets, side_targets, side_weights = graphs[side]
+        for i in xrange(side_offsets[current], side_offsets[current + 1]):
+            neighbor = side_targets[i]
+            new_distance = distance + side_weights[i]
+            # Path through this edge to a vertex the other side reached
+            through = new_distance + distances[1 - side][neighbor]
+            if through < best:
+                best = through
+            if new_distance < distances[side][neighbor]:
+                if potential(neighbor) == infinity:
+                    continue
+                distances[side][neighbor] = new_distance
+                heapq.heappush(queues[side],
+                        (new_distance + sign * potential(neighbor), neighbor))
+    return best
+
+class EuclideanHeuristic(object):
+    """The straight-line distance between vertices, as an a_star heuristic."""
+
+    def __init__(self, vertices):
+        """Creates a new EuclideanHeuristic.
+
+        Args:
+            vertices: A list of (name, x, y) vertex tuples, as for a_star.
+        """
+        self.coords = {name:(x, y) for name, x, y in vertices}
+
+    def estimate(self, vertex, goal):
+        """Returns the straight-line distance from vertex to goal."""
+        return _get_dist(self.coords[vertex], self.coords[goal])
+
+class ZeroHeuristic(object):
+    """An a_star heuristic that estimates 0, like Dijkstra's algorithm."""
+
+    def estimate(self, vertex, goal):
+        """Returns 0 for any vertex."""
+        return 0.0
 
 def _get_dist(node, goal):
     """Returns the straight-line distance from node to goal."""
     x_dist = node[0] - goal[0]
     y_dist = node[1] - goal[1]
     return (x_dist**2 + y_dist**2)**0.5
+
+def _compact_adjacency(edges, names=None):
+    """Builds array-backed adjacency lists with integer vertex ids.
+
+    Args:
+        edges: A list of edge tuples in the form (v1, v2, weight).
+        names (optional): A list of vertex names to number first.
+
+    Returns:
+        A tuple of (names, index, offsets, targets, weights), where names is
+            a list of vertex names by id, index is a dictionary of
+            {name: id}, and the edges leaving id i are at positions
+            offsets[i] to offsets[i + 1] - 1 of targets and weights.
+    """
+    names = list(names) if names else []
+    index = {name:i for i, name in enumerate(names)}
+    counts = [0] * len(names)
+    for v1, v2, weight in edges:
+        for name in (v1, v2):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+                counts.append(0)
+        counts[index[v1]] += 1
+    offsets = array('l', [0] * (len(names) + 1))
+    for i in xrange(len(names)):
+        offsets[i + 1] = offsets[i] + counts[i]
+    targets = array('l', [0] * len(edges))
+    weights = array('d', [0.0] * len(edges))
+    # Reuse counts as the next free position for each vertex
+    counts = offsets[:-1]
+    for v1, v2, weight in edges:
+        source = index[v1]
+        targets[counts[source]] = index[v2]
+        weights[counts[source]] = weight
+        counts[source] += 1
+    return names, index, offsets, targets, weights
+
+def _dijkstra_arrays(offsets, targets, weights, source, target=-1):
+    """Runs dijkstra on the arrays from _compact_adjacency.
+
+    Returns:
+        A tuple of (distances, predecessors) arrays indexed by vertex id,
+            where unreachable vertices have a distance of infinity and a
+            predecessor of -1, and the predecessor of source is itself.
+    """
+    count = len(offsets) - 1
+    distances = array('d', [float("inf")] * count)
+    predecessors = array('l', [-1] * count)
+    distances[source] = 0.0
+    predecessors[source] = source
+    visited = bytearray(count)
+    queue = [(0.0, source)]
+    while queue:
+        distance, current = heapq.heappop(queue)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        if current == target:
+            break
+        for i in xrange(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            new_distance = distance + weights[i]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current
+                heapq.heappush(queue, (new_distance, neighbor))
+    return distances, predecessors
+
+def _weighted_edges(edges, coords):
+    """Returns edges as (v1, v2, weight) tuples.
+
+    Edges that are already weighted are kept as they are, and (v1, v2)
+        edges are given the straight-line distance between v1 and v2 as
+        their weight, as in a_star.
+
+    Raises:
+        ValueError: An edge has no weight and one of its vertices is not in
+            coords.
+    """
+    weighted = []
+    for edge in edges:
+        if len(edge) > 2:
+            weighted.append(tuple(edge[:3]))
+        elif edge[0] in coords and edge[1] in coords:
+            weighted.append((edge[0], edge[1],
+                _get_dist(coords[edge[0]], coords[edge[1]])))
+        else:
+            raise ValueError("Edges without weights require vertices")
+    return weighted
@@ -0,0 +1,70 @@
+from random import randint
+from random import seed
+from random import uniform
+from contraction import ContractionHierarchy
+from shortest_path import a_star
+from shortest_path import shortest_path
+from nose.tools import assert_equals
+from nose.tools import assert_almost_equals
+from nose.tools import assert_raises
+
+VERTICES = [(0, -5, 0.5), (1, 8, -4), (2, 1, 0.5), (3, -1.5, -2),
+        (4, 5.5, 4), (5, 4, -20.6), (6, 1.2, -2), (7, -6, -1),
+        (8, 10, 0.5), (9, 5.6, -52.3)]
+PATHS = [(0, 7), (0, 3), (7, 3), (7, 9), (3, 6), (3, 2), (3, 5), (5, 1),
+        (9, 1), (2, 4), (4, 8), (4, 1)]
+
+def test_contraction_empty():
+    ch = ContractionHierarchy([(1, 0.0, 0.0)], [])
+    assert_equals(ch.distance(1, 1), 0.0)
+
+def test_contraction_no_path():
+    ch = ContractionHierarchy([(1, 0.0, 0.0), (2, 1.0, 1.0)], [(2, 1)])
+    assert_equals(ch.distance(1, 2), float("inf"))
+
+def test_contraction_single_edge():
+    ch = ContractionHierarchy([(1, 0.0, 0.0), (2, 1.0, 1.0)], [(1, 2)])
+    assert_equals(ch.distance(1, 2), 2**0.5)
+
+def test_contraction_invalid_vertex():
+    ch = ContractionHierarchy([(1, 0.0, 0.0)], [])
+    assert_raises(ValueError, ch.distance, 1, 2)
+    assert_raises(ValueError, ContractionHierarchy, [(1, 0.0, 0.0)], [(1, 2)])
+
+def test_contraction_matches_a_star():
+    ch = ContractionHierarchy(VERTICES, PATHS)
+    for start in xrange(10):
+        for goal in xrange(10):
+            assert_almost_equals(ch.distance(start, goal),
+                    a_star(VERTICES, PATHS, start, goal))
+
+def test_contraction_weighted_edges():
+    vertices = [(name, 0.0, 0.0) for name in "abcd"]
+    edges = [("a", "b", 1), ("b", "c", 1), ("a", "c", 5), ("c", "d", 1),
+            ("c", "a", 1)]
+    ch = ContractionHierarchy(vertices, edges)
+    assert_equals(ch.distance("a", "d"), 3)
+    assert_equals(ch.distance("c", "b"), 2)
+    assert_equals(ch.distance("d", "a"), float("inf"))
+
+def test_contraction_random_grid():
+    seed(3)
+    size = 8
+    vertices = [(x * size + y, x + uniform(-0.3, 0.3), y + uniform(-0.3, 0.3))
+            for x in xrange(size) for y in xrange(size)]
+    edges = []
+    for x in xrange(size):
+        for y in xrange(size):
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1), (1, 1)):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    if randint(0, 5):
+                        edges.append((x * size + y, (x + dx) * size + y + dy))
+    ch = ContractionHierarchy(vertices, edges)
+    coords = {name:(x, y) for name, x, y in vertices}
+    weighted = [(v1, v2, ((coords[v1][0] - coords[v2][0])**2 +
+        (coords[v1][1] - coords[v2][1])**2)**0.5) for v1, v2 in edges]
+    for start in xrange(0, size * size, 7):
+        expected = shortest_path(weighted, start)
+        for goal in xrange(size * size):
+            assert_almost_equals(ch.distance(start, goal),
+                    expected.get(goal, float("inf")))
@@ -0,0 +1,86 @@
+from random import choice
+from random import randint
+from random import seed
+from dynamic import DynamicShortestPathTree
+from shortest_path import shortest_path
+from shortest_path import build_path
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+def test_dynamic_negative_weight():
+    assert_raises(ValueError, DynamicShortestPathTree, [(1, 2, -1)], 1)
+    tree = DynamicShortestPathTree([(1, 2, 1)], 1)
+    assert_raises(ValueError, tree.update, 1, 2, -1)
+
+def test_dynamic_initial_distances():
+    paths = [(1, 2, 5), (2, 3, 4), (2, 4, 2), (4, 5, 4), (3, 5, 1)]
+    tree = DynamicShortestPathTree(paths, 1)
+    assert_equals(tree.distances, shortest_path(paths, 1))
+    assert_equals(build_path(tree.predecessors, 5), [1, 2, 3, 5])
+
+def test_dynamic_parallel_edges():
+    tree = DynamicShortestPathTree([(1, 2, 5), (1, 2, 3)], 1)
+    assert_equals(tree.distances[2], 3)
+    # The collapsed edge is replaced
+    assert_equals(tree.update(1, 2, 7), {2:7})
+
+def test_dynamic_decrease():
+    tree = DynamicShortestPathTree([(1, 2, 1), (2, 3, 1), (1, 3, 5)], 1)
+    assert_equals(tree.update(1, 3, 1), {3:1})
+    assert_equals(build_path(tree.predecessors, 3), [1, 3])
+    # Not shorter than the current path
+    assert_equals(tree.update(2, 3, 0), {})
+
+def test_dynamic_increase():
+    tree = DynamicShortestPathTree([(1, 2, 1), (2, 3, 1), (1, 3, 5),
+            (3, 4, 1)], 1)
+    assert_equals(tree.update(1, 2, 10), {2:10, 3:5, 4:6})
+    assert_equals(build_path(tree.predecessors, 4), [1, 3, 4])
+    # Not a tree edge
+    assert_equals(tree.update(2, 3, 7), {})
+
+def test_dynamic_remove_edge():
+    tree = DynamicShortestPathTree([(1, 2, 1), (2, 3, 1)], 1)
+    assert_equals(tree.remove_edge(1, 2),
+            {2:float("inf"), 3:float("inf")})
+    assert_equals(tree.predecessors, {1:None})
+    assert_equals(tree.update(1, 3, 4), {3:4})
+
+def test_dynamic_new_vertices():
+    tree = DynamicShortestPathTree([], "A")
+    assert_equals(tree.distances, {"A":0})
+    assert_equals(tree.update("A", "B", 2), {"B":2})
+    assert_equals(tree.update("C", "D", 2), {})
+    assert_equals(tree.distances["D"], float("inf"))
+
+def test_dynamic_random_updates():
+    seed(17)
+    for trial in xrange(10):
+        weights = {}
+        for i in xrange(60):
+            weights[(randint(0, 20), randint(0, 20))] = randint(0, 10)
+        tree = DynamicShortestPathTree(
+                [(v1, v2, w) for (v1, v2), w in weights.iteritems()], 0)
+        for update in xrange(30):
+            if randint(0, 3):
+                edge = choice(weights.keys())
+            else:
+                edge = (randint(0, 20), randint(0, 20))
+            before = dict(tree.distances)
+            weights[edge] = randint(0, 10)
+            changed = tree.update(edge[0], edge[1], weights[edge])
+            expected = shortest_path(
+                    [(v1, v2, w) for (v1, v2), w in weights.iteritems()], 0)
+            for vertex in tree.distances:
+                assert_equals(tree.distances[vertex],
+                        expected.get(vertex, float("inf")))
+                if vertex in changed:
+                    assert before.get(vertex) != tree.distances[vertex]
+                else:
+                    assert_equals(before.get(vertex, float("inf")),
+                            tree.distances[vertex])
+            for vertex in tree.predecessors:
+                path = build_path(tree.predecessors, vertex)
+                length = sum(weights[(path[i], path[i + 1])]
+                        for i in xrange(len(path) - 1))
+                assert_equals(length, tree.distances[vertex])
@@ -0,0 +1,79 @@
+from random import randint
+from random import random
+from random import seed
+from math import sqrt
+from grid import jump_point_search
+from shortest_path import a_star
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_almost_equals
+
+def _grid_graph(grid, width):
+    """Returns the open cells and 8-connected moves of grid for a_star."""
+    height = len(grid) // width
+    def is_open(x, y):
+        return 0 <= x < width and 0 <= y < height and not grid[y * width + x]
+    vertices = [((x, y), x, y) for y in xrange(height) for x in xrange(width)]
+    edges = []
+    for y in xrange(height):
+        for x in xrange(width):
+            if not is_open(x, y):
+                continue
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if ((dx or dy) and is_open(x + dx, y + dy) and
+                            is_open(x + dx, y) and is_open(x, y + dy)):
+                        edges.append(((x, y), (x + dx, y + dy)))
+    return vertices, edges
+
+def test_jump_point_search_invalid():
+    grid = bytearray(6)
+    assert_raises(ValueError, jump_point_search, grid, 4, (0, 0), (1, 1))
+    assert_raises(ValueError, jump_point_search, grid, 3, (0, 0), (3, 0))
+    assert_raises(ValueError, jump_point_search, grid, 3, (0, -1), (1, 1))
+
+def test_jump_point_search_same_cell():
+    assert_equals(jump_point_search(bytearray(4), 2, (1, 1), (1, 1)), 0)
+
+def test_jump_point_search_blocked_end():
+    grid = bytearray([0, 0, 0, 1])
+    assert_equals(jump_point_search(grid, 2, (0, 0), (1, 1)), float("inf"))
+    assert_equals(jump_point_search(grid, 2, (1, 1), (0, 0)), float("inf"))
+
+def test_jump_point_search_open():
+    assert_almost_equals(jump_point_search(bytearray(100), 10, (0, 0),
+            (9, 4)), 5 + 4 * sqrt(2))
+
+def test_jump_point_search_no_corner_cutting():
+    grid = bytearray([0, 1,
+                      0, 0])
+    assert_equals(jump_point_search(grid, 2, (0, 0), (1, 1)), 2)
+    grid = bytearray([0, 1,
+                      1, 0])
+    assert_equals(jump_point_search(grid, 2, (0, 0), (1, 1)), float("inf"))
+
+def test_jump_point_search_wall():
+    grid = bytearray([0, 0, 1, 0, 0,
+                      0, 0, 1, 0, 0,
+                      0, 0, 1, 0, 0,
+                      0, 0, 0, 0, 0])
+    assert_almost_equals(jump_point_search(grid, 5, (0, 0), (4, 0)),
+            6 + 2 * sqrt(2))
+
+def test_jump_point_search_matches_a_star():
+    seed(18)
+    for trial in xrange(40):
+        width, height = randint(1, 12), randint(1, 12)
+        density = random() * 0.4
+        grid = bytearray(int(random() < density)
+                for i in xrange(width * height))
+        vertices, edges = _grid_graph(grid, width)
+        for query in xrange(10):
+            start = (randint(0, width - 1), randint(0, height - 1))
+            goal = (randint(0, width - 1), randint(0, height - 1))
+            expected = a_star(vertices, edges, start, goal)
+            actual = jump_point_search(grid, width, start, goal)
+            if expected == float("inf"):
+                assert_equals(actual, expected)
+            else:
+                assert_almost_equals(actual, expected)
@@ -0,0 +1,106 @@
+from random import randint
+from random import seed
+from landmarks import LandmarkHeuristic
+from shortest_path import a_star
+from shortest_path import a_star_with_stats
+from shortest_path import bidirectional_a_star
+from shortest_path import EuclideanHeuristic
+from shortest_path import ZeroHeuristic
+from shortest_path import shortest_path
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+VERTICES = [(0, -5, 0.5), (1, 8, -4), (2, 1, 0.5), (3, -1.5, -2),
+        (4, 5.5, 4), (5, 4, -20.6), (6, 1.2, -2), (7, -6, -1),
+        (8, 10, 0.5), (9, 5.6, -52.3)]
+PATHS = [(0, 7), (0, 3), (7, 3), (7, 9), (3, 6), (3, 2), (3, 5), (5, 1),
+        (9, 1), (2, 4), (4, 8), (4, 1)]
+
+def _random_network(size, seed_value):
+    seed(seed_value)
+    vertices = [(x * size + y, x, y)
+            for x in xrange(size) for y in xrange(size)]
+    edges = []
+    for x in xrange(size):
+        for y in xrange(size):
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    # Travel times, not geometric lengths
+                    edges.append((x * size + y, (x + dx) * size + y + dy,
+                        randint(1, 20)))
+    return vertices, edges
+
+def test_landmark_choice():
+    h = LandmarkHeuristic(VERTICES, PATHS, 3)
+    assert_equals(len(h.landmarks), 3)
+    assert_equals(len(set(h.landmarks)), 3)
+
+def test_landmark_given():
+    h = LandmarkHeuristic(VERTICES, PATHS, landmarks=[9])
+    assert_equals(h.landmarks, [9])
+    assert_raises(ValueError, LandmarkHeuristic, VERTICES, PATHS, 1, ["x"])
+
+def test_landmark_more_than_vertices():
+    h = LandmarkHeuristic([(1, 0, 0), (2, 1, 1)], [(1, 2)], 5)
+    assert_equals(sorted(h.landmarks), [1, 2])
+
+def test_landmark_empty():
+    assert_equals(LandmarkHeuristic([], []).landmarks, [])
+
+def test_landmark_estimate_is_lower_bound():
+    vertices, edges = _random_network(6, 1)
+    h = LandmarkHeuristic(vertices, edges, 3)
+    for start in xrange(0, 36, 5):
+        distances = shortest_path(edges, start)
+        for goal in xrange(36):
+            assert h.estimate(start, goal) <= distances[goal] + 1e-9
+
+def test_landmark_unreachable_goal():
+    h = LandmarkHeuristic([(1, 0, 0), (2, 1, 1)], [(1, 2)], landmarks=[1])
+    assert_equals(h.estimate(2, 1), float("inf"))
+    assert_equals(a_star([(1, 0, 0), (2, 1, 1)], [(1, 2)], 2, 1, h),
+            float("inf"))
+
+def test_a_star_weighted_edges():
+    vertices = [(1, 0.0, 0.0), (2, 1.0, 1.0), (3, 2.0, 2.0)]
+    edges = [(1, 2, 5), (2, 3, 1), (1, 3, 10)]
+    assert_equals(a_star(vertices, edges, 1, 3, ZeroHeuristic()), 6)
+
+def test_a_star_heuristics_agree():
+    vertices, edges = _random_network(8, 2)
+    heuristics = [ZeroHeuristic(), LandmarkHeuristic(vertices, edges, 4)]
+    for start, goal in ((0, 63), (7, 56), (20, 45), (63, 0)):
+        expected = shortest_path(edges, start)[goal]
+        for h in heuristics:
+            assert_equals(a_star(vertices, edges, start, goal, h), expected)
+
+def test_a_star_landmarks_settle_fewer():
+    vertices, edges = _random_network(10, 3)
+    landmarks = LandmarkHeuristic(vertices, edges, 4)
+    zero_total = landmark_total = 0
+    for start, goal in ((0, 99), (9, 90), (45, 99), (90, 5)):
+        zero_distance, zero_settled = a_star_with_stats(
+                vertices, edges, start, goal, ZeroHeuristic())
+        distance, settled = a_star_with_stats(
+                vertices, edges, start, goal, landmarks)
+        assert_equals(distance, zero_distance)
+        zero_total += zero_settled
+        landmark_total += settled
+    assert landmark_total < zero_total
+
+def test_a_star_with_stats_euclidean():
+    distance, settled = a_star_with_stats(VERTICES, PATHS, 0, 1)
+    assert_equals(distance, a_star(VERTICES, PATHS, 0, 1))
+    assert 0 < settled <= len(VERTICES)
+    assert_equals(a_star(VERTICES, PATHS, 0, 1, EuclideanHeuristic(VERTICES)),
+            distance)
+
+def test_bidirectional_a_star_landmarks():
+    vertices, edges = _random_network(7, 4)
+    h = LandmarkHeuristic(vertices, edges, 3)
+    for start in (0, 10, 48):
+        expected = shortest_path(edges, start)
+        for goal in xrange(49):
+            assert_equals(
+                    bidirectional_a_star(vertices, edges, start, goal, h),
+                    expected[goal])
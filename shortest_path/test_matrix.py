@@ -0,0 +1,59 @@
+from random import randint
+from random import seed
+import matrix
+from matrix import distance_matrix
+from shortest_path import shortest_path
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+PATHS = [(1, 2, 5), (2, 3, 4), (2, 4, 2), (4, 5, 4), (3, 5, 1)]
+INF = float("inf")
+
+def test_distance_matrix_small():
+    result = distance_matrix(PATHS, [1, 4], [5, 1, 4], 1)
+    assert_equals(list(result), [10, 0, 7, 4, INF, 0])
+
+def test_distance_matrix_unknown_vertices():
+    result = distance_matrix(PATHS, ["x", 1], ["x", 2, "y"], 1)
+    assert_equals(list(result), [0, INF, INF, INF, 5, INF])
+
+def test_distance_matrix_repeated_names():
+    result = distance_matrix(PATHS, [2, 2], [2, 3, 2], 1)
+    assert_equals(list(result), [0, 4, 0, 0, 4, 0])
+
+def test_distance_matrix_empty():
+    assert_equals(list(distance_matrix([], [], [1])), [])
+    assert_equals(list(distance_matrix([], [1], [])), [])
+
+def test_distance_matrix_invalid_workers():
+    assert_raises(ValueError, distance_matrix, PATHS, [1], [2], 0)
+
+def test_distance_matrix_workers():
+    seed(14)
+    paths = [(randint(0, 40), randint(0, 40), randint(0, 9))
+            for i in xrange(150)]
+    sources = range(0, 41, 4)
+    targets = range(41)
+    serial = distance_matrix(paths, sources, targets, 1)
+    parallel = distance_matrix(paths, sources, targets, 3)
+    assert_equals(serial, parallel)
+    for i, source in enumerate(sources):
+        expected = shortest_path(paths, source)
+        for j, target in enumerate(targets):
+            assert_equals(serial[i * len(targets) + j],
+                    expected.get(target, INF))
+
+def test_distance_matrix_small_input_is_serial():
+    def no_pool(*args):
+        raise AssertionError("Small inputs should not start a pool")
+    pool = matrix.multiprocessing.Pool
+    matrix.multiprocessing.Pool = no_pool
+    try:
+        result = distance_matrix(PATHS, [1, 2, 4], [5])
+        assert_equals(list(result), [10, 5, 4])
+    finally:
+        matrix.multiprocessing.Pool = pool
+
+def test_distance_matrix_releases_arrays():
+    distance_matrix(PATHS, [1, 2], [5], 1)
+    assert matrix._shared is None
@@ -0,0 +1,78 @@
+from path_index import ShortestPathIndex
+from shortest_path import shortest_path
+from shortest_path import a_star
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+PATHS = [(1, 2, 5), (2, 3, 4), (2, 4, 2), (4, 5, 4), (3, 5, 1)]
+
+def test_index_shortest_path():
+    index = ShortestPathIndex(PATHS)
+    for start in xrange(1, 6):
+        assert_equals(index.shortest_path(start), shortest_path(PATHS, start))
+
+def test_index_unknown_start():
+    assert_equals(ShortestPathIndex(PATHS).shortest_path(9),
+            shortest_path(PATHS, 9))
+
+def test_index_keeps_weight_types():
+    for paths in (PATHS, [(1, 2, 0.5), (2, 3, 4.0), (3, 1, 1.25)]):
+        index = ShortestPathIndex(paths)
+        for start in (1, 2, 3):
+            result = index.shortest_path(start)
+            expected = shortest_path(paths, start)
+            assert_equals(result, expected)
+            for vertex in expected:
+                assert_equals(type(result[vertex]), type(expected[vertex]))
+
+def test_index_empty():
+    index = ShortestPathIndex([])
+    assert_equals(index.shortest_path("A"), {"A":0})
+    assert_equals(index.path("A", "B"), (float("inf"), []))
+
+def test_index_path():
+    index = ShortestPathIndex(PATHS)
+    assert_equals(index.path(1, 5), (10, [1, 2, 3, 5]))
+    assert_equals(index.path(1, 1), (0, [1]))
+    assert_equals(index.path(5, 1), (float("inf"), []))
+
+def test_index_cache_is_bounded():
+    index = ShortestPathIndex(PATHS, cache_size=2)
+    for start in (1, 2, 3, 1):
+        index.shortest_path(start)
+    assert_equals(list(index._cache), [index.index[3], index.index[1]])
+
+def test_index_invalid_cache_size():
+    assert_raises(ValueError, ShortestPathIndex, PATHS, None, 0)
+
+def test_index_update_edges():
+    index = ShortestPathIndex(PATHS)
+    assert_equals(index.path(1, 5)[0], 10)
+    index.update_edges(PATHS + [(1, 5, 3)])
+    assert_equals(index.path(1, 5), (3, [1, 5]))
+
+def test_index_invalidate():
+    edges = list(PATHS)
+    index = ShortestPathIndex(edges)
+    assert_equals(index.path(1, 5), (10, [1, 2, 3, 5]))
+    edges.append((1, 5, 3))
+    index.invalidate()
+    assert_equals(index.path(1, 5), (3, [1, 5]))
+    edges[-1] = (1, 5, 20)
+    index.invalidate()
+    assert_equals(index.path(1, 5), (10, [1, 2, 3, 5]))
+
+def test_index_a_star():
+    vertices = [(0, -5, 0.5), (1, 8, -4), (2, 1, 0.5), (3, -1.5, -2),
+            (4, 5.5, 4), (5, 4, -20.6), (6, 1.2, -2), (7, -6, -1),
+            (8, 10, 0.5), (9, 5.6, -52.3)]
+    paths = [(0, 7), (0, 3), (7, 3), (7, 9), (3, 6), (3, 2), (3, 5), (5, 1),
+            (9, 1), (2, 4), (4, 8), (4, 1)]
+    index = ShortestPathIndex(paths, vertices)
+    for goal in xrange(10):
+        assert_equals(index.a_star(0, goal), a_star(vertices, paths, 0, goal))
+
+def test_index_a_star_invalid():
+    assert_raises(ValueError, ShortestPathIndex, [(1, 2)])
+    index = ShortestPathIndex([(1, 2, 3)])
+    assert_raises(ValueError, index.a_star, 1, 2)
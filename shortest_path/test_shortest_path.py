@@ -1,8 +1,18 @@
+from random import randint
+from random import seed
+from random import uniform
 from shortest_path import shortest_path
 from shortest_path import a_star
+from shortest_path import dijkstra
+from shortest_path import build_path
+from shortest_path import bidirectional_dijkstra
+from shortest_path import bidirectional_a_star
 from shortest_path import _get_dist
+from shortest_path import _heap_dijkstra
+from shortest_path import DIAL_MAX_WEIGHT
 from nose.tools import assert_equals
 from nose.tools import assert_raises
+from nose.tools import assert_almost_equals
 
 def test_shortest_path_empty_edges():
     assert_equals(shortest_path([], "A"), {"A":0})
@@ -44,6 +54,70 @@ def test_shortest_path_large():
             ("s", "z", 2), ("t", "z", 8)]
     assert_equals(shortest_path(paths, "a")["z"], 16)
 
+def test_shortest_path_unreachable_cycle():
+    paths = [(1, 2, 1), (3, 4, 1), (4, 3, 1)]
+    expected = {1:0, 2:1, 3:float("inf"), 4:float("inf")}
+    assert_equals(shortest_path(paths, 1), expected)
+
+def test_dijkstra_predecessors():
+    paths = [(1, 2, 5), (2, 3, 4), (2, 4, 2), (4, 5, 4), (3, 5, 1)]
+    distances, predecessors = dijkstra(paths, 1)
+    assert_equals(predecessors, {1:None, 2:1, 3:2, 4:2, 5:3})
+    assert_equals(build_path(predecessors, 5), [1, 2, 3, 5])
+    assert_equals(build_path(predecessors, 1), [1])
+
+def test_dijkstra_target():
+    paths = [(1, 2, 1), (2, 3, 1), (3, 4, 1), (1, 4, 10)]
+    distances, predecessors = dijkstra(paths, 1, 3)
+    assert_equals(distances[3], 2)
+    assert_equals(build_path(predecessors, 3), [1, 2, 3])
+    # Search stopped before 4's distance was final
+    assert_equals(distances[4], 10)
+
+def test_dijkstra_zero_weights():
+    paths = [(1, 2, 0), (2, 3, 0), (1, 3, 1), (3, 4, 2)]
+    assert_equals(shortest_path(paths, 1), {1:0, 2:0, 3:0, 4:2})
+
+def test_dijkstra_large_integer_weights():
+    paths = [(1, 2, 1000), (2, 3, 2 ** 40), (1, 3, 2 ** 40 + 1001)]
+    distances, predecessors = dijkstra(paths, 1)
+    assert_equals(distances, {1:0, 2:1000, 3:2 ** 40 + 1000})
+    assert_equals(build_path(predecessors, 3), [1, 2, 3])
+
+def test_dijkstra_float_weights():
+    paths = [(1, 2, 0.5), (2, 3, 1), (1, 3, 2)]
+    assert_equals(shortest_path(paths, 1), {1:0, 2:0.5, 3:1.5})
+
+def test_dijkstra_integer_weights_match_heap():
+    # Weights up to DIAL_MAX_WEIGHT use Dial's buckets, and larger ones a
+    # radix heap
+    seed(16)
+    for max_weight in (1, DIAL_MAX_WEIGHT, 10 ** 6):
+        for trial in xrange(5):
+            paths = [(randint(0, 40), randint(0, 40), randint(0, max_weight))
+                    for i in xrange(150)]
+            for start in xrange(0, 41, 5):
+                expected = _heap_dijkstra(paths, start)[0]
+                distances, predecessors = dijkstra(paths, start)
+                assert_equals(distances, expected)
+                for vertex in predecessors:
+                    path = build_path(predecessors, vertex)
+                    assert_equals(path[0], start)
+                    assert_equals(path[-1], vertex)
+
+def test_dijkstra_integer_target():
+    seed(16)
+    for max_weight in (DIAL_MAX_WEIGHT, 10 ** 6):
+        paths = [(randint(0, 30), randint(0, 30), randint(0, max_weight))
+                for i in xrange(100)]
+        expected = _heap_dijkstra(paths, 0)[0]
+        for goal in expected:
+            assert_equals(dijkstra(paths, 0, goal)[0][goal], expected[goal])
+
+def test_build_path_unreachable():
+    distances, predecessors = dijkstra([(1, 2, 1)], 2)
+    assert_equals(build_path(predecessors, 1), [])
+
 # Parameters: vertices, edges, start, goal
 def test_a_star_no_vertex_list_no_edges():
     assert_raises(ValueError, a_star, [], [], 3, 2)
@@ -103,3 +177,58 @@ def test_a_star_large():
     assert_equals(_get_dist(vertices[4][1:], vertices[1][1:]), four_one_dist)
     expected = zero_three_dist + three_two_dist + two_four_dist + four_one_dist
     assert_equals(a_star(vertices, paths, 0, 1), expected)
+
+def test_bidirectional_dijkstra_same_vertex():
+    assert_equals(bidirectional_dijkstra([], "A", "A"), 0)
+
+def test_bidirectional_dijkstra_no_path():
+    assert_equals(bidirectional_dijkstra([("A", "B", 2)], "B", "A"),
+            float("inf"))
+    assert_equals(bidirectional_dijkstra([("A", "B", 2)], "A", "C"),
+            float("inf"))
+
+def test_bidirectional_dijkstra_split():
+    paths = [(1, 2, 5), (2, 3, 4), (2, 4, 2), (4, 5, 4), (3, 5, 1)]
+    assert_equals(bidirectional_dijkstra(paths, 1, 5), 10)
+
+def test_bidirectional_dijkstra_random():
+    seed(13)
+    for trial in xrange(10):
+        paths = [(randint(0, 30), randint(0, 30), randint(0, 10))
+                for i in xrange(90)]
+        for start in xrange(0, 31, 3):
+            expected = shortest_path(paths, start)
+            for goal in expected:
+                assert_equals(bidirectional_dijkstra(paths, start, goal),
+                        expected[goal])
+
+def test_bidirectional_a_star_invalid():
+    assert_raises(ValueError, bidirectional_a_star, [], [], 1, 2)
+
+def test_bidirectional_a_star_random():
+    seed(13)
+    for trial in xrange(10):
+        vertices = [(i, uniform(-10, 10), uniform(-10, 10)) for i in xrange(25)]
+        paths = [(randint(0, 24), randint(0, 24)) for i in xrange(70)]
+        for start in xrange(0, 25, 4):
+            for goal in xrange(25):
+                assert_almost_equals(
+                        bidirectional_a_star(vertices, paths, start, goal),
+                        a_star(vertices, paths, start, goal))
+
+def test_a_star_without_numpy():
+    import shortest_path as module
+    seed(15)
+    vertices = [(i, uniform(-10, 10), uniform(-10, 10)) for i in xrange(25)]
+    paths = [(randint(0, 24), randint(0, 24)) for i in xrange(70)]
+    expected = [a_star(vertices, paths, 0, goal) for goal in xrange(25)]
+    saved = module.numpy
+    module.numpy = None
+    try:
+        for goal in xrange(25):
+            assert_equals(a_star(vertices, paths, 0, goal), expected[goal])
+    finally:
+        module.numpy = saved
+
+def test_a_star_edge_not_in_vertices():
+    assert_raises(ValueError, a_star, [(1, 0.0, 0.0)], [(1, 2)], 1, 1)
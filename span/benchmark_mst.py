@@ -0,0 +1,65 @@
+"""Compares the minimum spanning tree algorithms on random graphs.
+
+Prim's and Kruskal's algorithms are compared on dense graphs, and
+Kruskal's and Boruvka's on sparse ones. Boruvka's is timed with 1 worker
+process, with one per CPU, and with the default, which only starts worker
+processes for at least PARALLEL_MIN_EDGES edges.
+
+Run with: python benchmark_mst.py [vertices...]
+"""
+import multiprocessing
+from random import randint
+from random import random
+from random import seed
+import sys
+import timeit
+from mst import Edge
+from mst import get_min_edges_kruskal
+from mst import get_min_edges_prim
+from mst import get_min_edges_boruvka
+from mst import PARALLEL_MIN_EDGES
+
+def complete_graph(vertices):
+    """Returns an Edge for every pair of vertices, with random weights."""
+    return [Edge(v1, v2, random()) for v1 in xrange(vertices)
+            for v2 in xrange(v1 + 1, vertices)]
+
+def sparse_graph(vertices, degree=8):
+    """Returns a random connected graph with about degree edges per vertex."""
+    edges = [Edge(v, v + 1, random()) for v in xrange(vertices - 1)]
+    edges.extend(Edge(randint(0, vertices - 1), randint(0, vertices - 1),
+            random()) for i in xrange(vertices * (degree - 1)))
+    return edges
+
+def best_time(function, repeat=3):
+    """Returns the fastest of repeat runs of function, in seconds."""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 300, 1000]
+    seed(0)
+    print "%8s %10s %10s %10s %10s" % (
+            "vertices", "edges", "kruskal", "prim", "lazy prim")
+    for size in sizes:
+        edges = complete_graph(size)
+        kruskal = best_time(lambda: get_min_edges_kruskal(edges))
+        prim = best_time(lambda: get_min_edges_prim(edges))
+        lazy = best_time(lambda: get_min_edges_prim(edges, lazy=True))
+        print "%8d %10d %9.3fs %9.3fs %9.3fs" % (
+                size, len(edges), kruskal, prim, lazy)
+    cpus = multiprocessing.cpu_count()
+    print
+    print "parallel Boruvka by default from %d edges" % PARALLEL_MIN_EDGES
+    print "%8s %10s %10s %10s %10s %10s" % ("vertices", "edges", "kruskal",
+            "boruvka", "%d cpus" % cpus, "default")
+    for size in sizes:
+        edges = sparse_graph(size * 100)
+        kruskal = best_time(lambda: get_min_edges_kruskal(edges))
+        serial = best_time(lambda: get_min_edges_boruvka(edges, 1))
+        parallel = best_time(lambda: get_min_edges_boruvka(edges, cpus))
+        default = best_time(lambda: get_min_edges_boruvka(edges))
+        print "%8d %10d %9.3fs %9.3fs %9.3fs %9.3fs" % (
+                size * 100, len(edges), kruskal, serial, parallel, default)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import imp
+import os
+
+# The array-backed union-find is shared with the sibling graph directory.
+# It is loaded by path, so sys.path is left alone and import order does
+# not matter.
+UnionFind = imp.load_source("union_find", os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), os.pardir, "graph",
+        "union_find.py")).UnionFind
+
+class DisjointSet(UnionFind):
+    """A UnionFind of named elements.
+
+    Each element is given an integer id in the order it is added. The
+    UnionFind methods (find, union and set_size) all take and return ids,
+    so callers look up an element's id once and then work with ids only.
+
+    Attributes:
+        names: A list of element names, indexed by id.
+        ids: A dictionary of {name: id}.
+    """
+
+    def __init__(self, elements=()):
+        """Creates a new DisjointSet with each element in its own set.
+
+        Args:
+            elements (optional): An iterable of element names, which may be
+                any hashable values. Repeated names are only added once.
+        """
+        UnionFind.__init__(self)
+        self.names = []
+        self.ids = {}
+        for element in elements:
+            self.add(element)
+
+    def __len__(self):
+        """Returns the number of elements."""
+        return len(self.names)
+
+    def __contains__(self, element):
+        return element in self.ids
+
+    def add(self, element):
+        """Adds element in its own set if it is new.
+
+        Returns:
+            The id of element.
+        """
+        if element not in self.ids:
+            self.ids[element] = UnionFind.add(self)
+            self.names.append(element)
+        return self.ids[element]
+
+    def id_of(self, element):
+        """Returns the id of element.
+
+        Raises:
+            ValueError: element is not in the DisjointSet.
+        """
+        if element not in self.ids:
+            raise ValueError("Element is not in the DisjointSet")
+        return self.ids[element]
@@ -0,0 +1,167 @@
+import imp
+import os
+from math import sqrt
+from operator import attrgetter
+from disjoint_set import DisjointSet
+from mst import Edge
+
+# KDTree lives in the sibling trees directory; load it by path, as
+# disjoint_set does for UnionFind, so that sys.path is left alone
+KDTree = imp.load_source("kd_tree", os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), os.pardir, "trees",
+        "kd_tree.py")).KDTree
+
+def get_min_edges_euclidean(points):
+    """Returns the edges of a minimum spanning tree of a set of points.
+
+    The weight of the edge between two points is the straight line distance
+        between them, and every pair of points may be connected, but the
+        complete graph is never built. Instead, Boruvka's algorithm is used:
+        in each round, every component finds its shortest edge to another
+        component with nearest neighbor searches in a KDTree of the points,
+        and all of those edges are added at once. Each round at least halves
+        the number of components, so memory is O(n) and time is close to
+        O(n log n) for evenly spread points.
+
+    Args:
+        points: A list of points, each a list or tuple of k numbers, where
+            k is at least 2. Points may be repeated.
+
+    Returns:
+        A list of Edge namedtuples connecting all points with the minimum
+            sum of weights, in order of ascending weight. vertex1 and
+            vertex2 are the indices of points in points, and value is the
+            distance between them, which is 0 for repeated points.
+
+    Raises:
+        IndexError: points contains points of different lengths.
+
+        ValueError: Points have fewer than 2 dimensions.
+    """
+    if not points:
+        return []
+    mst_edges = []
+    # Repeated points are joined by zero length edges, and only the first
+    # index of each is kept for the search
+    first_index = {}
+    for i, point in enumerate(points):
+        point = tuple(point)
+        if point in first_index:
+            mst_edges.append(Edge(first_index[point], i, 0.0))
+        else:
+            first_index[point] = i
+    distinct = sorted(first_index, key=first_index.get)
+    if len(distinct) == 1:
+        return mst_edges
+    # KDTree sorts the list it is given, so give it a copy
+    nodes = _flatten(KDTree(list(distinct)))
+    values, dimensions, lefts, rights = nodes
+    # Components are numbered by the position of a point in distinct
+    position = {point:i for i, point in enumerate(distinct)}
+    node_points = [position[value] for value in values]
+    components = DisjointSet(xrange(len(distinct)))
+    # The nearest point in another component to each point, as (squared
+    # distance, position), from the last round in which it was searched
+    nearest = [None] * len(distinct)
+    while components.count > 1:
+        component = [components.find(i) for i in xrange(len(distinct))]
+        # The component of the point at each node, and of every point in
+        # its subtree, or -1 if the subtree spans more than one component
+        point_labels = [component[i] for i in node_points]
+        labels = list(point_labels)
+        for node in xrange(len(values)):
+            for child in (lefts[node], rights[node]):
+                if child != -1 and labels[child] != labels[node]:
+                    labels[node] = -1
+        # Shortest edge leaving each component, as (squared length, i, j)
+        best = {}
+        for i, point in enumerate(distinct):
+            own = component[i]
+            # Components only grow, so if last round's nearest point is
+            # still in another component, it is still the nearest one
+            if nearest[i] is None or component[nearest[i][1]] == own:
+                bound = best.get(own, (float("inf"),))[0]
+                found = _nearest_outside(
+                        nodes, point, own, labels, point_labels, bound)
+                if found is not None:
+                    found = (found[0], node_points[found[1]])
+                nearest[i] = found
+            if nearest[i] is not None:
+                distance, j = nearest[i]
+                candidate = (distance, min(i, j), max(i, j))
+                if candidate < best.get(own, (float("inf"),)):
+                    best[own] = candidate
+        for distance, i, j in best.itervalues():
+            # Equal length edges may close a cycle; skip the extra ones
+            if components.union(i, j):
+                mst_edges.append(Edge(first_index[distinct[i]],
+                        first_index[distinct[j]], sqrt(distance)))
+    mst_edges.sort(key=attrgetter('value'))
+    return mst_edges
+
+def _flatten(tree):
+    """Copies the nodes of a KDTree into lists, children before parents.
+
+    Returns:
+        A tuple of (values, dimensions, lefts, rights) lists, indexed by
+            node number, where lefts and rights hold the numbers of the
+            children of each node, or -1 for no child.
+    """
+    order = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(child for child in (node.left, node.right)
+                if child is not None)
+    order.reverse()
+    number = {id(node):i for i, node in enumerate(order)}
+    return ([node.value for node in order],
+            [node.dimension - 1 for node in order],
+            [number[id(node.left)] if node.left else -1 for node in order],
+            [number[id(node.right)] if node.right else -1 for node in order])
+
+def _nearest_outside(nodes, target, component, labels, point_labels, bound):
+    """Finds the nearest point to target that is not in component.
+
+    Like KDTree.find_closest, but skips every point in component, and every
+    subtree whose points are all in component, according to point_labels
+    and labels (as built by get_min_edges_euclidean). Points at least
+    sqrt(bound) away are also skipped.
+
+    Args:
+        nodes: The KDTree of the points, as returned by _flatten.
+
+    Returns:
+        A tuple of (squared distance, node), or None if no point is closer
+            than the bound.
+    """
+    values, dimensions, lefts, rights = nodes
+    best = None
+    # Entries are (node, squared distance from target to the node's region)
+    stack = [(len(values) - 1, 0.0)]
+    while stack:
+        node, region_distance = stack.pop()
+        if region_distance >= bound:
+            continue
+        value = values[node]
+        if point_labels[node] != component:
+            distance = 0
+            for a, b in zip(target, value):
+                distance += (a - b) * (a - b)
+            if distance < bound:
+                bound = distance
+                best = (distance, node)
+        d = dimensions[node]
+        offset = target[d] - value[d]
+        if offset <= 0:
+            near, far = lefts[node], rights[node]
+        else:
+            near, far = rights[node], lefts[node]
+        # Search the near side last, so that it is popped first and the far
+        # side is more often pruned
+        if far != -1 and labels[far] != component:
+            stack.append((far, max(region_distance, offset * offset)))
+        if near != -1 and labels[near] != component:
+            stack.append((near, region_distance))
+    return best
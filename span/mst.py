@@ -1,12 +1,25 @@
+from array import array
 from collections import namedtuple
-from collections import defaultdict
-from collections import deque
+from itertools import count
+import heapq
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
 from operator import attrgetter
+from disjoint_set import DisjointSet
 
 # Namedtuple format: Edge, vertices, weight
 # Points aren't start and end because they're undirected
 Edge = namedtuple('Edge', ('vertex1', 'vertex2', 'value'))
 
+# Edge and label arrays shared with each worker process by
+# _init_boruvka_worker
+_shared_edges = None
+
+# Fewest edges for which get_min_edges_boruvka starts worker processes by
+# default; below this, starting the pool (about 0.1s) costs more than the
+# parallel search saves
+PARALLEL_MIN_EDGES = 100000
+
 class SpanningTree(object):
     """A representation of a spanning tree."""
     # Share known vertices and total weight among all of the nodes
@@ -72,114 +85,651 @@ def build_mst(edges):
         root.add_child(edge)
     return root
 
-def _is_connected(edges):
-    # Avoid IndexError when choosing a vertex to start from
-    if len(edges) == 0:
-        return True
-    connections = defaultdict(list)
-    for edge in edges:
-        start, end = edge.vertex1, edge.vertex2
-        connections[start].append(end)
-        connections[end].append(start)
-    seen = set()
-    # Arbitrary start vertex
-    seen.add(edges[0].vertex1)
-    queue = deque([edges[0].vertex1])
-    while queue:
-        current = queue.popleft()
-        queue.extend(x for x in connections[current] if x not in seen)
-        seen.update(connections[current])
-    return len(seen) == len(connections)
-    
-def get_min_edges_kruskal(edges):
+def build_compact_mst(edges):
+    """Builds an array-backed Minimum Spanning Tree using the provided edges.
+
+    An alternative to build_mst for large trees, or for answering many path
+    and subtree queries; see CompactSpanningTree.
+
+    Args:
+        edges: A list of edges with the minimum sum of weights to connect
+            all vertices, as for build_mst. The edges of a minimum spanning
+            forest may also be used.
+
+    Returns:
+        A CompactSpanningTree of the edges, or None if edges is empty.
+
+    Raises:
+        ValueError: The edges contain a cycle.
+    """
+    if not edges:
+        return None
+    return CompactSpanningTree(edges)
+
+class CompactSpanningTree(object):
+    """An array-backed representation of a spanning tree or forest.
+
+    Vertices are numbered from 0 in the order they are reached from the root
+    of each tree, and the tree is kept as arrays indexed by vertex number,
+    without a node object per vertex. Binary lifting tables, which hold the
+    2**k-th ancestor of each vertex and the heaviest edge on the way there,
+    answer maximum-edge-on-path queries in O(log n) time.
+
+    Attributes:
+        names: A list of vertex names, indexed by vertex number.
+        index: A dictionary of {name: vertex number}.
+        parent: An array of the parent of each vertex, or -1 for a root.
+        parent_weight: An array of the weight of the edge between each vertex
+            and its parent, or 0 for a root.
+        depth: An array of the number of edges from each vertex to its root.
+        root: An array of the root of each vertex's tree.
+        euler: An array of the vertices visited by a depth first walk of
+            each tree in turn, listing a vertex on entering it and again
+            after returning from each of its children.
+        first, last: Arrays of the first and last position of each vertex
+            in euler. The subtree of a vertex is exactly the vertices whose
+            first position is between its own first and last positions.
+    """
+
+    def __init__(self, edges):
+        """Creates a new CompactSpanningTree.
+
+        Args:
+            edges: A list of Edge namedtuples that form a tree or forest.
+                The first vertex of the first edge is the root of its tree,
+                and the first vertex of any other tree in edges is its root.
+
+        Raises:
+            ValueError: The edges contain a cycle.
+        """
+        # Vertex ids in order of appearance, and each vertex's tree edges
+        components = DisjointSet()
+        neighbors = []
+        for edge in edges:
+            v1 = components.add(edge.vertex1)
+            v2 = components.add(edge.vertex2)
+            while len(neighbors) < len(components):
+                neighbors.append([])
+            if not components.union(v1, v2):
+                raise ValueError("Edges must not contain a cycle")
+            neighbors[v1].append((v2, edge.value))
+            neighbors[v2].append((v1, edge.value))
+        names = components.names
+        count = len(names)
+        self.names = []
+        self.index = {}
+        self.parent = array('l', [-1] * count)
+        self.parent_weight = array('d', [0.0] * count)
+        self.depth = array('l', [0] * count)
+        self.root = array('l', [0] * count)
+        self.euler = array('l')
+        self.first = array('l', [0] * count)
+        self.last = array('l', [0] * count)
+        # Vertex number of each vertex id, once reached
+        numbers = array('l', [-1] * count)
+        for start in xrange(count):
+            if numbers[start] != -1:
+                continue
+            numbers[start] = self._add_vertex(names[start], -1, 0.0)
+            # Entries are (vertex id, position of its next neighbor)
+            stack = [(start, 0)]
+            while stack:
+                vertex_id, position = stack.pop()
+                vertex = numbers[vertex_id]
+                if position < len(neighbors[vertex_id]):
+                    stack.append((vertex_id, position + 1))
+                    child_id, weight = neighbors[vertex_id][position]
+                    # Without cycles, the only neighbor already reached is
+                    # the parent
+                    if numbers[child_id] == -1:
+                        numbers[child_id] = self._add_vertex(
+                                names[child_id], vertex, weight)
+                        stack.append((child_id, 0))
+                else:
+                    self.last[vertex] = len(self.euler) - 1
+                    if self.parent[vertex] != -1:
+                        # Back in the parent after leaving vertex
+                        self.euler.append(self.parent[vertex])
+        self._build_lifting()
+
+    def _add_vertex(self, name, parent, weight):
+        """Numbers a newly reached vertex and enters it in the Euler tour.
+
+        Returns:
+            The number of the new vertex.
+        """
+        vertex = len(self.names)
+        self.index[name] = vertex
+        self.names.append(name)
+        self.parent[vertex] = parent
+        self.parent_weight[vertex] = weight
+        if parent == -1:
+            self.root[vertex] = vertex
+        else:
+            self.depth[vertex] = self.depth[parent] + 1
+            self.root[vertex] = self.root[parent]
+        self.first[vertex] = len(self.euler)
+        self.euler.append(vertex)
+        return vertex
+
+    def _build_lifting(self):
+        """Builds the binary lifting tables from parent and parent_weight."""
+        count = len(self.names)
+        # A root is its own ancestor, through an edge lighter than any other
+        self._up = [array('l', [vertex if parent == -1 else parent
+                for vertex, parent in enumerate(self.parent)])]
+        self._heaviest = [array('d', [
+                float("-inf") if parent == -1 else weight
+                for parent, weight in zip(self.parent, self.parent_weight)])]
+        levels = max(self.depth or [0]).bit_length()
+        for level in xrange(1, levels):
+            up, heaviest = self._up[-1], self._heaviest[-1]
+            self._up.append(array('l', [up[up[v]] for v in xrange(count)]))
+            self._heaviest.append(array('d', [max(heaviest[v],
+                    heaviest[up[v]]) for v in xrange(count)]))
+
+    def __len__(self):
+        """Returns the number of vertices."""
+        return len(self.names)
+
+    def _number(self, name):
+        """Returns the number of the vertex name.
+
+        Raises:
+            ValueError: name is not in the tree.
+        """
+        if name not in self.index:
+            raise ValueError("Vertex is not in the tree")
+        return self.index[name]
+
+    def _lift(self, vertex, steps):
+        """Returns the ancestor steps edges above vertex.
+
+        Returns:
+            A tuple of (ancestor, heaviest), where heaviest is the largest
+                weight of the edges between vertex and ancestor.
+        """
+        heaviest = float("-inf")
+        level = 0
+        while steps:
+            if steps & 1:
+                heaviest = max(heaviest, self._heaviest[level][vertex])
+                vertex = self._up[level][vertex]
+            steps >>= 1
+            level += 1
+        return vertex, heaviest
+
+    def _common_ancestor(self, v1, v2):
+        """Returns the lowest common ancestor of two vertices in one tree.
+
+        Returns:
+            A tuple of (ancestor, heaviest), where heaviest is the largest
+                weight of the edges on the path between v1 and v2.
+        """
+        depth = self.depth
+        if depth[v1] < depth[v2]:
+            v1, v2 = v2, v1
+        v1, heaviest = self._lift(v1, depth[v1] - depth[v2])
+        if v1 == v2:
+            return v1, heaviest
+        for level in xrange(len(self._up) - 1, -1, -1):
+            up = self._up[level]
+            if up[v1] != up[v2]:
+                heaviest = max(heaviest, self._heaviest[level][v1],
+                        self._heaviest[level][v2])
+                v1, v2 = up[v1], up[v2]
+        heaviest = max(heaviest, self.parent_weight[v1],
+                self.parent_weight[v2])
+        return self.parent[v1], heaviest
+
+    def common_ancestor(self, v1, v2):
+        """Returns the name of the lowest common ancestor of v1 and v2.
+
+        Raises:
+            ValueError: v1 or v2 is not in the tree, or they are in
+                different trees of a forest.
+        """
+        v1, v2 = self._number(v1), self._number(v2)
+        if self.root[v1] != self.root[v2]:
+            raise ValueError("Vertices must be in the same tree")
+        return self.names[self._common_ancestor(v1, v2)[0]]
+
+    def max_edge(self, v1, v2):
+        """Returns the weight of the heaviest edge on the path from v1 to v2.
+
+        Takes O(log n) time for a tree of n vertices.
+
+        Returns:
+            The largest edge weight on the path, as a float, or None if v1
+                and v2 are the same vertex.
+
+        Raises:
+            ValueError: v1 or v2 is not in the tree, or they are in
+                different trees of a forest.
+        """
+        v1, v2 = self._number(v1), self._number(v2)
+        if self.root[v1] != self.root[v2]:
+            raise ValueError("Vertices must be in the same tree")
+        if v1 == v2:
+            return None
+        return self._common_ancestor(v1, v2)[1]
+
+    def subtree(self, name):
+        """Returns the names of the vertices in the subtree of name.
+
+        The vertices are in the order they were reached, starting with name.
+
+        Raises:
+            ValueError: name is not in the tree.
+        """
+        vertex = self._number(name)
+        euler, first = self.euler, self.first
+        # Each vertex in the subtree is entered once within its tour
+        return [self.names[euler[i]]
+                for i in xrange(first[vertex], self.last[vertex] + 1)
+                if first[euler[i]] == i]
+
+def get_min_edges_kruskal(edges, forest=False):
     """Returns a list of edges to connect all vertices with a minimum sum of
     weights.
 
-    Uses Kruskal's algorithm.
+    Uses Kruskal's algorithm, with a DisjointSet to track which vertices are
+    already connected, in O(E log E) time.
 
     Args:
         edges: A list of Edge namedtuples of points and weights.
-            All Edges must be part of one connected component.
+            Unless forest is True, all Edges must be part of one connected
+            component.
+
+        forest (optional): If True, finds a minimum spanning tree for each
+            connected component instead of raising an error when there is
+            more than one. Defaults to False.
 
     Returns:
         A list of edges connecting all vertices with the minimum sum of weights,
             in order of ascending weight.
+        If forest is True, a list of (edges, weight) tuples instead, one for
+            each connected component in order of its first vertex in edges,
+            where edges is as above for that component and weight is their
+            sum.
 
     Raises:
-        ValueError: At least one edge is disconnected (unreachable) from other
-            edges.
+        ValueError: forest is False, and at least one edge is disconnected
+            (unreachable) from other edges.
     """
-    if not _is_connected(edges):
-        raise ValueError("Graph must be a single connected component")
-    edges.sort(key=attrgetter('value'))
-    # We are only building a subset of the graph, so don't add any edges yet
-    forest = defaultdict(set)
-    mst_edges = []
+    # Every vertex starts in its own set, and each chosen edge merges two
+    components = DisjointSet()
     for edge in edges:
-        v1, v2 = edge.vertex1, edge.vertex2
-        # Can check these in either order, we will add both
-        if v1 in forest[v2]:
-            # Disregard edge, points already connected
-            continue
-        # Merge connections of both vertices
-        forest[v1].add(v2)
-        forest[v2].add(v1)
-        for endpoint in (v1, v2):
-            for vertex in forest[endpoint]:
-                forest[vertex].update(forest[endpoint])
-        mst_edges.append(edge)
-    return mst_edges
+        components.add(edge.vertex1)
+        components.add(edge.vertex2)
+    ids = components.ids
+    mst_edges = []
+    for edge in sorted(edges, key=attrgetter('value')):
+        if components.count <= 1:
+            # Every vertex is connected
+            break
+        # Disregard edge if its points are already connected
+        if components.union(ids[edge.vertex1], ids[edge.vertex2]):
+            mst_edges.append(edge)
+    if not forest:
+        if components.count > 1:
+            raise ValueError("Graph must be a single connected component")
+        return mst_edges
+    return _with_weights(_split_trees(components, mst_edges))
 
-def get_min_edges_prim(edges):
+def get_min_edges_prim(edges, lazy=False, forest=False):
     """Returns a list of edges to connect all vertices with a minimum sum of
     weights.
 
-    Uses Prim's algorithm.
+    Uses Prim's algorithm, growing the tree from the first vertex of the
+    first edge, with a heap of the edges that leave the tree. Each edge is
+    pushed onto the heap at most twice, so this takes O(E log V) time.
+    Once no edge leaves the tree, a new one is started from the next vertex
+    that is not in a tree yet.
 
     Args:
         edges: A list of Edge namedtuples of points and weights.
-            All Edges must be part of one connected component.
+            Unless forest is True, all Edges must be part of one connected
+            component.
+
+        lazy (optional): If True, every edge that leaves the tree is pushed
+            onto a binary heap, and edges whose vertices have both joined
+            the tree are skipped when popped. Otherwise (the default), the
+            heap holds one entry per vertex outside the tree, keyed by its
+            lightest edge to the tree, which is decreased as the tree
+            grows. This keeps the heap smaller but does more work per edge.
+
+        forest (optional): If True, finds a minimum spanning tree for each
+            connected component instead of raising an error when there is
+            more than one. Defaults to False.
 
     Returns:
         A list of edges connecting all vertices with the minimum sum of weights,
-            in arbitrary order, or an empty list if edges is empty.
+            in the order they were added to the tree, or an empty list if
+            edges is empty.
+        If forest is True, a list of (edges, weight) tuples instead, as
+            returned by get_min_edges_kruskal.
 
     Raises:
-        ValueError: At least one edge is disconnected (unreachable) from other
-            edges.
+        ValueError: forest is False, and at least one edge is disconnected
+            (unreachable) from other edges.
     """
-    if not _is_connected(edges):
+    graph = _adjacency_lists(edges)
+    if lazy:
+        trees = _prim_lazy(graph)
+    else:
+        trees = _prim_indexed(graph)
+    if forest:
+        return _with_weights(trees)
+    if len(trees) > 1:
         raise ValueError("Graph must be a single connected component")
-    if not edges: # Avoid index error when indexing first edge
-        return []
-    # Map of vertices to list of edges that involve them
-    graph = defaultdict(list)
+    return trees[0] if trees else []
+
+def get_min_edges_boruvka(edges, workers=None, forest=False):
+    """Returns a list of edges to connect all vertices with a minimum sum of
+    weights.
+
+    Uses Boruvka's algorithm. In each round, every component finds its
+    lightest edge to another component, and all of those edges are added
+    at once, which at least halves the number of components. The edges are
+    copied once into arrays in shared memory, and each round's search is
+    split among worker processes by ranges of edges. Between rounds, each
+    vertex is relabeled with its component, so that the workers only need
+    to compare the labels of an edge's vertices.
+
+    Ties are broken by position in edges, so the result is the same as that
+    of get_min_edges_kruskal.
+
+    Args:
+        edges: A list of Edge namedtuples of points and weights, as for
+            get_min_edges_kruskal. The list is not changed.
+
+        workers (optional): The number of worker processes to use. Defaults
+            to the number of CPUs, or to 1 if there are fewer than
+            PARALLEL_MIN_EDGES edges. If 1, the search runs in this process.
+
+        forest (optional): If True, finds a minimum spanning tree for each
+            connected component instead of raising an error when there is
+            more than one. Defaults to False.
+
+    Returns:
+        The same list (or list of (edges, weight) tuples, if forest is True)
+            as get_min_edges_kruskal.
+
+    Raises:
+        ValueError: workers is less than 1, or forest is False and at least
+            one edge is disconnected (unreachable) from other edges.
+    """
+    global _shared_edges
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+        if len(edges) < PARALLEL_MIN_EDGES:
+            workers = 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    components = DisjointSet()
+    firsts = array('l')
+    seconds = array('l')
+    values = array('d')
     for edge in edges:
-        # Add edges instead of points because we need to be able to look up the
-        # edges when we add them to grow the components
-        graph[edge.vertex1].append(edge)
-        graph[edge.vertex2].append(edge)
-    # Vertices included so far
-    forest = set()
-    mst_edges = []
-    # Pick arbitrary vertex to start from
-    forest.add(edges[0].vertex1)
-    while len(forest) < len(graph):
-        # Get all edges that connect to points in the component
-        best_edge = None
-        for vertex in forest:
-            for edge in graph[vertex]:
-                # We don't know which end of the edge is connected in
-                # forest, but one of them must be.
-                # If both are connected, discard it.
-                if edge.vertex1 in forest and edge.vertex2 in forest:
-                    continue
-                # Edge connects a new vertex to the forest; keep it
-                if (not best_edge) or (edge.value < best_edge.value):
-                    best_edge = edge
-        # Shortest edge that connects the forest to a new element; keep it
-        mst_edges.append(best_edge)
-        # One of these vertices is already in forest, but add both
-        # to the set to ensure the new one is added
-        forest.update(best_edge.vertex1, best_edge.vertex2)
+        firsts.append(components.add(edge.vertex1))
+        seconds.append(components.add(edge.vertex2))
+        values.append(edge.value)
+    labels = array('l', xrange(components.size()))
+    # Several ranges per worker even out the work of uneven ranges
+    size = max(1, -(-len(edges) // (workers * 4)))
+    ranges = [(start, min(start + size, len(edges)))
+            for start in xrange(0, len(edges), size)]
+    arrays = (firsts, seconds, values, labels)
+    pool = None
+    if workers == 1 or len(ranges) < 2:
+        _init_boruvka_worker(*arrays)
+        search = lambda: map(_lightest_edges, ranges)
+    else:
+        shared = [RawArray(data.typecode, data) for data in arrays]
+        # Labels are rewritten in place, so the workers see each round's
+        labels = shared[-1]
+        pool = multiprocessing.Pool(
+                min(workers, len(ranges)), _init_boruvka_worker, shared)
+        search = lambda: pool.map(_lightest_edges, ranges)
+    chosen = []
+    try:
+        while components.count > 1:
+            # Lightest edge leaving each component, as (weight, position)
+            best = {}
+            for lightest in search():
+                for component, candidate in lightest.iteritems():
+                    if component not in best or candidate < best[component]:
+                        best[component] = candidate
+            if not best:
+                # Every remaining component is disconnected from the others
+                break
+            for value, index in best.itervalues():
+                # Two components may choose the same edge
+                if components.union(firsts[index], seconds[index]):
+                    chosen.append(index)
+            for vertex in xrange(len(labels)):
+                labels[vertex] = components.find(vertex)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        # Don't keep the edge arrays alive after the call
+        _shared_edges = None
+    # Kruskal's order: by weight, then by position in edges
+    chosen.sort(key=lambda index: (edges[index].value, index))
+    mst_edges = [edges[index] for index in chosen]
+    if forest:
+        return _with_weights(_split_trees(components, mst_edges))
+    if components.count > 1:
+        raise ValueError("Graph must be a single connected component")
     return mst_edges
+
+def _init_boruvka_worker(firsts, seconds, values, labels):
+    """Stores the edge and label arrays for _lightest_edges."""
+    global _shared_edges
+    _shared_edges = (firsts, seconds, values, labels)
+
+def _lightest_edges(edge_range):
+    """Finds the lightest edge leaving each component in a range of edges.
+
+    Args:
+        edge_range: A (start, end) tuple of the positions of the edges to
+            search, excluding end.
+
+    Returns:
+        A dictionary of {component: (weight, position)} for each component
+            with an edge to another component in the range, where ties are
+            broken by the lower position.
+    """
+    firsts, seconds, values, labels = _shared_edges
+    best = {}
+    for index in xrange(*edge_range):
+        first = labels[firsts[index]]
+        second = labels[seconds[index]]
+        if first == second:
+            continue
+        candidate = (values[index], index)
+        if first not in best or candidate < best[first]:
+            best[first] = candidate
+        if second not in best or candidate < best[second]:
+            best[second] = candidate
+    return best
+
+def _split_trees(components, mst_edges):
+    """Splits the edges of a minimum spanning forest by component.
+
+    Args:
+        components: The DisjointSet of the vertices, with one set for each
+            tree.
+        mst_edges: The edges of all of the trees.
+
+    Returns:
+        A list of the edges in each tree, in order of the tree's first
+            vertex in components, keeping the order of mst_edges.
+    """
+    numbers = {}
+    for vertex in xrange(components.size()):
+        numbers.setdefault(components.find(vertex), len(numbers))
+    trees = [[] for i in xrange(len(numbers))]
+    for edge in mst_edges:
+        root = components.find(components.ids[edge.vertex1])
+        trees[numbers[root]].append(edge)
+    return trees
+
+def _with_weights(trees):
+    """Pairs each list of edges in trees with the sum of their weights."""
+    return [(tree, sum(edge.value for edge in tree)) for tree in trees]
+
+def _adjacency_lists(edges):
+    """Returns the edges of each vertex, numbering vertices from 0.
+
+    The first vertex of the first edge is numbered 0.
+
+    Returns:
+        A list, indexed by vertex number, of lists of (neighbor, edge)
+            tuples, where neighbor is the number of the edge's other vertex.
+    """
+    ids = {}
+    graph = []
+    for edge in edges:
+        for vertex in edge[:2]:
+            if vertex not in ids:
+                ids[vertex] = len(graph)
+                graph.append([])
+        v1, v2 = ids[edge.vertex1], ids[edge.vertex2]
+        graph[v1].append((v2, edge))
+        graph[v2].append((v1, edge))
+    return graph
+
+def _prim_lazy(graph):
+    """Runs Prim's algorithm with a heap of edges.
+
+    Returns:
+        A list of the edges of the tree of each component, in order of the
+            lowest vertex number in the component.
+    """
+    in_tree = bytearray(len(graph))
+    trees = []
+    # Entries are (weight, order, vertex, edge); order breaks ties in the
+    # order edges were found, so that edges are never compared
+    queue = []
+    order = count()
+    for start in xrange(len(graph)):
+        if in_tree[start]:
+            continue
+        mst_edges = []
+        vertex = start
+        while True:
+            in_tree[vertex] = 1
+            for neighbor, edge in graph[vertex]:
+                if not in_tree[neighbor]:
+                    heapq.heappush(queue,
+                            (edge.value, next(order), neighbor, edge))
+            # Discard edges whose vertices both joined the tree since being
+            # found
+            while queue and in_tree[queue[0][2]]:
+                heapq.heappop(queue)
+            if not queue:
+                break
+            value, order_found, vertex, edge = heapq.heappop(queue)
+            mst_edges.append(edge)
+        trees.append(mst_edges)
+    return trees
+
+def _prim_indexed(graph):
+    """Runs Prim's algorithm with an addressable heap.
+
+    Returns:
+        A list of the edges of each tree, as returned by _prim_lazy.
+    """
+    in_tree = bytearray(len(graph))
+    # Lightest known edge from each vertex to the tree
+    best_edges = [None] * len(graph)
+    queue = _IndexedHeap(len(graph))
+    trees = []
+    for start in xrange(len(graph)):
+        if in_tree[start]:
+            continue
+        mst_edges = []
+        vertex = start
+        while True:
+            in_tree[vertex] = 1
+            for neighbor, edge in graph[vertex]:
+                if in_tree[neighbor]:
+                    continue
+                best = best_edges[neighbor]
+                if best is None or edge.value < best.value:
+                    best_edges[neighbor] = edge
+                    queue.push(neighbor, edge.value)
+            if not queue:
+                break
+            vertex = queue.pop()
+            mst_edges.append(best_edges[vertex])
+        trees.append(mst_edges)
+    return trees
+
+class _IndexedHeap(object):
+    """A binary min-heap of ids from 0 to size - 1 with decreasable keys."""
+
+    def __init__(self, size):
+        self.heap = []
+        self.keys = [None] * size
+        # Index of each id in heap, or -1 if it is not in the heap
+        self.position = array('l', [-1] * size)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item, key):
+        """Adds item with key, or lowers its key if it is already present."""
+        if self.position[item] == -1:
+            self.position[item] = len(self.heap)
+            self.heap.append(item)
+        elif key >= self.keys[item]:
+            return
+        self.keys[item] = key
+        self._sift_up(self.position[item])
+
+    def pop(self):
+        """Removes and returns the item with the smallest key."""
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return top
+
+    def _sift_up(self, index):
+        heap, keys, position = self.heap, self.keys, self.position
+        item = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if keys[heap[parent]] <= keys[item]:
+                break
+            heap[index] = heap[parent]
+            position[heap[index]] = index
+            index = parent
+        heap[index] = item
+        position[item] = index
+
+    def _sift_down(self, index):
+        heap, keys, position = self.heap, self.keys, self.position
+        item = heap[index]
+        size = len(heap)
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if keys[item] <= keys[heap[child]]:
+                break
+            heap[index] = heap[child]
+            position[heap[index]] = index
+            index = child
+        heap[index] = item
+        position[item] = index
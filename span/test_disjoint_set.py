@@ -0,0 +1,32 @@
+from disjoint_set import DisjointSet
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+def test_disjoint_set_new():
+    d = DisjointSet(["a", "b", "a"])
+    assert_equals(len(d), 2)
+    assert_equals(d.names, ["a", "b"])
+    assert_equals(d.count, 2)
+    assert "a" in d
+    assert "c" not in d
+
+def test_disjoint_set_add():
+    d = DisjointSet()
+    assert_equals(d.add("x"), 0)
+    assert_equals(d.add("y"), 1)
+    assert_equals(d.add("x"), 0)
+    assert_equals(d.size(), 2)
+
+def test_disjoint_set_missing_element():
+    d = DisjointSet([1])
+    assert_raises(ValueError, d.id_of, 2)
+
+def test_disjoint_set_union():
+    d = DisjointSet("abcd")
+    assert d.union(d.id_of("a"), d.id_of("b"))
+    assert not d.union(d.id_of("b"), d.id_of("a"))
+    assert d.union(d.id_of("c"), d.id_of("b"))
+    assert_equals(d.count, 2)
+    assert_equals(d.find(d.id_of("a")), d.find(d.id_of("c")))
+    assert_equals(d.set_size(d.id_of("c")), 3)
+    assert_equals(d.set_size(d.id_of("d")), 1)
@@ -0,0 +1,66 @@
+from random import randint
+from random import seed
+from random import uniform
+from math import sqrt
+from euclidean_mst import get_min_edges_euclidean
+from mst import Edge
+from mst import get_min_edges_kruskal
+from disjoint_set import DisjointSet
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_almost_equals
+
+def _complete_graph(points):
+    """Returns an Edge between every pair of points, by index."""
+    return [Edge(i, j, sqrt(sum((a - b) ** 2
+            for a, b in zip(points[i], points[j]))))
+            for i in xrange(len(points)) for j in xrange(i + 1, len(points))]
+
+def _assert_spanning_tree(points, edges):
+    assert_equals(len(edges), len(points) - 1)
+    components = DisjointSet(xrange(len(points)))
+    for edge in edges:
+        assert components.union(edge.vertex1, edge.vertex2)
+
+def test_get_min_edges_euclidean_empty():
+    assert_equals(get_min_edges_euclidean([]), [])
+
+def test_get_min_edges_euclidean_single():
+    assert_equals(get_min_edges_euclidean([(1, 2)]), [])
+
+def test_get_min_edges_euclidean_one_dimension():
+    assert_raises(ValueError, get_min_edges_euclidean, [(1,), (2,)])
+
+def test_get_min_edges_euclidean_uneven_dimensions():
+    assert_raises(IndexError, get_min_edges_euclidean, [(1, 2), (2, 3, 4)])
+
+def test_get_min_edges_euclidean_line():
+    points = [(0, 0), (3, 0), (1, 0), (10, 0)]
+    assert_equals(get_min_edges_euclidean(points),
+            [Edge(0, 2, 1.0), Edge(1, 2, 2.0), Edge(1, 3, 7.0)])
+
+def test_get_min_edges_euclidean_duplicates():
+    points = [(1, 1), (4, 5), (1, 1), (1, 1), (4, 5)]
+    edges = get_min_edges_euclidean(points)
+    _assert_spanning_tree(points, edges)
+    assert_equals(sorted(edge.value for edge in edges), [0, 0, 0, 5])
+
+def test_get_min_edges_euclidean_random():
+    seed(21)
+    for trial in xrange(20):
+        size = randint(2, 60)
+        dimensions = randint(2, 3)
+        if trial % 2:
+            # Small integer coordinates give repeated points and ties
+            points = [[randint(0, 5) for d in xrange(dimensions)]
+                    for i in xrange(size)]
+        else:
+            points = [[uniform(-10, 10) for d in xrange(dimensions)]
+                    for i in xrange(size)]
+        edges = get_min_edges_euclidean(points)
+        _assert_spanning_tree(points, edges)
+        expected = get_min_edges_kruskal(_complete_graph(points))
+        assert_almost_equals(sum(edge.value for edge in edges),
+                sum(edge.value for edge in expected))
+        assert_equals([edge.value for edge in edges],
+                sorted(edge.value for edge in edges))
@@ -1,6 +1,12 @@
+import mst
 from mst import get_min_edges_kruskal
 from mst import get_min_edges_prim
+from mst import get_min_edges_boruvka
+from mst import build_compact_mst
+from mst import CompactSpanningTree
 from collections import namedtuple
+from random import randint
+from random import seed
 from nose.tools import assert_equals
 from nose.tools import assert_raises
 
@@ -20,6 +26,12 @@ def test_get_min_edges_kruskal_disconnected_components():
     b = Edge('c', 'd', 2)
     assert_raises(ValueError, get_min_edges_kruskal, [a, b])
 
+def test_get_min_edges_kruskal_error_keeps_input():
+    edges = [Edge('a', 'b', 3), Edge('c', 'd', 1), Edge('b', 'e', 2)]
+    original = list(edges)
+    assert_raises(ValueError, get_min_edges_kruskal, edges)
+    assert_equals(edges, original)
+
 def test_get_min_edges_kruskal_best_of_two_comes_first():
     a = Edge('a', 'b', 2)
     b = Edge('a', 'b', 3)
@@ -41,6 +53,11 @@ def test_get_min_edges_kruskal_three_point_cycle():
     c = Edge('c', 'a', 4)
     assert_equals(get_min_edges_kruskal([a, b, c]), [b, a])
 
+def test_get_min_edges_kruskal_self_loop():
+    a = Edge('a', 'a', 1)
+    b = Edge('a', 'b', 3)
+    assert_equals(get_min_edges_kruskal([a, b]), [b])
+
 def test_get_min_edges_kruskal_large():
     ad = Edge('a', 'd', 5)
     ab = Edge('a', 'b', 7)
@@ -108,3 +125,205 @@ def test_get_min_edges_prim_large():
     result = sorted(get_min_edges_prim(points))
     expected = sorted([ab, ad, be, ce, df, eg])
     assert_equals(result, expected)
+
+def test_get_min_edges_prim_long_names():
+    a = Edge('alpha', 'beta', 3)
+    b = Edge('beta', 'gamma', 2)
+    c = Edge('gamma', 'alpha', 4)
+    assert_equals(get_min_edges_prim([a, b, c]), [a, b])
+    assert_equals(get_min_edges_prim([a, b, c], lazy=True), [a, b])
+
+def test_get_min_edges_prim_lazy_best_of_two():
+    a = Edge('a', 'b', 3)
+    b = Edge('b', 'a', 2)
+    c = Edge('b', 'c', 1)
+    assert_equals(get_min_edges_prim([a, b, c], lazy=True), [b, c])
+
+def test_get_min_edges_prim_random():
+    seed(20)
+    for trial in xrange(20):
+        size = randint(2, 30)
+        # A path through every vertex keeps the graph connected
+        edges = [Edge(i, i + 1, randint(0, 20)) for i in xrange(size - 1)]
+        edges.extend(Edge(randint(0, size - 1), randint(0, size - 1),
+                randint(0, 20)) for i in xrange(randint(0, 100)))
+        expected = sum(edge.value
+                for edge in get_min_edges_kruskal(list(edges)))
+        for lazy in (False, True):
+            result = get_min_edges_prim(edges, lazy)
+            assert_equals(len(result), size - 1)
+            assert_equals(sum(edge.value for edge in result), expected)
+            # The edges form a tree: each one adds a new vertex
+            reached = set([0])
+            for edge in result:
+                assert (edge.vertex1 in reached) != (edge.vertex2 in reached)
+                reached.update((edge.vertex1, edge.vertex2))
+
+def test_get_min_edges_kruskal_forest_empty():
+    assert_equals(get_min_edges_kruskal([], forest=True), [])
+
+def test_get_min_edges_kruskal_forest():
+    a = Edge('a', 'b', 2)
+    b = Edge('c', 'd', 4)
+    c = Edge('d', 'e', 1)
+    d = Edge('e', 'c', 3)
+    e = Edge('f', 'f', 1)
+    result = get_min_edges_kruskal([a, b, c, d, e], forest=True)
+    assert_equals(result, [([a], 2), ([c, d], 4), ([], 0)])
+
+def test_get_min_edges_prim_forest():
+    a = Edge('a', 'b', 2)
+    b = Edge('c', 'd', 4)
+    c = Edge('d', 'e', 1)
+    d = Edge('e', 'c', 3)
+    e = Edge('f', 'f', 1)
+    for lazy in (False, True):
+        result = get_min_edges_prim([a, b, c, d, e], lazy, forest=True)
+        assert_equals(result, [([a], 2), ([d, c], 4), ([], 0)])
+
+def test_get_min_edges_forest_random():
+    seed(22)
+    for trial in xrange(20):
+        size = randint(1, 30)
+        edges = [Edge(randint(0, size - 1), randint(0, size - 1),
+                randint(0, 20)) for i in xrange(randint(1, 40))]
+        expected = get_min_edges_kruskal(list(edges), forest=True)
+        vertices = set(edge.vertex1 for edge in edges)
+        vertices.update(edge.vertex2 for edge in edges)
+        assert_equals(sum(len(tree) + 1 for tree, weight in expected),
+                len(vertices))
+        for lazy in (False, True):
+            result = get_min_edges_prim(edges, lazy, forest=True)
+            assert_equals([weight for tree, weight in result],
+                    [weight for tree, weight in expected])
+            assert_equals([len(tree) for tree, weight in result],
+                    [len(tree) for tree, weight in expected])
+        if len(expected) > 1:
+            assert_raises(ValueError, get_min_edges_kruskal, list(edges))
+            assert_raises(ValueError, get_min_edges_prim, edges)
+
+def test_get_min_edges_boruvka_empty():
+    assert_equals(get_min_edges_boruvka([], 1), [])
+    assert_equals(get_min_edges_boruvka([], 1, forest=True), [])
+
+def test_get_min_edges_boruvka_invalid_workers():
+    assert_raises(ValueError, get_min_edges_boruvka, [Edge('a', 'b', 1)], 0)
+
+def test_get_min_edges_boruvka_disconnected_components():
+    a = Edge('a', 'b', 2)
+    b = Edge('c', 'd', 2)
+    assert_raises(ValueError, get_min_edges_boruvka, [a, b], 1)
+    assert_equals(get_min_edges_boruvka([a, b], 1, forest=True),
+            [([a], 2), ([b], 2)])
+
+def test_get_min_edges_boruvka_three_point_cycle():
+    a = Edge('a', 'b', 3)
+    b = Edge('b', 'c', 2)
+    c = Edge('c', 'a', 4)
+    edges = [a, b, c]
+    assert_equals(get_min_edges_boruvka(edges, 1), [b, a])
+    # The input is not sorted
+    assert_equals(edges, [a, b, c])
+
+def test_get_min_edges_boruvka_small_graph_is_serial():
+    def no_pool(*args):
+        raise AssertionError("Small graphs should not start a pool")
+    pool = mst.multiprocessing.Pool
+    mst.multiprocessing.Pool = no_pool
+    try:
+        a, b = Edge('a', 'b', 1), Edge('b', 'c', 2)
+        assert_equals(get_min_edges_boruvka([a, b] * 20), [a, b])
+    finally:
+        mst.multiprocessing.Pool = pool
+
+def test_get_min_edges_boruvka_releases_arrays():
+    get_min_edges_boruvka([Edge('a', 'b', 1), Edge('b', 'c', 2)], 1)
+    assert mst._shared_edges is None
+
+def test_get_min_edges_boruvka_matches_kruskal():
+    seed(23)
+    for trial in xrange(20):
+        size = randint(1, 40)
+        # Few distinct weights give many ties
+        edges = [Edge(randint(0, size - 1), randint(0, size - 1),
+                randint(0, 5)) for i in xrange(randint(1, 120))]
+        expected = get_min_edges_kruskal(list(edges), forest=True)
+        assert_equals(get_min_edges_boruvka(edges, 1, forest=True), expected)
+        if trial % 5 == 0:
+            # Starting worker processes is slow, so only check a few
+            assert_equals(get_min_edges_boruvka(edges, 3, forest=True),
+                    expected)
+        if len(expected) == 1:
+            assert_equals(get_min_edges_boruvka(edges, 2), expected[0][0])
+
+def _path_max(edges, start, end):
+    """Returns the heaviest edge on the path between two tree vertices."""
+    neighbors = {}
+    for v1, v2, value in edges:
+        neighbors.setdefault(v1, []).append((v2, value))
+        neighbors.setdefault(v2, []).append((v1, value))
+    # Heaviest edge from start to each vertex reached
+    heaviest = {start:None}
+    stack = [start]
+    while stack:
+        vertex = stack.pop()
+        for neighbor, value in neighbors[vertex]:
+            if neighbor not in heaviest:
+                heaviest[neighbor] = max(heaviest[vertex], value)
+                stack.append(neighbor)
+    return heaviest[end]
+
+def test_build_compact_mst_empty():
+    assert_equals(build_compact_mst([]), None)
+
+def test_compact_spanning_tree_cycle():
+    a = Edge('a', 'b', 3)
+    b = Edge('b', 'c', 2)
+    c = Edge('c', 'a', 4)
+    assert_raises(ValueError, CompactSpanningTree, [a, b, c])
+    assert_raises(ValueError, CompactSpanningTree, [a, Edge('b', 'a', 1)])
+    assert_raises(ValueError, CompactSpanningTree, [Edge('a', 'a', 1)])
+
+def test_compact_spanning_tree_arrays():
+    edges = [Edge('a', 'b', 1), Edge('a', 'c', 2), Edge('c', 'd', 3)]
+    tree = build_compact_mst(edges)
+    assert_equals(tree.names, ['a', 'b', 'c', 'd'])
+    assert_equals(list(tree.parent), [-1, 0, 0, 2])
+    assert_equals(list(tree.parent_weight), [0, 1, 2, 3])
+    assert_equals(list(tree.depth), [0, 1, 1, 2])
+    assert_equals(list(tree.euler), [0, 1, 0, 2, 3, 2, 0])
+    assert_equals(list(tree.first), [0, 1, 3, 4])
+    assert_equals(list(tree.last), [6, 1, 5, 4])
+    assert_equals(tree.subtree('c'), ['c', 'd'])
+    assert_equals(tree.subtree('a'), ['a', 'b', 'c', 'd'])
+    assert_equals(tree.common_ancestor('b', 'd'), 'a')
+    assert_equals(tree.max_edge('b', 'd'), 3)
+    assert_equals(tree.max_edge('d', 'c'), 3)
+    assert_equals(tree.max_edge('a', 'a'), None)
+    assert_raises(ValueError, tree.max_edge, 'a', 'e')
+
+def test_compact_spanning_tree_forest():
+    edges = [Edge(1, 2, 5), Edge(3, 4, 1), Edge(2, 5, 2)]
+    tree = CompactSpanningTree(edges)
+    assert_equals(tree.names, [1, 2, 5, 3, 4])
+    assert_equals([tree.names[root] for root in tree.root], [1, 1, 1, 3, 3])
+    assert_equals(tree.max_edge(5, 1), 5)
+    assert_equals(tree.subtree(3), [3, 4])
+    assert_raises(ValueError, tree.max_edge, 1, 4)
+    assert_raises(ValueError, tree.common_ancestor, 1, 4)
+
+def test_compact_spanning_tree_random():
+    seed(24)
+    for trial in xrange(10):
+        size = randint(2, 80)
+        edges = get_min_edges_kruskal([Edge(randint(0, i - 1), i,
+                randint(0, 100)) for i in xrange(1, size)])
+        tree = CompactSpanningTree(edges)
+        assert_equals(len(tree), size)
+        assert_equals(len(tree.euler), 2 * size - 1)
+        for i in xrange(30):
+            v1, v2 = randint(0, size - 1), randint(0, size - 1)
+            assert_equals(tree.max_edge(v1, v2), _path_max(edges, v1, v2))
+            ancestor = tree.common_ancestor(v1, v2)
+            assert v1 in tree.subtree(ancestor)
+            assert v2 in tree.subtree(ancestor)